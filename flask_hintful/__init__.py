@@ -1,3 +1,8 @@
+from .cache import SqliteResponseCache
+from .deadline import Deadline, get_deadline
 from .deserializer import Deserializer
+from .events import EventStream, ServerSentEvent
 from .flask_hintful import FlaskHintful
+from .pagination import Paginated
 from .serializer import Serializer
+from .stats import TypeStats
@@ -0,0 +1,229 @@
+import sys
+from array import array
+from typing import Any, List, Mapping, Optional, Tuple, Type, Union
+
+from werkzeug.exceptions import BadRequest
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+ARRAY_CONTENT_TYPE = 'application/x-array'
+ARRAY_DTYPE_HEADER = 'X-Array-Dtype'
+ARRAY_SHAPE_HEADER = 'X-Array-Shape'
+
+DEFAULT_ARRAY_DTYPE = '<f8' if sys.byteorder == 'little' else '>f8'
+
+_BYTE_ORDER = '<' if sys.byteorder == 'little' else '>'
+_TYPECODE_KINDS = {**dict.fromkeys('bhilq', 'i'), **dict.fromkeys('BHILQ', 'u'), 'f': 'f', 'd': 'f'}
+
+
+class InvalidArray(BadRequest, ValueError):
+    '''Raised when an array sent by the client doesn't match its dtype or shape, responds with 400.
+    '''
+
+
+class ArrayBuffer():
+    '''Request body sent as application/x-array: the raw bytes of an array, wrapped without copying,
+    with the dtype and shape sent in the X-Array-Dtype and X-Array-Shape headers.
+
+    Args:
+        buffer (memoryview): The raw bytes
+        dtype (str): NumPy array-protocol type string, e.g '<f8'
+        shape (Tuple[int, ...], optional): Array shape. Defaults to None (one dimension).
+    '''
+
+    def __init__(self, buffer: memoryview, dtype: str = DEFAULT_ARRAY_DTYPE,
+                 shape: Optional[Tuple[int, ...]] = None):
+        self.buffer = buffer
+        self.dtype = dtype
+        self.shape = shape
+
+
+class ArrayCodec():
+    '''Decodes application/x-array request bodies into an `ArrayBuffer`, the Deserializer passes the
+    dtype and shape sent in the X-Array-Dtype and X-Array-Shape headers, see `parse_array_headers`.
+    Arrays are encoded by the Serializer, which streams their buffer as is, see
+    `Serializer.serialize_array_response`.
+    '''
+    media_type = ARRAY_CONTENT_TYPE
+
+    @staticmethod
+    def dumps(data: Any, default=None) -> bytes:
+        '''Copies the buffer of an array, used only when a response can't be streamed.
+
+        Raises:
+            TypeError: If data isn't a numpy.ndarray or array.array
+        '''
+        if not is_array(data):
+            raise TypeError(f'Cannot encode type {data.__class__} as {ARRAY_CONTENT_TYPE}')
+        return get_array_buffer(data).tobytes()
+
+    @staticmethod
+    def loads(data: bytes, dtype: str = DEFAULT_ARRAY_DTYPE,
+              shape: Optional[Tuple[int, ...]] = None) -> ArrayBuffer:
+        '''Wraps data in an ArrayBuffer without copying it.
+        '''
+        return ArrayBuffer(memoryview(data), dtype, shape)
+
+
+def is_array(data: Any) -> bool:
+    '''Determines if data is an array.array or (if NumPy is installed) a numpy.ndarray
+    '''
+    return isinstance(data, array) or (numpy is not None and isinstance(data, numpy.ndarray))
+
+
+def is_array_type(type_: Type) -> bool:
+    '''Determines if type_ is array.array or numpy.ndarray, view func params of these types receive the
+    request body.
+    '''
+    if not isinstance(type_, type):
+        type_ = getattr(type_, '__origin__', None)
+    return isinstance(type_, type) and (
+        issubclass(type_, array) or (numpy is not None and issubclass(type_, numpy.ndarray))
+    )
+
+
+def array_to_list(data: Union[array, 'numpy.ndarray']) -> list:
+    '''Converts an array into (nested) lists of Python numbers in a single call, used for JSON
+    '''
+    return data.tolist()
+
+
+def numpy_scalar_to_primitive(data: 'numpy.generic') -> Any:
+    return data.item()
+
+
+def get_array_dtype(data: Union[array, 'numpy.ndarray']) -> str:
+    '''NumPy array-protocol type string of data, e.g '<f8', derived from the typecode of an array.array
+    '''
+    if isinstance(data, array):
+        kind = _TYPECODE_KINDS.get(data.typecode)
+        if kind is None:
+            raise TypeError(f'Cannot send array.array of typecode {data.typecode}')
+        return f'{"|" if data.itemsize == 1 else _BYTE_ORDER}{kind}{data.itemsize}'
+    return data.dtype.str
+
+
+def get_array_shape(data: Union[array, 'numpy.ndarray']) -> Tuple[int, ...]:
+    return (len(data),) if isinstance(data, array) else data.shape
+
+
+def get_array_buffer(data: Union[array, 'numpy.ndarray']) -> memoryview:
+    '''Bytes of data without copying, NumPy arrays that aren't C-contiguous are copied once into one
+    that is.
+
+    Raises:
+        TypeError: If data is a NumPy array whose dtype has no buffer format (e.g datetime64) or holds
+            Python objects
+    '''
+    if isinstance(data, array):
+        return memoryview(data).cast('B')
+    if data.dtype.hasobject:
+        raise TypeError(
+            f'Cannot send numpy.ndarray of dtype {data.dtype} as raw bytes, it holds Python objects'
+        )
+    try:
+        return memoryview(numpy.ascontiguousarray(data)).cast('B')
+    except ValueError:
+        raise TypeError(
+            f'Cannot send numpy.ndarray of dtype {data.dtype} as raw bytes, it has no buffer format'
+        ) from None
+
+
+def get_array_headers(data: Union[array, 'numpy.ndarray']) -> dict:
+    return {
+        'Content-Type': ARRAY_CONTENT_TYPE,
+        ARRAY_DTYPE_HEADER: get_array_dtype(data),
+        ARRAY_SHAPE_HEADER: ','.join(str(size) for size in get_array_shape(data))
+    }
+
+
+def parse_array_headers(headers: Mapping[str, str]) -> dict:
+    '''Reads the dtype and shape of an application/x-array body from request headers, passed to
+    `ArrayCodec.loads`.
+
+    Raises:
+        InvalidArray: If the X-Array-Shape header is invalid
+    '''
+    return {
+        'dtype': headers.get(ARRAY_DTYPE_HEADER) or DEFAULT_ARRAY_DTYPE,
+        'shape': parse_shape(headers.get(ARRAY_SHAPE_HEADER))
+    }
+
+
+def parse_shape(shape: Optional[str]) -> Optional[Tuple[int, ...]]:
+    '''Parses an X-Array-Shape header, e.g '3,4'
+
+    Raises:
+        InvalidArray: If shape isn't a comma separated list of non negative ints
+    '''
+    if not shape:
+        return None
+    try:
+        sizes = tuple(int(size) for size in shape.split(','))
+    except ValueError:
+        raise InvalidArray(f'Invalid {ARRAY_SHAPE_HEADER} header: {shape}')
+    if any(size < 0 for size in sizes):
+        raise InvalidArray(f'Invalid {ARRAY_SHAPE_HEADER} header: {shape}')
+    return sizes
+
+
+def to_array(data: Union[ArrayBuffer, List, str], type_: Type) -> Union[array, 'numpy.ndarray']:
+    '''Deserializes an ArrayBuffer, a JSON array or a list of query args into an instance of type_.
+    NumPy arrays wrap ArrayBuffers without copying (so they're read-only), array.array copies them since
+    it can't wrap memory it doesn't own.
+
+    Raises:
+        InvalidArray: If data isn't an array of numbers or doesn't match the dtype or shape
+    '''
+    if not isinstance(type_, type):
+        type_ = type_.__origin__
+    if isinstance(data, ArrayBuffer):
+        if issubclass(type_, array):
+            return buffer_to_array(data)
+        try:
+            return numpy.frombuffer(data.buffer, data.dtype).reshape(data.shape or -1)
+        except (TypeError, ValueError) as err:
+            raise InvalidArray(f'Invalid array: {err}')
+    if isinstance(data, dict):
+        raise InvalidArray('Invalid array: expected a list of numbers')
+    if not isinstance(data, list):
+        data = [data]
+    try:
+        if data and isinstance(data[0], str):
+            data = [float(item) for item in data]
+        if issubclass(type_, array):
+            return array('d' if any(isinstance(item, float) for item in data) else 'q', data)
+        result = numpy.asarray(data)
+    except (TypeError, ValueError, OverflowError) as err:
+        raise InvalidArray(f'Invalid array: {err}')
+    if result.dtype.kind not in 'biuf':
+        raise InvalidArray('Invalid array: expected (nested) lists of numbers')
+    return result
+
+
+def buffer_to_array(data: ArrayBuffer) -> array:
+    '''Copies an ArrayBuffer into an array.array of the typecode matching its dtype
+
+    Raises:
+        InvalidArray: If no typecode matches the dtype or the buffer doesn't match it
+    '''
+    dtype = data.dtype
+    if len(dtype) < 3 or dtype[0] not in '<>|=' or not dtype[2:].isdigit():
+        raise InvalidArray(f'Invalid array: dtype {dtype} is not supported by array.array')
+    order, kind, itemsize = dtype[0], dtype[1], int(dtype[2:])
+    for typecode, typecode_kind in _TYPECODE_KINDS.items():
+        if typecode_kind == kind and array(typecode).itemsize == itemsize:
+            break
+    else:
+        raise InvalidArray(f'Invalid array: dtype {dtype} is not supported by array.array')
+    result = array(typecode)
+    try:
+        result.frombytes(data.buffer)
+    except ValueError as err:
+        raise InvalidArray(f'Invalid array: {err}')
+    if order not in ('|', '=', _BYTE_ORDER) and itemsize > 1:
+        result.byteswap()
+    return result
@@ -0,0 +1,128 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import time
+from typing import Callable, Optional
+from uuid import uuid4
+
+from flask import Response, copy_current_request_context, current_app, jsonify, url_for
+from werkzeug.exceptions import HTTPException, InternalServerError, NotFound, ServiceUnavailable
+
+from .cache import CachedResponse
+
+TASK_STATUS_ENDPOINT = 'hintful_task_status'
+
+DEFAULT_BACKGROUND_WORKERS = 4
+DEFAULT_BACKGROUND_MAX_TASKS = 1000
+DEFAULT_BACKGROUND_RESULT_TTL = 60 * 60
+
+
+class BackgroundTask():
+    '''A view func call submitted to `BackgroundTasks`. `status` is one of pending, running,
+    succeeded or failed, `response` is set once it finished.
+    '''
+
+    def __init__(self, task_id: str):
+        self.id = task_id
+        self.status = 'pending'
+        self.response: Optional[CachedResponse] = None
+        self.expires: Optional[float] = None
+
+    @property
+    def url(self) -> str:
+        '''Url of the task status route, must be called within a request context
+        '''
+        return url_for(TASK_STATUS_ENDPOINT, task_id=self.id)
+
+    def as_dict(self) -> dict:
+        return {'id': self.id, 'status': self.status, 'url': self.url}
+
+
+class BackgroundTasks():
+    '''Runs view funcs of routes registered with `background=True` in a thread pool and keeps their
+    serialized responses for `result_ttl` seconds after they finished, to be fetched from the task status
+    route.
+
+    Args:
+        max_workers (int, optional): Number of threads running tasks. Defaults to 4.
+        max_tasks (int, optional): Max number of pending, running and unexpired finished tasks.
+            Defaults to 1000.
+        result_ttl (float, optional): Seconds responses are kept after the task finished.
+            Defaults to 1 hour.
+    '''
+
+    def __init__(self, max_workers: int = DEFAULT_BACKGROUND_WORKERS,
+                 max_tasks: int = DEFAULT_BACKGROUND_MAX_TASKS,
+                 result_ttl: float = DEFAULT_BACKGROUND_RESULT_TTL):
+        self.max_workers = max_workers
+        self.max_tasks = max_tasks
+        self.result_ttl = result_ttl
+        self.tasks: 'OrderedDict[str, BackgroundTask]' = OrderedDict()
+        self.lock = Lock()
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+    def submit(self, func: Callable[[], Response]) -> BackgroundTask:
+        '''Runs func in the thread pool with a copy of the current request context.
+
+        Raises:
+            ServiceUnavailable: If there are already max_tasks tasks
+
+        Returns:
+            BackgroundTask: The pending task
+        '''
+        with self.lock:
+            self.evict()
+            if len(self.tasks) >= self.max_tasks:
+                raise ServiceUnavailable('Too many background tasks')
+            task = BackgroundTask(uuid4().hex)
+            self.tasks[task.id] = task
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix='flask-hintful-background'
+                )
+        self.executor.submit(copy_current_request_context(lambda: self.run(task, func)))
+        return task
+
+    def run(self, task: BackgroundTask, func: Callable[[], Response]):
+        task.status = 'running'
+        try:
+            response = func()
+        except HTTPException as err:
+            response = err.get_response()
+        except Exception:
+            current_app.logger.exception(f'Background task {task.id} failed')
+            response = InternalServerError().get_response()
+        response.direct_passthrough = False
+        task.response = CachedResponse.from_response(response)
+        response.close()
+        task.expires = time() + self.result_ttl
+        task.status = 'succeeded' if response.status_code < 400 else 'failed'
+
+    def get(self, task_id: str) -> Optional[BackgroundTask]:
+        with self.lock:
+            self.evict()
+            return self.tasks.get(task_id)
+
+    def evict(self):
+        '''Removes finished tasks whose response expired. Must be called holding `lock`.
+        '''
+        now = time()
+        for task_id, task in list(self.tasks.items()):
+            if task.expires is not None and task.expires <= now:
+                del self.tasks[task_id]
+
+    def get_task_status(self, task_id: str) -> Response:
+        '''View func of the task status route. Responds with the task's serialized response once it
+        finished, otherwise with 202 and the task status.
+
+        Raises:
+            NotFound: If there isn't a task with task_id or its response expired
+        '''
+        task = self.get(task_id)
+        if task is None:
+            raise NotFound(f'Task {task_id} not found')
+        if task.response is None:
+            response = jsonify(task.as_dict())
+            response.status_code = 202
+            return response
+        return task.response.to_response()
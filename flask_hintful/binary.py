@@ -0,0 +1,109 @@
+import io
+import os
+from pathlib import PurePath
+from typing import IO, Any, BinaryIO, Optional, Type, Union
+
+from flask import Response, current_app, request, send_file
+from werkzeug.exceptions import NotFound
+from werkzeug.wsgi import wrap_file
+
+BINARY_TYPES = (bytes, bytearray, memoryview, PurePath, io.IOBase)
+BINARY_CONTENT_TYPE = 'application/octet-stream'
+CHUNK_SIZE = 64 * 1024
+
+
+class MemoryViewWrapper():
+    '''Iterates over a bytes-like object in chunks without copying it as a whole. Seekable, so werkzeug
+    serves Range requests by seeking to the first requested byte.
+    '''
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview], chunk_size: int = CHUNK_SIZE):
+        self.view = memoryview(data).cast('B')
+        self.chunk_size = chunk_size
+        self.position = 0
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, position: int):
+        self.position = position
+
+    def tell(self) -> int:
+        return self.position
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> bytes:
+        if self.position >= len(self.view):
+            raise StopIteration()
+        chunk = self.view[self.position:self.position + self.chunk_size]
+        self.position += len(chunk)
+        return chunk.tobytes()
+
+
+def is_binary(data: Any) -> bool:
+    '''Determines if data is sent as a binary response: bytes, bytearray, memoryview, pathlib paths
+    and binary file objects.
+    '''
+    return isinstance(data, BINARY_TYPES) and not isinstance(data, io.TextIOBase)
+
+
+def is_binary_type(type_: Type) -> bool:
+    '''Determines if view funcs returning type_ send binary responses, used in OpenApi documentation.
+    '''
+    if type_ in (IO, BinaryIO, IO[bytes]):
+        return True
+    return isinstance(type_, type) and issubclass(type_, BINARY_TYPES) \
+        and not issubclass(type_, io.TextIOBase)
+
+
+def send_binary(data: Union[bytes, bytearray, memoryview, PurePath, BinaryIO]) -> Response:
+    '''Builds a response streaming data, supporting Range and conditional requests.
+
+    Paths are sent with flask.send_file and file objects are wrapped with the server's
+    `wsgi.file_wrapper` (which may use sendfile) so files are never read into memory at once. Bytes-like
+    objects are sent in chunks of their memory.
+
+    Raises:
+        NotFound: If data is a path to a file that doesn't exist
+
+    Returns:
+        Response: A streamed Flask response
+    '''
+    if isinstance(data, PurePath):
+        path = os.path.abspath(data)
+        if not os.path.isfile(path):
+            raise NotFound()
+        response = send_file(path, conditional=True)
+        response.headers['Accept-Ranges'] = 'bytes'
+        return response
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        body = MemoryViewWrapper(data)
+        size: Optional[int] = len(body.view)
+    else:
+        size = get_file_size(data)
+        body = wrap_file(request.environ, data)
+    response = current_app.response_class(body, mimetype=BINARY_CONTENT_TYPE, direct_passthrough=True)
+    if size is None:
+        return response
+    response.content_length = size
+    response.headers['Accept-Ranges'] = 'bytes'
+    return response.make_conditional(request, accept_ranges='bytes', complete_length=size)
+
+
+def get_file_size(file: BinaryIO) -> Optional[int]:
+    '''Size of a file object positioned at its start, None if it isn't at its start or its size can't be
+    determined without reading it. Such files are streamed without Content-Length nor Range support.
+    '''
+    try:
+        if file.tell() != 0:
+            return None
+        try:
+            return os.fstat(file.fileno()).st_size
+        except (OSError, io.UnsupportedOperation):
+            size = file.seek(0, io.SEEK_END)
+            file.seek(0)
+            return size
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
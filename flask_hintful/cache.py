@@ -0,0 +1,137 @@
+import os
+import sqlite3
+import threading
+from time import time
+from typing import List, NamedTuple, Optional, Tuple
+
+from flask import Response, current_app, json
+
+DEFAULT_CACHE_TTL = 60
+DEFAULT_CACHE_MAX_SIZE = 64 * 1024 * 1024
+
+SCHEMA = '''
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS responses
+    (key TEXT PRIMARY KEY, body BLOB, status INTEGER, headers TEXT, size INTEGER, expires REAL);
+CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires);
+CREATE TABLE IF NOT EXISTS responses_size (total INTEGER NOT NULL);
+INSERT INTO responses_size SELECT coalesce(sum(size), 0) FROM responses
+    WHERE NOT EXISTS (SELECT 1 FROM responses_size);
+CREATE TRIGGER IF NOT EXISTS responses_insert AFTER INSERT ON responses
+    BEGIN UPDATE responses_size SET total = total + NEW.size; END;
+CREATE TRIGGER IF NOT EXISTS responses_delete AFTER DELETE ON responses
+    BEGIN UPDATE responses_size SET total = total - OLD.size; END;
+COMMIT;
+'''
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    status: int
+    headers: List[Tuple[str, str]]
+
+    @classmethod
+    def from_response(cls, response: Response) -> 'CachedResponse':
+        '''Copies the body, status and headers of response. Content-Length is left out, it's set again
+        from the body when the response is rebuilt.
+        '''
+        headers = [(name, value) for name, value in response.headers if name != 'Content-Length']
+        return cls(response.get_data(), response.status_code, headers)
+
+    def to_response(self) -> Response:
+        '''Builds a new response of the current app's response_class.
+        '''
+        return current_app.response_class(self.body, self.status, self.headers)
+
+
+class SqliteResponseCache():
+    '''Response cache stored in a SQLite database in WAL mode, shared by every process (e.g forked
+    workers) that opens the same file, so a response cached by one worker is served by all others.
+
+    Entries expire after their TTL. When the stored bodies exceed `max_size` bytes the entries closest to
+    expiring are evicted first. The total size of the bodies is kept up to date by triggers, so checking
+    it doesn't scan the table. Errors accessing the database are treated as cache misses.
+
+    Args:
+        path (str): Path of the SQLite database file, created if it doesn't exist
+        default_ttl (float, optional): Seconds responses are cached for. Defaults to 60.
+        max_size (int, optional): Max total size of cached bodies in bytes. Defaults to 64MB.
+    '''
+
+    def __init__(self, path: str, default_ttl: float = DEFAULT_CACHE_TTL,
+                 max_size: int = DEFAULT_CACHE_MAX_SIZE):
+        self.path = path
+        self.default_ttl = default_ttl
+        self.max_size = max_size
+        self.local = threading.local()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state['local']
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.local = threading.local()
+
+    def get_connection(self) -> sqlite3.Connection:
+        '''Returns the connection of the current thread, connections are never shared across threads
+        or forked processes.
+        '''
+        if getattr(self.local, 'pid', None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            # rows replaced by INSERT OR REPLACE only fire the delete trigger with recursive triggers
+            connection.execute('PRAGMA recursive_triggers=ON')
+            connection.executescript(SCHEMA)
+            self.local.connection = connection
+            self.local.pid = os.getpid()
+        return self.local.connection
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        '''Returns the response cached under key, None if there isn't one or it expired.
+        '''
+        try:
+            row = self.get_connection().execute(
+                'SELECT body, status, headers FROM responses WHERE key = ? AND expires > ?',
+                (key, time())
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        body, status, headers = row
+        return CachedResponse(body, status, [tuple(header) for header in json.loads(headers)])
+
+    def set(self, key: str, response: CachedResponse, ttl: Optional[float] = None):
+        '''Caches response under key for ttl seconds (default_ttl if None), then evicts expired entries
+        and entries closest to expiring while cached bodies are larger than max_size.
+        '''
+        ttl = self.default_ttl if ttl is None else ttl
+        size = len(response.body)
+        if size > self.max_size:
+            return
+        now = time()
+        try:
+            connection = self.get_connection()
+            connection.execute(
+                'INSERT OR REPLACE INTO responses (key, body, status, headers, size, expires) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key, response.body, response.status, json.dumps(response.headers), size, now + ttl)
+            )
+            connection.execute('DELETE FROM responses WHERE expires <= ?', (now,))
+            while connection.execute('SELECT total FROM responses_size').fetchone()[0] > self.max_size:
+                evicted = connection.execute(
+                    'DELETE FROM responses WHERE key = '
+                    '(SELECT key FROM responses ORDER BY expires, key LIMIT 1)'
+                )
+                if not evicted.rowcount:
+                    break
+        except sqlite3.Error:
+            pass
+
+    def clear(self):
+        '''Removes all cached responses.
+        '''
+        self.get_connection().execute('DELETE FROM responses')
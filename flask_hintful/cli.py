@@ -0,0 +1,43 @@
+import os
+
+import click
+from flask.cli import AppGroup
+
+from .server import serve_prefork
+
+
+def create_cli(api) -> AppGroup:
+    '''Creates the `flask hintful` command group for a FlaskHintful api.
+
+    Args:
+        api (FlaskHintful): FlaskHintful api the commands operate on
+
+    Returns:
+        AppGroup: Click group to be added to the Flask application cli
+    '''
+    hintful_cli = AppGroup('hintful', help='Flask Hintful commands.')
+
+    @hintful_cli.command('export-openapi')
+    @click.option('--output', '-o', default='openapi.json', show_default=True,
+                  help='Path of the JSON file relative to the app root path, a gzip variant is written '
+                       'next to it.')
+    def export_openapi(output):
+        '''Generate the OpenApi specification and write it to disk.'''
+        for path in api.openapi_provider.export_openapi_spec(output):
+            click.echo(f'Wrote {path}')
+
+    @hintful_cli.command('serve')
+    @click.option('--host', '-h', default='127.0.0.1', show_default=True,
+                  help='The interface to bind to.')
+    @click.option('--port', '-p', default=5000, show_default=True, help='The port to bind to.')
+    @click.option('--workers', '-w', default=os.cpu_count() or 1, show_default=True,
+                  help='Number of worker processes.')
+    @click.option('--threaded/--no-threaded', default=True, show_default=True,
+                  help='Handle requests in threads within each worker.')
+    def serve(host, port, workers, threaded):
+        '''Warm up the app once then serve it from forked worker processes.'''
+        api.warmup()
+        click.echo(f' * Serving {api.flask_app.name} on http://{host}:{port}/ with {workers} workers')
+        serve_prefork(api.flask_app, host, port, workers, threaded)
+
+    return hintful_cli
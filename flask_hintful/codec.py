@@ -0,0 +1,87 @@
+from typing import Any, Callable, Optional, Union
+
+from flask import json
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+
+class JsonCodec():
+    '''Encodes/decodes JSON using flask.json.
+    '''
+    media_type = 'application/json'
+
+    @staticmethod
+    def dumps(data: Any, default: Optional[Callable] = None) -> str:
+        '''Encodes `data` as a JSON str. `default` is called for any object that
+        can't be natively encoded and must return an encodable object.
+        '''
+        return json.dumps(data, default=default)
+
+    @staticmethod
+    def loads(data: Union[str, bytes]) -> Any:
+        '''Decodes a JSON str or bytes.
+
+        Raises:
+            ValueError: If data is not valid JSON
+        '''
+        return json.loads(data)
+
+
+class MsgPackCodec():
+    '''Encodes/decodes MessagePack (https://msgpack.org) using the `msgpack` package, installed with
+    the `msgpack` extra (`pip install flask-hintful[msgpack]`). It's only registered when `msgpack` is
+    installed.
+    '''
+    media_type = 'application/msgpack'
+
+    @staticmethod
+    def dumps(data: Any, default: Optional[Callable] = None) -> bytes:
+        '''Encodes `data` as MessagePack bytes. `default` is called for any object that
+        can't be natively encoded and must return an encodable object.
+        '''
+        return msgpack.packb(data, default=default, use_bin_type=True)
+
+    @staticmethod
+    def loads(data: bytes) -> Any:
+        '''Decodes MessagePack bytes. Map keys must be str or bytes.
+
+        Raises:
+            ValueError: If data is not valid MessagePack or is nested too deep
+        '''
+        try:
+            return msgpack.unpackb(data, raw=False)
+        except msgpack.StackError:
+            raise ValueError('Invalid MessagePack data: nested too deep')
+        except (msgpack.UnpackException, ValueError, TypeError) as err:
+            raise ValueError(f'Invalid MessagePack data: {err}')
+
+
+class ColumnarCodec():
+    '''Encodes responses with `codec` after the Serializer converted lists of dataclasses into columns,
+    `{"field": [value, ...], ...}`, see `Serializer.to_columns`. Registered under its own media type so
+    clients opt in through the Accept header.
+
+    Args:
+        codec (Any): Codec encoding the columns, e.g JsonCodec()
+        media_type (str): Media type this codec is registered for
+    '''
+    columnar = True
+
+    def __init__(self, codec: Any, media_type: str):
+        self.codec = codec
+        self.media_type = media_type
+
+    def dumps(self, data: Any, default: Optional[Callable] = None) -> Union[str, bytes]:
+        return self.codec.dumps(data, default=default)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self.codec.loads(data)
+
+
+COLUMNAR_JSON_MEDIA_TYPE = 'application/x-columnar+json'
+COLUMNAR_MSGPACK_MEDIA_TYPE = 'application/x-columnar+msgpack'
+
+MSGPACK_MEDIA_TYPES = ('application/msgpack', 'application/x-msgpack')
@@ -0,0 +1,106 @@
+import asyncio
+import math
+from time import monotonic
+from typing import Any, Awaitable, Dict, Optional
+
+from flask import current_app, g, has_app_context, request
+from werkzeug.exceptions import BadRequest, GatewayTimeout
+
+REQUEST_TIMEOUT_HEADER = 'X-Request-Timeout'
+
+
+class Deadline():
+    '''Time budget of a request, started when the request reached the route.
+
+    Args:
+        timeout (float): Seconds the request may take
+    '''
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.expires = monotonic() + timeout
+
+    def remaining(self) -> float:
+        '''Seconds left before the deadline, 0 once it passed
+        '''
+        return max(self.expires - monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return monotonic() >= self.expires
+
+    def check(self):
+        '''Raises GatewayTimeout if the deadline passed, view funcs may call it between costly steps to
+        give up on requests whose client already did.
+
+        Raises:
+            GatewayTimeout: If the deadline passed
+        '''
+        if self.expired:
+            raise GatewayTimeout(f'Request deadline of {self.timeout:g} seconds exceeded')
+
+    def headers(self) -> Dict[str, str]:
+        '''Headers propagating the remaining budget to downstream services called by the view func
+        '''
+        return {REQUEST_TIMEOUT_HEADER: f'{self.remaining():.3f}'}
+
+
+def start_deadline(timeout: Optional[float] = None) -> Optional[Deadline]:
+    '''Starts the deadline of the current request from the shorter of timeout
+    (FLASK_HINTFUL_REQUEST_TIMEOUT config if None) and the seconds sent by the client in the
+    X-Request-Timeout header.
+
+    Raises:
+        BadRequest: If the X-Request-Timeout header isn't a finite number greater than 0
+
+    Returns:
+        Optional[Deadline]: The deadline, None if the request has no timeout
+    '''
+    if timeout is None:
+        timeout = current_app.config.get('FLASK_HINTFUL_REQUEST_TIMEOUT')
+    header = request.headers.get(REQUEST_TIMEOUT_HEADER)
+    if header:
+        try:
+            requested = float(header)
+        except ValueError:
+            raise BadRequest(f'Invalid {REQUEST_TIMEOUT_HEADER} header: {header}')
+        if not math.isfinite(requested) or requested <= 0:
+            raise BadRequest(
+                f'Invalid {REQUEST_TIMEOUT_HEADER} header: {header}, expected seconds greater than 0'
+            )
+        timeout = requested if timeout is None else min(timeout, requested)
+    g.hintful_deadline = Deadline(timeout) if timeout is not None else None
+    return g.hintful_deadline
+
+
+def get_deadline() -> Optional[Deadline]:
+    '''Returns the deadline of the current request, None if it has no timeout or outside of a request.
+    View funcs use it to read the remaining budget, e.g `get_deadline().remaining()`.
+    '''
+    return g.get('hintful_deadline') if has_app_context() else None
+
+
+def check_deadline():
+    '''Raises GatewayTimeout if the current request has a deadline that passed
+
+    Raises:
+        GatewayTimeout: If the deadline passed
+    '''
+    deadline = get_deadline()
+    if deadline is not None:
+        deadline.check()
+
+
+def run_coroutine(coroutine: Awaitable, deadline: Optional[Deadline] = None) -> Any:
+    '''Runs the coroutine of an async view func in a new event loop, cancelling it once deadline passes.
+
+    Raises:
+        GatewayTimeout: If the coroutine was cancelled by the deadline
+    '''
+    try:
+        timeout = deadline.remaining() if deadline is not None else None
+        return asyncio.run(asyncio.wait_for(coroutine, timeout))
+    except asyncio.TimeoutError:
+        if deadline is None or not deadline.expired:
+            raise
+        raise GatewayTimeout(f'Request deadline of {deadline.timeout:g} seconds exceeded')
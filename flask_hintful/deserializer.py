@@ -1,10 +1,28 @@
 
-from dataclasses import fields, is_dataclass
-from datetime import date, datetime
-from typing import Callable, Dict, List, T, Type, Union
+from base64 import b64decode
+from dataclasses import is_dataclass
+from datetime import date, datetime, time
+from decimal import Decimal, InvalidOperation
+from enum import Enum
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Mapping, Optional, T, Type, TypeVar, Union
+from uuid import UUID
 
 from dateutil.parser import parse as date_parser
 from flask import json
+from werkzeug.exceptions import BadRequest
+
+from .arrays import ARRAY_CONTENT_TYPE, ArrayCodec, is_array_type, parse_array_headers, to_array
+from .codec import MSGPACK_MEDIA_TYPES, JsonCodec, MsgPackCodec, msgpack
+from .stats import TypeStats, get_size
+from .utils import get_dataclass_type_hints, iter_nested_types
+from .validation import MAX_VALIDATION_ERRORS, ValidationError, Validator, compile_validator
+
+
+class InvalidValue(BadRequest, ValueError):
+    '''Raised when a value can't be parsed into a Decimal, UUID or Enum, e.g `?id=bad` for an UUID param.
+    Responds with 400.
+    '''
 
 
 class Deserializer():
@@ -17,12 +35,36 @@ class Deserializer():
         float: float,
         bool: flask_hintful.deserializer.str_to_bool,
         datetime: dateutil.parser.parse,
-        date: lambda d: date_parser(d).date()
+        date: lambda d: date_parser(d).date(),
+        time: time.fromisoformat,
+        Decimal: flask_hintful.deserializer.to_decimal,
+        UUID: flask_hintful.deserializer.to_uuid,
+        bytes: flask_hintful.deserializer.base64_to_bytes
+
+    Dataclasses, classes with a __marshmallow__ attribute, Enums (by value or name) and
+    list, set and frozenset (including typed List[T], Set[T]) and Optional[T] are also supported.
+    array.array and numpy.ndarray params receive the request body, either a JSON array or the raw bytes
+    of an application/x-array body, which NumPy arrays wrap without copying. Data deserialized into a
+    dataclass is first checked against its fields by a validator compiled once per dataclass, see
+    `validate`.
+
+    Default codecs:
+        application/json: JsonCodec,
+        application/msgpack: MsgPackCodec,
+        application/x-msgpack: MsgPackCodec,
+        application/x-array: ArrayCodec
+
+    The MessagePack codecs are only registered if the `msgpack` package is installed.
+
+    With `stats` every decoded request body is counted by its media type with its size, and every
+    `deserialize` call by the requested type (nested types are counted on their own as well).
 
-    Dataclasses and classes with a __marshmallow__ attribute are also supported.
+    Args:
+        stats (TypeStats, optional): Collects per type deserialization costs.
+            Defaults to None (disabled).
     '''
 
-    def __init__(self):
+    def __init__(self, stats: Optional[TypeStats] = None):
         self.deserializers: Dict[Type, Callable] = {
             dict: json.loads,
             str: str,
@@ -30,8 +72,23 @@ class Deserializer():
             float: float,
             bool: str_to_bool,
             datetime: date_parser,
-            date: lambda d: date_parser(d).date()
+            date: lambda d: date_parser(d).date(),
+            time: time.fromisoformat,
+            Decimal: to_decimal,
+            UUID: to_uuid,
+            bytes: base64_to_bytes
         }
+        self.resolved_deserializers: Dict[Type, Callable] = {}
+        self.validated_deserializers: Dict[Type, Callable] = {}
+        self.validators: Dict[Type, Optional[Validator]] = {}
+        self.codecs: Dict[str, Any] = {
+            'application/json': JsonCodec(),
+            ARRAY_CONTENT_TYPE: ArrayCodec(),
+        }
+        if msgpack is not None:
+            self.codecs.update(dict.fromkeys(MSGPACK_MEDIA_TYPES, MsgPackCodec()))
+        self.schemas: Dict[Type, Any] = {}
+        self.stats = stats
 
     def add_deserializer(self, type_: Type, deserializer_func: Callable):
         '''Adds a deserializer for type `type_`
@@ -44,13 +101,55 @@ class Deserializer():
             deserializer_func (Callable):
         '''
         self.deserializers[type_] = deserializer_func
+        self.resolved_deserializers.clear()
+        self.validated_deserializers.clear()
+        self.validators.clear()
+
+    def add_codec(self, media_type: str, codec: Any):
+        '''Adds a codec for media type `media_type`
+
+        `codec` must implement `loads(data)` that decodes bytes into python objects.
+
+        Args:
+            media_type (str): A media type, e.g 'application/msgpack'
+            codec (Any): Codec that will decode request bodies of this media type
+        '''
+        self.codecs[media_type] = codec
+
+    def deserialize_body(self, data: bytes, media_type: str,
+                         headers: Optional[Mapping[str, str]] = None) -> Optional[Any]:
+        '''Decodes a request body using the codec registered for `media_type`. application/x-array bodies
+        are decoded with the dtype and shape sent in `headers`, see
+        `flask_hintful.arrays.parse_array_headers`.
+
+        Args:
+            data (bytes): Raw request body
+            media_type (str): Content-Type of the request body, without parameters
+            headers (Mapping[str, str], optional): Request headers. Defaults to None.
+
+        Raises:
+            ValueError: If data can't be decoded by the codec
+
+        Returns:
+            Optional[Any]: The decoded body, None if there isn't a codec for media_type or data is empty
+        '''
+        codec = self.codecs.get(media_type)
+        if codec is None or not data:
+            return None
+        params = parse_array_headers(headers or {}) if media_type == ARRAY_CONTENT_TYPE else {}
+        if self.stats is None:
+            return codec.loads(data, **params)
+        start = perf_counter()
+        decoded = codec.loads(data, **params)
+        self.stats.record(media_type, perf_counter() - start, get_size(data))
+        return decoded
 
     def deserialize_args(self, args, params, body=None) -> dict:
         '''Deserializes all args and body by finding the expected type's from params.
         Args that are found in params are ignored, unless params contains a VAR_KEYWORD
         param (e.g, **kwargs).
-        Since body does not have a name assumes that any param that is a Dataclass or Marshmallow Model
-        is supposed to receive the body.
+        Since body does not have a name assumes that any param that is a Dataclass, Marshmallow Model
+        or array is supposed to receive the body.
 
         Args:
             args ([werkzeug.datastructures.MultiDict]): Args from a Flask request
@@ -71,17 +170,20 @@ class Deserializer():
                 if param.kind == param.VAR_KEYWORD:
                     deserialized_args.update(args)
                 if body is not None:
-                    if self.is_dataclass(param.annotation) or self.is_marshmallow_model(param.annotation):
+                    annotation = param.annotation
+                    if self.is_dataclass(annotation) or self.is_marshmallow_model(annotation) \
+                            or is_array_type(annotation):
                         deserialized_args[param_name] = self.deserialize(
                             body, params[param_name].annotation
                         )
         return deserialized_args
 
-    def deserialize(self, data: Union[List, str, dict], type_: Type[T]) -> T:
+    def deserialize(self, data: Union[List, str, dict], type_: Type[T], validated: bool = False) -> T:
         '''Deserializes `data` into an instance of `type_` using the registered
         deserializer that matches the type of `type_`.
-        If data is a dataclass recursively serializes all fields and passes a dict to the default constructor.
-        If data has an attribute __marshmallow__ assumes it's a Marshmallow Schema and uses Schema.load()
+        If data is a dataclass recursively serializes all fields and passes a dict to the default
+        constructor. If data has an attribute __marshmallow__ assumes it's a Marshmallow Schema and uses
+        Schema.load()
 
         Raises:
             TypeError: If there arent any registered deserializers for data
@@ -90,23 +192,83 @@ class Deserializer():
         Args:
             data (Union[List, str, dict]): Data to be deserialized as type_
             type_ (T): Any type
+            validated (bool, optional): If data was already checked by the validator of type_, e.g as a
+                field of a validated dataclass, see `validate`. Defaults to False.
 
         Returns:
             T: An instance of type_
         '''
+        resolved_deserializers = (
+            self.validated_deserializers if validated else self.resolved_deserializers
+        )
+        deserializer = resolved_deserializers.get(type_)
+        if deserializer is None:
+            deserializer = resolved_deserializers[type_] = self.resolve_deserializer(type_, validated)
+        if self.stats is None:
+            return deserializer(data)
+        start = perf_counter()
+        deserialized = deserializer(data)
+        self.stats.record(type_, perf_counter() - start, get_size(data))
+        return deserialized
+
+    def resolve_deserializer(self, type_: Type, validated: bool = False) -> Callable:
+        '''Resolves the function that deserializes data into `type_`. `deserialize` calls this once per
+        type and caches the result until a new deserializer is added.
+
+        Raises:
+            TypeError: If type_ can't be deserialized
+
+        Args:
+            type_ (Type): Any type
+            validated (bool, optional): If data was already checked by the validator of type_.
+                Defaults to False.
+
+        Returns:
+            Callable: Function that receives data (or a list of args) and returns an instance of type_
+        '''
         deserializer = self.deserializers.get(type_)
-        if issubclass(type_, list):
-            return data
-        if isinstance(data, list):
-            data = data[0]
         if deserializer is not None:
-            return deserializer(data)
+            return lambda data: deserializer(first(data))
+        if is_array_type(type_):
+            return lambda data: to_array(data, type_)
+        origin = getattr(type_, '__origin__', None) or type_
+        if origin is Union:
+            item_types = [arg for arg in type_.__args__ if arg is not type(None)]
+            if len(item_types) == 1:
+                item_validated = self.is_validated(item_types[0], validated)
+                return lambda data: (
+                    None if data is None else self.deserialize(data, item_types[0], item_validated)
+                )
+        if isinstance(origin, type) and issubclass(origin, (list, set, frozenset)):
+            item_types = getattr(type_, '__args__', None) or (None,)
+            return self.resolve_sequence_deserializer(origin, item_types[0], validated)
+        if isinstance(type_, type) and issubclass(type_, Enum):
+            return lambda data: deserialize_enum(first(data), type_)
         if self.is_dataclass(type_):
-            return self.deserialize_dataclass(data, type_)
+            return lambda data: self.deserialize_dataclass(first(data), type_, validated)
         if self.is_marshmallow_model(type_):
-            return self.deserialize_marshmallow_model(data, type_)
+            return lambda data: self.deserialize_marshmallow_model(first(data), type_)
         raise TypeError(f'Cannot deserialize type {type_}')
 
+    def resolve_sequence_deserializer(self, container: Type, item_type: Optional[Type],
+                                      validated: bool = False) -> Callable:
+        '''Resolves the function that deserializes a list of args or JSON array into `container`,
+        deserializing each item as `item_type` if it isn't None.
+        '''
+        if isinstance(item_type, TypeVar):
+            item_type = None
+        if container is list and item_type is None:
+            return lambda data: data
+        item_validated = item_type is not None and self.is_validated(item_type, validated)
+
+        def deserialize_sequence(data):
+            if not isinstance(data, (list, tuple, set, frozenset)):
+                data = [data]
+            if item_type is None:
+                return container(data)
+            return container(self.deserialize(item, item_type, item_validated) for item in data)
+        return deserialize_sequence
+
     @staticmethod
     def is_dataclass(type_: Type) -> bool:
         '''Determines if type_ is a dataclass or not using dataclasses.is_dataclass
@@ -121,25 +283,73 @@ class Deserializer():
             return True
         return False
 
-    def deserialize_dataclass(self, data: Union[str, dict], type_: Type[T]) -> T:
-        '''Uses dataclasses.asdict to transform `data` into a dict, then uses the
-        registered dict serializer to serialize this dataclass
+    def deserialize_dataclass(self, data: Union[str, dict], type_: Type[T],
+                              validated: bool = False) -> T:
+        '''Parses `data` if it's a JSON string, validates it (unless `validated`) and constructs `type_`,
+        see `build_dataclass`.
 
         Args:
-            data (T): A python dataclass
+            data (Union[str, dict]): JSON object or decoded dict
+            type_ (Type[T]): A dataclass
+            validated (bool, optional): If data was already checked by the validator of type_.
+                Defaults to False.
 
         Returns:
-            str: string representation of data
+            T: An instance of type_
         '''
         if isinstance(data, str):
             parsed_data = json.loads(data)
         else:
             parsed_data = data
-        for field in fields(type_):
-            if parsed_data.get(field.name) and field.type not in [str, int, float, bool]:
-                parsed_data[field.name] = self.deserialize(parsed_data[field.name], field.type)
+        return self.build_dataclass(parsed_data, type_, validated)
+
+    def build_dataclass(self, parsed_data: dict, type_: Type[T], validated: bool = False) -> T:
+        '''Deserializes the fields of parsed_data and constructs type_. parsed_data is validated first
+        unless `validated`, field values covered by the validator of type_ aren't validated again.
+
+        Raises:
+            ValidationError: If parsed_data doesn't match type_
+        '''
+        if not validated:
+            self.validate(parsed_data, type_)
+        for name, field_type in get_dataclass_type_hints(type_).items():
+            if parsed_data.get(name) and field_type not in [str, int, float, bool]:
+                parsed_data[name] = self.deserialize(
+                    parsed_data[name], field_type, self.is_validated(field_type)
+                )
         return type_(**parsed_data)
 
+    def is_validated(self, type_: Type, validated: bool = True) -> bool:
+        '''Determines if data of type_ nested in validated data was checked as well. Types without a
+        validator (e.g Any) are not, so dataclasses nested in them are validated when they're
+        deserialized.
+        '''
+        return validated and self.get_validator(type_) is not None
+
+    def validate(self, data: Any, type_: Type):
+        '''Checks that decoded data has the shape of type_ in a single pass, before anything is
+        deserialized: dataclass objects must have all required fields and no unknown ones, and primitive,
+        list, dict, Optional and Enum fields must hold matching values.
+
+        Raises:
+            ValidationError: Listing every error found (at most MAX_VALIDATION_ERRORS)
+        '''
+        validator = self.get_validator(type_)
+        if validator is None:
+            return
+        errors: List[Dict[str, str]] = []
+        validator(data, '', errors)
+        if errors:
+            raise ValidationError(errors[:MAX_VALIDATION_ERRORS])
+
+    def get_validator(self, type_: Type) -> Optional[Validator]:
+        '''Returns the validator of type_, compiled on first use, see
+        `flask_hintful.validation.compile_validator`.
+        '''
+        if type_ not in self.validators:
+            self.validators[type_] = compile_validator(type_, self.get_validator, self.deserializers)
+        return self.validators[type_]
+
     @staticmethod
     def is_marshmallow_model(data: T) -> bool:
         '''Determines if data is a marshmallow object by checking if it has a marshmallow
@@ -155,8 +365,7 @@ class Deserializer():
             return True
         return False
 
-    @staticmethod
-    def deserialize_marshmallow_model(data: Union[str, dict], type_: Type) -> str:
+    def deserialize_marshmallow_model(self, data: Union[str, dict], type_: Type) -> str:
         '''Uses marshmallow.Schema.load or loads to deserialize `data`. Assumes that
         data makes it's schema available in __marshmallow__ attrbute
 
@@ -167,8 +376,40 @@ class Deserializer():
             str: string representation of data
         '''
         if isinstance(data, str):
-            return type_.__marshmallow__().loads(data)
-        return type_.__marshmallow__().load(data)
+            return self.get_schema(type_).loads(data)
+        return self.get_schema(type_).load(data)
+
+    def get_schema(self, type_: Type):
+        '''Returns a marshmallow schema instance for model `type_`, instantiated once per type.
+        '''
+        schema = self.schemas.get(type_)
+        if schema is None:
+            schema = self.schemas[type_] = type_.__marshmallow__()
+        return schema
+
+    def warmup(self, type_: Type):
+        '''Builds everything that would otherwise be lazily built when deserializing `type_`
+        (and types nested in it) for the first time, including the deserializers used for already
+        validated fields of dataclasses.
+
+        Args:
+            type_ (Type): Any type, e.g a view func param type
+        '''
+        for nested_type in iter_nested_types(type_):
+            for validated, resolved_deserializers in (
+                (False, self.resolved_deserializers), (True, self.validated_deserializers)
+            ):
+                if nested_type not in resolved_deserializers:
+                    try:
+                        resolved_deserializers[nested_type] = self.resolve_deserializer(
+                            nested_type, validated
+                        )
+                    except TypeError:
+                        pass
+            if self.is_marshmallow_model(nested_type):
+                self.get_schema(nested_type)
+            elif self.is_dataclass(nested_type):
+                self.get_validator(nested_type)
 
 
 def str_to_bool(data: str) -> bool:
@@ -190,5 +431,74 @@ def str_to_bool(data: str) -> bool:
     raise ValueError(f'{data} not in accepted values {TRUE_STRS}, {FALSE_STRS}')
 
 
+def first(data):
+    '''Returns the first item of a list of args, data itself if it isn't a list.
+    '''
+    if isinstance(data, list):
+        return data[0]
+    return data
+
+
+def to_decimal(data: Union[str, int, float]) -> Decimal:
+    '''Parse data into Decimal. Floats are converted using their str representation, so 1.1 becomes
+    Decimal('1.1')
+
+    Raises:
+        InvalidValue: If data isn't a valid Decimal
+    '''
+    try:
+        return Decimal(str(data))
+    except InvalidOperation:
+        raise InvalidValue(f'{data} is not a valid Decimal') from None
+
+
+def to_uuid(data: str) -> UUID:
+    '''Parse data into UUID.
+
+    Raises:
+        InvalidValue: If data isn't a valid UUID str
+    '''
+    try:
+        return UUID(data)
+    except (AttributeError, TypeError, ValueError):
+        raise InvalidValue(f'{data} is not a valid UUID') from None
+
+
+def base64_to_bytes(data: Union[str, bytes]) -> bytes:
+    '''Parse base64 or base64url data, padding is optional. bytes (e.g MessagePack bin values) are
+    returned unchanged.
+
+    Raises:
+        ValueError: If data is not valid base64
+    '''
+    if isinstance(data, (bytes, bytearray)):
+        return bytes(data)
+    data = data.replace('-', '+').replace('_', '/')
+    return b64decode(data + '=' * (-len(data) % 4), validate=True)
+
+
+def deserialize_enum(data, type_: Type[Enum]) -> Enum:
+    '''Parse data into a member of Enum type_, by value or name. Str data is also converted to the type
+    of the members values, e.g '1' for an IntEnum.
+
+    Raises:
+        InvalidValue: If data isn't a value or name of type_
+    '''
+    try:
+        return type_(data)
+    except ValueError:
+        pass
+    if isinstance(data, str):
+        if data in type_.__members__:
+            return type_.__members__[data]
+        for member in type_:
+            try:
+                if member.value == member.value.__class__(data):
+                    return member
+            except (TypeError, ValueError):
+                continue
+    raise InvalidValue(f'{data} is not a valid {type_.__name__}')
+
+
 TRUE_STRS: List[str] = ['true', '1', 't', 'y']
 FALSE_STRS: List[str] = ['false', '0', 'f', 'n']
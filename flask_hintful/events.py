@@ -0,0 +1,149 @@
+from queue import Empty, Full, Queue
+from threading import Event, Thread
+from typing import Any, Generic, Iterable, Iterator, Optional, T, Type
+
+from flask import Response, copy_current_request_context, has_request_context
+
+EVENT_STREAM_CONTENT_TYPE = 'text/event-stream'
+
+DEFAULT_SSE_HEARTBEAT = 15
+EVENT_QUEUE_SIZE = 16
+
+HEARTBEAT = object()
+HEARTBEAT_FRAME = b': heartbeat\n\n'
+
+
+class EventStream(Generic[T]):
+    '''Return type hint for view funcs that return (or are generators yielding) T objects to be streamed
+    to the client as Server-Sent Events.
+
+    Every item is serialized as JSON with the route's Serializer (respecting the `fields` query arg)
+    and sent as the `data` of one `text/event-stream` frame, which is flushed to the client as soon as
+    the item is produced. Yield `ServerSentEvent` objects to also set the event name, id or retry of
+    a frame. While the view func doesn't produce items a heartbeat comment is sent every `heartbeat`
+    seconds, so proxies and clients don't close idle connections.
+
+    Args:
+        items (Iterable[T]): Items to be streamed
+        heartbeat (float, optional): Seconds between heartbeats, 0 disables them.
+            Defaults to None (FLASK_HINTFUL_SSE_HEARTBEAT config or 15).
+    '''
+
+    def __init__(self, items: Iterable[T], heartbeat: Optional[float] = None):
+        self.items = items
+        self.heartbeat = heartbeat
+
+
+class ServerSentEvent():
+    '''A frame of an EventStream with an event name, id or reconnection time besides its data.
+
+    Args:
+        data (Any): Serialized with the route's Serializer
+        event (str, optional): Event name, clients dispatch it to listeners of this name.
+            Defaults to None.
+        id (str, optional): Event id, sent back by clients in the Last-Event-ID header when they
+            reconnect. Defaults to None.
+        retry (int, optional): Milliseconds clients wait before reconnecting. Defaults to None.
+    '''
+
+    def __init__(self, data: Any, event: Optional[str] = None, id: Optional[str] = None,
+                 retry: Optional[int] = None):
+        self.data = data
+        self.event = event
+        self.id = id
+        self.retry = retry
+
+
+def to_event_stream(response):
+    '''Wraps the body of a view func response in EventStream, unless it's already an EventStream.
+
+    Args:
+        response: View func response, may be a tuple like Flask`s
+
+    Returns:
+        response with its body as EventStream
+    '''
+    if isinstance(response, tuple):
+        return (to_event_stream(response[0]), *response[1:])
+    if isinstance(response, (Response, EventStream)):
+        return response
+    return EventStream(response)
+
+
+def is_event_stream(type_: Type) -> bool:
+    '''Determines if type_ is EventStream or EventStream[T]
+    '''
+    return type_ is EventStream or getattr(type_, '__origin__', None) is EventStream
+
+
+def get_event_type(type_: Type) -> Type:
+    '''Returns T of EventStream[T], str for a bare EventStream
+    '''
+    return type_.__args__[0] if getattr(type_, '__args__', None) else str
+
+
+def format_event(data: str, event: Optional[str] = None, id: Optional[str] = None,
+                 retry: Optional[int] = None) -> bytes:
+    '''Formats one `text/event-stream` frame, data spanning several lines is sent in one `data` field
+    per line.
+    '''
+    lines = []
+    if event is not None:
+        lines.append(f'event: {event}')
+    if id is not None:
+        lines.append(f'id: {id}')
+    if retry is not None:
+        lines.append(f'retry: {retry}')
+    lines.extend(f'data: {line}' for line in data.splitlines() or [''])
+    return ('\n'.join(lines) + '\n\n').encode()
+
+
+def iter_with_heartbeats(items: Iterable, interval: float) -> Iterator:
+    '''Iterates over items in a separate thread and yields them, yielding `HEARTBEAT` whenever no item
+    was produced for `interval` seconds.
+
+    The thread runs with a copy of the current request context, if any. It stops once the returned
+    iterator is closed (e.g the client disconnected) and items yields its next item, closing items.
+    Exceptions raised by items are raised by the returned iterator.
+    '''
+    queue: Queue = Queue(EVENT_QUEUE_SIZE)
+    stopped = Event()
+
+    def put(kind, value) -> bool:
+        while not stopped.is_set():
+            try:
+                queue.put((kind, value), timeout=interval)
+                return True
+            except Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put('item', item):
+                    return
+            put('done', None)
+        except Exception as err:
+            put('error', err)
+        finally:
+            close = getattr(items, 'close', None)
+            if close is not None:
+                close()
+
+    target = copy_current_request_context(produce) if has_request_context() else produce
+    Thread(target=target, name='flask-hintful-event-stream', daemon=True).start()
+    try:
+        while True:
+            try:
+                kind, value = queue.get(timeout=interval)
+            except Empty:
+                yield HEARTBEAT
+                continue
+            if kind == 'done':
+                return
+            if kind == 'error':
+                raise value
+            yield value
+    finally:
+        stopped.set()
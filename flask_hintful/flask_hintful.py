@@ -1,20 +1,32 @@
+import gc
+from typing import Callable, Dict, List, Optional
+
 from flask import Blueprint, Flask
 
+from .background import (DEFAULT_BACKGROUND_MAX_TASKS, DEFAULT_BACKGROUND_RESULT_TTL,
+                         DEFAULT_BACKGROUND_WORKERS, TASK_STATUS_ENDPOINT, BackgroundTasks)
+from .cli import create_cli
 from .deserializer import Deserializer
 from .openapi import OpenApiProvider
 from .serializer import Serializer
-from .wrapper import BlueprintWrapper, view_func_wrapper
+from .stats import TypeStats
+from .utils import get_func_sig
+from .wrapper import BlueprintWrapper, pop_hintful_options, view_func_wrapper
 
 
 class FlaskHintful():
-    '''The FlaskHintful object implements `route` and `register_blueprints` that mimic those of Flask. These
-    will wrap your view funcs to serialize/deserialize HTTP query/path/body and pass them as params to your
-    view functions.
+    '''The FlaskHintful object implements `route` and `register_blueprints` that mimic those of Flask.
+    These will wrap your view funcs to serialize/deserialize HTTP query/path/body and pass them as params
+    to your view functions.
 
-    It inspect types hints in your view funcs to attempt to serialize/deserialize arguments to the expected
-    types.
+    It inspect types hints in your view funcs to attempt to serialize/deserialize arguments to the
+    expected types.
 
     It will also inspect all registered routes and automatically generate a OpenApi specification.
+    The specification can be exported at build time using `flask hintful export-openapi`.
+
+    If FLASK_HINTFUL_COLLECT_STATS is set, serialization and deserialization costs are counted per type,
+    see `get_stats`.
 
     Args:
         flask_app (Flask): Instance of the underlying Flask application
@@ -35,14 +47,24 @@ class FlaskHintful():
         self.serializer = serializer or Serializer()
         self.deserializer = deserializer or Deserializer()
         self.openapi_provider = openapi_provider or OpenApiProvider()
+        self.view_funcs: List[Callable] = []
+        self.background_tasks: Optional[BackgroundTasks] = None
+        if flask_app.config.get('FLASK_HINTFUL_COLLECT_STATS'):
+            self.serializer.stats = self.serializer.stats or TypeStats()
+            self.deserializer.stats = self.deserializer.stats or TypeStats()
         self.flask_app.add_url_rule(
             flask_app.config.get('FLASK_HINTFUL_OPENAPI_JSON_URL', '/openapi.json'),
             view_func=self.openapi_provider.get_openapi_spec
         )
+        self.flask_app.add_url_rule(
+            flask_app.config.get('FLASK_HINTFUL_OPENAPI_SHARD_URL', '/openapi/<name>.json'),
+            view_func=self.openapi_provider.get_openapi_shard_spec
+        )
         self.flask_app.add_url_rule(
             flask_app.config.get('FLASK_HINTFUL_OPENAPI_UI_URL', '/swagger'),
             view_func=self.openapi_provider.get_openapi_ui
         )
+        self.flask_app.cli.add_command(create_cli(self))
         if openapi_security:
             self.openapi_provider.add_security(openapi_security)
 
@@ -50,29 +72,161 @@ class FlaskHintful():
         '''Wrap the decorated function using view_func_wrapper then register the wrapped func
         within the underlying Flask application.
 
+        Besides Flask`s options accepts:
+            max_content_length (int): Max request body size in bytes, overrides
+                FLASK_HINTFUL_MAX_CONTENT_LENGTH config for this route.
+            cache (SqliteResponseCache): Caches GET responses in a store shared by all worker processes.
+            cache_ttl (float): Seconds responses of this route are cached for, defaults to
+                cache.default_ttl.
+            idempotent (bool): Replays responses to retries sent with the same Idempotency-Key header.
+            idempotency_ttl (float): Seconds responses are replayed for, overrides
+                FLASK_HINTFUL_IDEMPOTENCY_TTL config (24 hours) for this route.
+            single_flight (bool): Concurrent GET requests with identical args share one execution of the
+                view func.
+            max_concurrency (int): Max requests of this route handled at once per process, requests over
+                it wait in a queue of max_queue requests for at most queue_timeout seconds or are
+                rejected with 503 and a Retry-After header of retry_after seconds
+                (FLASK_HINTFUL_RETRY_AFTER config).
+            background (bool): Calls the view func in a thread pool and returns 202 with the url of a
+                status route serving its response once finished, see `get_background_tasks`.
+            timeout (float): Seconds requests of this route may take before 504 is returned, overrides
+                FLASK_HINTFUL_REQUEST_TIMEOUT config. Clients may shorten it with the X-Request-Timeout
+                header.
+            openapi_tag (str): Tags the route in the OpenApi specification, the routes of each tag are
+                also served in a specification of their own at FLASK_HINTFUL_OPENAPI_SHARD_URL
+                ('/openapi/<name>.json').
+
         Args:
             rule (str): HTTP path to register this view func.
         '''
+        openapi_tag = options.pop('openapi_tag', None)
+        hintful_options = self.pop_hintful_options(options)
+
         def decorator(view_func):
             wrapped_view_func = view_func_wrapper(
                 view_func,
                 self.serializer,
-                self.deserializer
+                self.deserializer,
+                **hintful_options
             )
             self.flask_app.route(rule, **options)(wrapped_view_func)
-            self.openapi_provider.add_openapi_path(rule, options.get('methods', ['GET']), view_func)
+            self.view_funcs.append(view_func)
+            self.openapi_provider.add_openapi_path(
+                rule, options.get('methods', ['GET']), view_func, openapi_tag
+            )
             return view_func
         return decorator
 
+    def pop_hintful_options(self, options: dict) -> dict:
+        '''Removes Flask Hintful route options from `options` and resolves them into view_func_wrapper
+        kwargs.
+
+        Returns:
+            dict: kwargs for view_func_wrapper
+        '''
+        hintful_options = pop_hintful_options(options)
+        if hintful_options.pop('background', False):
+            hintful_options['background_tasks'] = self.get_background_tasks()
+        return hintful_options
+
+    def get_background_tasks(self) -> BackgroundTasks:
+        '''Returns the BackgroundTasks running view funcs of background routes. On first use creates it
+        from FLASK_HINTFUL_BACKGROUND_WORKERS (4), FLASK_HINTFUL_BACKGROUND_MAX_TASKS (1000) and
+        FLASK_HINTFUL_BACKGROUND_RESULT_TTL (3600 seconds) config and registers the task status route at
+        FLASK_HINTFUL_TASK_URL ('/tasks/<task_id>').
+        '''
+        if self.background_tasks is None:
+            config = self.flask_app.config
+            self.background_tasks = BackgroundTasks(
+                config.get('FLASK_HINTFUL_BACKGROUND_WORKERS', DEFAULT_BACKGROUND_WORKERS),
+                config.get('FLASK_HINTFUL_BACKGROUND_MAX_TASKS', DEFAULT_BACKGROUND_MAX_TASKS),
+                config.get('FLASK_HINTFUL_BACKGROUND_RESULT_TTL', DEFAULT_BACKGROUND_RESULT_TTL)
+            )
+            self.flask_app.add_url_rule(
+                config.get('FLASK_HINTFUL_TASK_URL', '/tasks/<task_id>'),
+                TASK_STATUS_ENDPOINT,
+                view_func=self.background_tasks.get_task_status
+            )
+        return self.background_tasks
+
     def register_blueprint(self, blueprint: Blueprint):
         '''Wraps all view funcs declared on blueprint using BlueprintWrapper, then registers the
-        Blueprint within the underlying Flask application.
+        Blueprint within the underlying Flask application. Its routes are tagged with the Blueprint's
+        name (unless they set `openapi_tag`) and served in their own OpenApi specification at
+        FLASK_HINTFUL_OPENAPI_SHARD_URL ('/openapi/<name>.json').
 
         Args:
             blueprint (Blueprint): Flask Blueprint
         '''
-        bp_wrapper = BlueprintWrapper(self, blueprint.url_prefix)
+        bp_wrapper = BlueprintWrapper(self, blueprint.url_prefix, blueprint.name)
         for i, func in enumerate(blueprint.deferred_functions):
             if func.__qualname__ == 'Blueprint.add_url_rule.<locals>.<lambda>':
                 blueprint.deferred_functions[i] = func(bp_wrapper)
         self.flask_app.register_blueprint(blueprint)
+
+    def warmup(self, freeze: bool = True):
+        '''Eagerly builds everything that is otherwise built lazily on first use: the signature of every
+        registered view func and, for each of its param and return types (and types nested in them), the
+        resolved deserializer, validator, dumper, converter and marshmallow schemas, as well as the
+        OpenApi specification and the specification of every shard.
+
+        Call this after registering all routes and before forking worker processes. With `freeze` all
+        objects allocated so far are moved to a permanent generation (gc.freeze) so the garbage collector
+        doesn't touch them, keeping memory pages shared copy-on-write between forked workers.
+
+        Args:
+            freeze (bool, optional): If gc.freeze should be called. Defaults to True.
+        '''
+        for view_func in self.view_funcs:
+            func_sig = get_func_sig(view_func)
+            types = [param.annotation for param in func_sig['params'].values()] + [func_sig['return']]
+            for type_ in types:
+                self.serializer.warmup(type_)
+                self.deserializer.warmup(type_)
+        with self.flask_app.app_context():
+            self.openapi_provider.warmup()
+        if freeze:
+            gc.collect()
+            gc.freeze()
+
+    def get_stats(self) -> Dict[str, dict]:
+        '''Returns per type serialization and deserialization costs collected so far, see
+        `TypeStats.snapshot`.
+
+        Returns:
+            Dict[str, dict]: {'serializer': {...}, 'deserializer': {...}}, empty if stats are disabled
+        '''
+        return {
+            name: provider.stats.snapshot() if provider.stats is not None else {}
+            for name, provider in (('serializer', self.serializer), ('deserializer', self.deserializer))
+        }
+
+    def export_stats(self, prefix: str = 'flask_hintful') -> str:
+        '''Returns per type serialization and deserialization costs in the Prometheus text format,
+        see `TypeStats.export_prometheus`, and the requests admitted and shed by routes with
+        `max_concurrency`.
+        '''
+        exported = ''.join(
+            provider.stats.export_prometheus(f'{prefix}_{name}')
+            for name, provider in (('serializer', self.serializer), ('deserializer', self.deserializer))
+            if provider.stats is not None
+        )
+        concurrency_stats = self.get_concurrency_stats()
+        for counter in ('admitted', 'shed'):
+            if concurrency_stats:
+                exported += f'# TYPE {prefix}_requests_{counter}_total counter\n'
+            for endpoint, snapshot in sorted(concurrency_stats.items()):
+                exported += (
+                    f'{prefix}_requests_{counter}_total{{endpoint="{endpoint}"}} {snapshot[counter]}\n'
+                )
+        return exported
+
+    def get_concurrency_stats(self) -> Dict[str, Dict[str, int]]:
+        '''Returns requests in flight, waiting, admitted and shed per endpoint of routes with
+        `max_concurrency`, see `ConcurrencyLimiter.snapshot`.
+        '''
+        return {
+            endpoint: view_func.concurrency_limiter.snapshot()
+            for endpoint, view_func in self.flask_app.view_functions.items()
+            if getattr(view_func, 'concurrency_limiter', None) is not None
+        }
@@ -0,0 +1,112 @@
+from collections import OrderedDict
+from threading import Event, Lock
+from time import time
+from typing import Callable, Optional
+
+from flask import Response
+from werkzeug.exceptions import UnprocessableEntity
+
+from .cache import CachedResponse
+
+IDEMPOTENCY_KEY_HEADER = 'Idempotency-Key'
+IDEMPOTENT_REPLAYED_HEADER = 'Idempotent-Replayed'
+
+DEFAULT_IDEMPOTENCY_TTL = 24 * 60 * 60
+DEFAULT_IDEMPOTENCY_MAX_ENTRIES = 10000
+
+
+class IdempotencyEntry():
+    '''Outcome of the first request sent with an Idempotency-Key, `done` is set once it finished.
+    '''
+
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.done = Event()
+        self.response: Optional[CachedResponse] = None
+        self.expires = 0.0
+
+
+class IdempotencyStore():
+    '''In process store of responses to requests sent with an Idempotency-Key header.
+
+    The first request with a key runs the view func, retries with the same key replay its response while
+    it's stored (until `ttl` expires) and retries arriving while it's still running wait for it instead
+    of running the view func again. Responses with a 5xx status, streamed responses and requests that
+    raised aren't stored, so the next retry runs the view func again.
+
+    Entries live in the memory of this process and aren't shared with other worker processes, a retry
+    handled by another worker runs the view func again.
+
+    Args:
+        max_entries (int, optional): Max number of stored responses, oldest are evicted first.
+            Defaults to 10000.
+    '''
+
+    def __init__(self, max_entries: int = DEFAULT_IDEMPOTENCY_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries: 'OrderedDict[str, IdempotencyEntry]' = OrderedDict()
+        self.lock = Lock()
+
+    def run(self, key: str, fingerprint: str, func: Callable[[], Response], ttl: float) -> Response:
+        '''Returns the response stored for key, waiting for it if it's being produced, otherwise calls
+        func and stores its response for ttl seconds.
+
+        Args:
+            key (str): Idempotency key sent by the client
+            fingerprint (str): Hash of the request, a key can't be reused for a different request
+            func (Callable[[], Response]): Produces the response
+            ttl (float): Seconds the response is replayed for
+
+        Raises:
+            UnprocessableEntity: If key was already used with a different fingerprint
+
+        Returns:
+            Response: The response of func or a replay of the stored one
+        '''
+        while True:
+            now = time()
+            with self.lock:
+                entry = self.entries.get(key)
+                if entry is not None and entry.done.is_set() and entry.expires <= now:
+                    del self.entries[key]
+                    entry = None
+                if entry is None:
+                    entry = self.entries[key] = IdempotencyEntry(fingerprint)
+                    self.evict()
+                    break
+            if entry.fingerprint != fingerprint:
+                raise UnprocessableEntity(
+                    f'{IDEMPOTENCY_KEY_HEADER} {key} was already used for a different request'
+                )
+            entry.done.wait()
+            if entry.response is not None:
+                return replay_response(entry.response)
+
+        try:
+            response = func()
+            if response.status_code < 500 and not response.is_streamed:
+                entry.response = CachedResponse.from_response(response)
+                entry.expires = time() + ttl
+            return response
+        finally:
+            if entry.response is None:
+                with self.lock:
+                    if self.entries.get(key) is entry:
+                        del self.entries[key]
+            entry.done.set()
+
+    def evict(self):
+        '''Removes the oldest finished entries while there are more than max_entries.
+        Must be called holding `lock`.
+        '''
+        for key in list(self.entries):
+            if len(self.entries) <= self.max_entries:
+                return
+            if self.entries[key].done.is_set():
+                del self.entries[key]
+
+
+def replay_response(response: CachedResponse) -> Response:
+    replayed = response.to_response()
+    replayed.headers[IDEMPOTENT_REPLAYED_HEADER] = 'true'
+    return replayed
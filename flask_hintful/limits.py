@@ -0,0 +1,77 @@
+from threading import Condition
+from typing import Dict, Optional
+
+
+class ConcurrencyLimiter():
+    '''Limits how many requests a route handles at once within a process.
+
+    Requests over `max_concurrency` wait for a slot in a queue of at most `max_queue` requests, for at
+    most `queue_timeout` seconds. Requests that don't fit in the queue or time out waiting are shed.
+
+    Args:
+        max_concurrency (int): Max number of requests handled at once
+        max_queue (int, optional): Max number of requests waiting for a slot. Defaults to 0 (no waiting).
+        queue_timeout (float, optional): Max seconds a request waits for a slot.
+            Defaults to None (no limit).
+    '''
+
+    def __init__(self, max_concurrency: int, max_queue: int = 0, queue_timeout: Optional[float] = None):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.condition = Condition()
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.shed = 0
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        '''Takes a slot, waiting in the queue if there isn't one free.
+
+        Args:
+            timeout (float, optional): Max seconds to wait, e.g the remaining budget of the request,
+                waits for at most queue_timeout regardless. Defaults to None (queue_timeout).
+
+        Returns:
+            bool: True if a slot was taken and must be released, False if the request must be shed
+        '''
+        with self.condition:
+            if self.in_flight < self.max_concurrency:
+                self.in_flight += 1
+                self.admitted += 1
+                return True
+            if self.waiting >= self.max_queue:
+                self.shed += 1
+                return False
+            self.waiting += 1
+            try:
+                if timeout is None or (self.queue_timeout is not None and self.queue_timeout < timeout):
+                    timeout = self.queue_timeout
+                has_slot = self.condition.wait_for(
+                    lambda: self.in_flight < self.max_concurrency, timeout
+                )
+            finally:
+                self.waiting -= 1
+            if not has_slot:
+                self.shed += 1
+                return False
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+
+    def release(self):
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify()
+
+    def snapshot(self) -> Dict[str, int]:
+        '''Returns requests currently in flight and waiting, and the number of requests admitted and shed
+        so far.
+        '''
+        with self.condition:
+            return {
+                'in_flight': self.in_flight,
+                'waiting': self.waiting,
+                'admitted': self.admitted,
+                'shed': self.shed
+            }
@@ -0,0 +1,300 @@
+'''Load generator that serves a Flask app from a local threaded server and drives it with concurrent
+clients.
+
+Run `python -m flask_hintful.loadtest` to compare a route set modeled on sample.py served with and
+without FlaskHintful, reporting throughput and p50/p95/p99 latencies.
+'''
+import argparse
+import http.client
+import math
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+from time import perf_counter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from dateutil.parser import parse as date_parser
+from flask import Flask, json, request
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from .flask_hintful import FlaskHintful
+
+
+@dataclass
+class LoadTestRequest():
+    '''A request sent by load test clients.
+    '''
+    method: str
+    path: str
+    body: Optional[bytes] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class LoadTestResult():
+    '''Outcome of `run_load_test`, latencies are in seconds.
+    '''
+    name: str
+    requests: int
+    errors: int
+    seconds: float
+    latencies: List[float] = field(repr=False)
+
+    @property
+    def throughput(self) -> float:
+        '''Requests per second
+        '''
+        return self.requests / self.seconds if self.seconds else 0.0
+
+    @property
+    def p50(self) -> float:
+        return percentile(self.latencies, 50)
+
+    @property
+    def p95(self) -> float:
+        return percentile(self.latencies, 95)
+
+    @property
+    def p99(self) -> float:
+        return percentile(self.latencies, 99)
+
+
+def percentile(values: List[float], percent: float) -> float:
+    '''Nearest-rank percentile of values, 0.0 if values is empty.
+    '''
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    '''Doesn't log requests, logging would dominate the measured latencies.
+    '''
+
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+@contextmanager
+def serve_in_thread(flask_app: Flask) -> Iterator[Tuple[str, int]]:
+    '''Serves flask_app from a threaded werkzeug server on a free local port while in the context.
+
+    Yields:
+        Tuple[str, int]: host and port the server listens on
+    '''
+    server = make_server('127.0.0.1', 0, flask_app, threaded=True, request_handler=QuietRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server.server_address[:2]
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def run_load_test(flask_app: Flask, requests: List[LoadTestRequest], clients: int = 8,
+                  requests_per_client: int = 200, warmup: int = 20, name: str = '') -> LoadTestResult:
+    '''Serves flask_app locally and sends `requests` in a round robin from `clients` concurrent client
+    threads, each sending `requests_per_client` requests on a new connection per request.
+
+    Args:
+        flask_app (Flask): The Flask application under test
+        requests (List[LoadTestRequest]): Requests to send
+        clients (int, optional): Number of concurrent clients. Defaults to 8.
+        requests_per_client (int, optional): Requests sent by each client. Defaults to 200.
+        warmup (int, optional): Requests sent before measuring. Defaults to 20.
+        name (str, optional): Name of the result. Defaults to ''.
+
+    Returns:
+        LoadTestResult: Throughput, latencies and errors (responses with status >= 400 or failed
+            connections)
+    '''
+    latencies: List[float] = []
+    errors = []
+    lock = threading.Lock()
+
+    with serve_in_thread(flask_app) as (host, port):
+        def send(load_request: LoadTestRequest) -> bool:
+            connection = http.client.HTTPConnection(host, port, timeout=30)
+            try:
+                connection.request(load_request.method, load_request.path, load_request.body,
+                                   load_request.headers)
+                response = connection.getresponse()
+                response.read()
+                return response.status < 400
+            except OSError:
+                return False
+            finally:
+                connection.close()
+
+        for index in range(warmup):
+            send(requests[index % len(requests)])
+
+        barrier = threading.Barrier(clients + 1)
+
+        def client(client_index: int):
+            client_latencies = []
+            client_errors = 0
+            barrier.wait()
+            for index in range(requests_per_client):
+                start = perf_counter()
+                ok = send(requests[(client_index + index) % len(requests)])
+                client_latencies.append(perf_counter() - start)
+                client_errors += not ok
+            with lock:
+                latencies.extend(client_latencies)
+                errors.append(client_errors)
+
+        threads = [threading.Thread(target=client, args=(index,)) for index in range(clients)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = perf_counter()
+        for thread in threads:
+            thread.join()
+        seconds = perf_counter() - start
+
+    return LoadTestResult(name, len(latencies), sum(errors), seconds, latencies)
+
+
+@dataclass
+class NestedModel():
+    str_field: str
+
+
+@dataclass
+class DataclassModel():
+    str_field: str
+    int_field: int
+    float_field: float
+    boolean_field: bool
+    list_field: list
+    date_field: date
+    datetime_field: datetime
+    nested_field: NestedModel
+
+
+SAMPLE_MODEL = {
+    'str_field': 'test_string',
+    'int_field': 1,
+    'float_field': 1.5,
+    'boolean_field': True,
+    'list_field': ['1', '2', 'str'],
+    'date_field': '2019-09-08',
+    'datetime_field': '2019-07-06T05:04:03-01:00',
+    'nested_field': {'str_field': 'nested_str'}
+}
+
+SAMPLE_LIST_SIZE = 50
+
+
+def create_hintful_app() -> Flask:
+    '''sample.py routes served by FlaskHintful
+    '''
+    app = Flask('hintful')
+    api = FlaskHintful(app)
+
+    @api.route('/<id>/dataclass_test', methods=['POST'])
+    def dataclass_route(id: str, query_arg: int, model: DataclassModel) -> DataclassModel:
+        return model
+
+    @api.route('/<id>/dataclass')
+    def get_dataclass(id: str) -> DataclassModel:
+        return load_sample_model(SAMPLE_MODEL)
+
+    @api.route('/dataclass_list')
+    def list_dataclasses(limit: int) -> List[DataclassModel]:
+        return [load_sample_model(SAMPLE_MODEL)] * limit
+
+    return app
+
+
+def create_flask_app() -> Flask:
+    '''sample.py routes doing the same (de)serialization by hand with plain Flask
+    '''
+    app = Flask('flask')
+
+    @app.route('/<id>/dataclass_test', methods=['POST'])
+    def dataclass_route(id: str):
+        int(request.args['query_arg'])
+        model = load_sample_model(request.get_json())
+        return dump_sample_model(model), {'Content-Type': 'application/json'}
+
+    @app.route('/<id>/dataclass')
+    def get_dataclass(id: str):
+        return dump_sample_model(load_sample_model(SAMPLE_MODEL)), {'Content-Type': 'application/json'}
+
+    @app.route('/dataclass_list')
+    def list_dataclasses():
+        models = [load_sample_model(SAMPLE_MODEL)] * int(request.args['limit'])
+        body = json.dumps([asdict(model) for model in models], default=lambda value: value.isoformat())
+        return body, {'Content-Type': 'application/json'}
+
+    return app
+
+
+def load_sample_model(data: dict) -> DataclassModel:
+    return DataclassModel(**{
+        **data,
+        'date_field': date_parser(data['date_field']).date(),
+        'datetime_field': date_parser(data['datetime_field']),
+        'nested_field': NestedModel(**data['nested_field'])
+    })
+
+
+def dump_sample_model(model: DataclassModel) -> str:
+    return json.dumps(asdict(model), default=lambda value: value.isoformat())
+
+
+def get_sample_requests() -> List[LoadTestRequest]:
+    '''Requests for the sample route set, the same for both apps
+    '''
+    return [
+        LoadTestRequest('POST', '/1/dataclass_test?query_arg=1', json.dumps(SAMPLE_MODEL).encode(),
+                        {'Content-Type': 'application/json'}),
+        LoadTestRequest('GET', '/1/dataclass'),
+        LoadTestRequest('GET', f'/dataclass_list?limit={SAMPLE_LIST_SIZE}'),
+    ]
+
+
+def format_results(results: List[LoadTestResult]) -> str:
+    '''Formats results as a table, latencies in milliseconds.
+    '''
+    lines = [
+        f'{"app":<10}{"requests":>10}{"errors":>8}{"req/s":>10}'
+        f'{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}'
+    ]
+    for result in results:
+        lines.append(
+            f'{result.name:<10}{result.requests:>10}{result.errors:>8}{result.throughput:>10.1f}'
+            f'{result.p50 * 1000:>10.2f}{result.p95 * 1000:>10.2f}{result.p99 * 1000:>10.2f}'
+        )
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description='Compare sample.py routes served with and without FlaskHintful.'
+    )
+    parser.add_argument('--clients', type=int, default=8, help='Number of concurrent clients.')
+    parser.add_argument('--requests', type=int, default=200, help='Requests sent by each client.')
+    args = parser.parse_args(argv)
+
+    requests = get_sample_requests()
+    results = [
+        run_load_test(create_flask_app(), requests, args.clients, args.requests, name='flask'),
+        run_load_test(create_hintful_app(), requests, args.clients, args.requests, name='hintful'),
+    ]
+    print(format_results(results))
+    flask_result, hintful_result = results
+    if flask_result.p50 and hintful_result.throughput:
+        print(f'\nhintful overhead: {hintful_result.p50 / flask_result.p50 - 1:+.1%} p50, '
+              f'{flask_result.throughput / hintful_result.throughput - 1:+.1%} time per request')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,22 +1,35 @@
+import gzip
+import os
 import re
-from dataclasses import is_dataclass
-from typing import Callable, List
+from dataclasses import dataclass, fields, is_dataclass, make_dataclass
+from typing import Any, Callable, Dict, List, Optional, Type
 
-from flask import Response, current_app, jsonify
+from flask import Response, current_app, json, jsonify, request, send_file
 from openapi_specgen import (OpenApi,
                              OpenApiParam, OpenApiPath, OpenApiResponse,
                              OpenApiSecurity)
 from openapi_specgen.security import ApiKeyAuth, BasicAuth, BearerAuth
-from .utils import get_func_sig
+from werkzeug.exceptions import NotFound
+
+from .binary import BINARY_CONTENT_TYPE, is_binary_type
+from .events import EVENT_STREAM_CONTENT_TYPE, get_event_type, is_event_stream
+from .pagination import get_page_type, is_paginated
+from .utils import get_dataclass_type_hints, get_func_sig
 
 
 class OpenApiProvider():
     '''Provides automatically generation of OpenApi specification for registered paths.
+
+    Paths registered with a `shard` (the name of their Blueprint or the route's `openapi_tag`) are tagged
+    with it and are also served in a smaller specification of their own, see `get_openapi_shard_spec`.
     '''
 
     def __init__(self):
         self.openapi_paths: List[OpenApiPath] = []
         self.openapi_security: OpenApiSecurity = OpenApiSecurity()
+        self.openapi_dict: Optional[dict] = None
+        self.openapi_shards: Dict[str, List[OpenApiPath]] = {}
+        self.openapi_shard_dicts: Dict[str, dict] = {}
 
     def add_security(self, auth_list: List[str]):
         '''Adds authentication types to OpenApiSecurity at root level
@@ -24,6 +37,8 @@ class OpenApiProvider():
         Args:
             auth_list: (List[str]). Items in List must be in (Basic, Bearer, ApiKey).
         '''
+        self.openapi_dict = None
+        self.openapi_shard_dicts.clear()
         if any(auth.lower() == 'basic' for auth in auth_list):
             self.openapi_security.basic_auth = BasicAuth()
         if any(auth.lower() == 'bearer' for auth in auth_list):
@@ -31,30 +46,36 @@ class OpenApiProvider():
         if any(auth.lower() == 'apikey' for auth in auth_list):
             self.openapi_security.api_key_auth = ApiKeyAuth()
 
-    def add_openapi_path(self, rule: str, methods: List[str], view_func: Callable):
-        '''Add a new OpenApi Path for each method. Inspects view_func's type hints to be able to determine
-        the appropriate paramater types.
+    def add_openapi_path(self, rule: str, methods: List[str], view_func: Callable,
+                         shard: Optional[str] = None):
+        '''Add a new OpenApi Path for each method. Inspects view_func's type hints to be able to
+        determine the appropriate paramater types.
 
             Args:
                 rule (str): HTTP Path that the view_func will be registered in Flask
                 methods (List[str]): List of HTTP Methods this path can receive
                 view_func (Callable): Function that is called when this HTTP path is invoked
+                shard (str, optional): Tag of the paths, also served in the specification of this shard.
+                    Defaults to None.
         '''
+        self.openapi_dict = None
+        self.openapi_shard_dicts.pop(shard, None)
         func_sig = get_func_sig(view_func)
         openapi_params = []
         body = None
 
         for param_name, param in func_sig['params'].items():
+            data_type = str if param.annotation is param.empty else get_openapi_type(param.annotation)
             if hasattr(param.annotation, '__marshmallow__'):
                 body = param.annotation.__marshmallow__
             elif is_dataclass(param.annotation):
-                body = param.annotation
+                body = get_openapi_type(param.annotation)
             elif f'<{param_name}>' in re.findall('<.*?>', rule):
                 openapi_params.append(
                     OpenApiParam(
                         param_name,
                         'path',
-                        data_type=param.annotation if param.annotation is not param.empty else str,
+                        data_type=data_type,
                         default=param.default if param.default is not param.empty else None,
                         required=param.default is param.empty
                     )
@@ -64,7 +85,7 @@ class OpenApiProvider():
                     OpenApiParam(
                         param_name,
                         'query',
-                        data_type=param.annotation if param.annotation is not param.empty else str,
+                        data_type=data_type,
                         default=param.default if param.default is not param.empty else None,
                         required=param.default is param.empty
                     )
@@ -72,32 +93,154 @@ class OpenApiProvider():
 
         response_type = func_sig['return'] if func_sig['return'] is not func_sig['empty'] else str
 
+        if is_paginated(response_type):
+            response_type = get_page_type(response_type)
+            openapi_params.extend([
+                OpenApiParam('limit', 'query', data_type=int, required=False),
+                OpenApiParam('offset', 'query', data_type=int, required=False),
+                OpenApiParam('cursor', 'query', data_type=str, required=False)
+            ])
+
+        content_type = 'application/json'
+        if is_event_stream(response_type):
+            response_type = get_event_type(response_type)
+            content_type = EVENT_STREAM_CONTENT_TYPE
+
         if hasattr(response_type, '__marshmallow__'):
             response_type = response_type.__marshmallow__
 
-        openapi_response = OpenApiResponse('', data_type=response_type)
+        if is_binary_type(response_type):
+            openapi_response = OpenApiResponse(
+                '', data_type=OpenApiBinary, http_content_type=BINARY_CONTENT_TYPE
+            )
+        else:
+            openapi_response = OpenApiResponse(
+                '', data_type=get_openapi_type(response_type), http_content_type=content_type
+            )
 
         for method in methods:
-            self.openapi_paths.append(
-                OpenApiPath(
-                    rule.replace('<', '{').replace('>', '}'),
-                    method.lower(),
-                    [openapi_response],
-                    openapi_params,
-                    descr=func_sig['doc'],
-                    request_body=body
-                )
+            openapi_path = OpenApiPath(
+                rule.replace('<', '{').replace('>', '}'),
+                method.lower(),
+                [openapi_response],
+                openapi_params,
+                descr=func_sig['doc'],
+                request_body=body
             )
+            self.openapi_paths.append(openapi_path)
+            if shard is not None:
+                self.openapi_shards.setdefault(shard, []).append(openapi_path)
 
     def get_openapi_spec(self) -> Response:
         '''Generates the OpenApi specification based on all registered Paths.
 
+        If FLASK_HINTFUL_OPENAPI_JSON_FILE is configured serves that pre-built file instead, or its gzip
+        variant (FLASK_HINTFUL_OPENAPI_JSON_FILE + '.gz') if it exists and the client accepts gzip, see
+        `export_openapi_spec`.
+
         Returns:
             Response: A Flask response containing the OpenApi spec as json
         '''
-        return jsonify(
-            OpenApi(current_app.name, self.openapi_paths, security=self.openapi_security).as_dict()
-        )
+        openapi_json_file = current_app.config.get('FLASK_HINTFUL_OPENAPI_JSON_FILE')
+        if openapi_json_file:
+            return self.send_openapi_file(openapi_json_file)
+        return jsonify(self.get_openapi_dict())
+
+    def get_openapi_dict(self) -> dict:
+        '''Generates the OpenApi specification based on all registered Paths as a dict.
+        The specification is cached until a new Path or security is added.
+        Must be called within an app context.
+        '''
+        if self.openapi_dict is None:
+            self.openapi_dict = self.build_openapi_dict(self.openapi_paths)
+        return self.openapi_dict
+
+    def get_openapi_shard_spec(self, name: str) -> Response:
+        '''Serves the OpenApi specification of a single shard, with an ETag so clients can revalidate it.
+        If FLASK_HINTFUL_OPENAPI_JSON_FILE is configured serves the shard's file exported next to it
+        instead, see `get_openapi_shard_path`.
+
+        Raises:
+            NotFound: If no path was registered in shard name
+
+        Returns:
+            Response: A Flask response containing the shard's OpenApi spec as json
+        '''
+        if name not in self.openapi_shards:
+            raise NotFound(f'OpenApi specification {name} not found')
+        openapi_json_file = current_app.config.get('FLASK_HINTFUL_OPENAPI_JSON_FILE')
+        if openapi_json_file:
+            return self.send_openapi_file(get_openapi_shard_path(openapi_json_file, name))
+        response = jsonify(self.get_openapi_shard_dict(name))
+        response.add_etag()
+        return response.make_conditional(request)
+
+    def get_openapi_shard_dict(self, name: str) -> dict:
+        '''Generates the OpenApi specification with only the paths of shard name (and the schemas they
+        use) as a dict. Each shard is cached until a new Path is added to it or security is added. Must
+        be called within an app context.
+
+        Raises:
+            NotFound: If no path was registered in shard name
+        '''
+        if name not in self.openapi_shards:
+            raise NotFound(f'OpenApi specification {name} not found')
+        if name not in self.openapi_shard_dicts:
+            self.openapi_shard_dicts[name] = self.build_openapi_dict(self.openapi_shards[name])
+        return self.openapi_shard_dicts[name]
+
+    def build_openapi_dict(self, openapi_paths: List[OpenApiPath]) -> dict:
+        '''Generates the OpenApi specification of openapi_paths, tagging operations with their shard.
+        '''
+        openapi_dict = OpenApi(current_app.name, openapi_paths, security=self.openapi_security).as_dict()
+        for shard, shard_paths in self.openapi_shards.items():
+            for openapi_path in shard_paths:
+                operation = openapi_dict['paths'].get(openapi_path.path, {}).get(openapi_path.method)
+                if operation is not None:
+                    operation['tags'] = [shard]
+        openapi_dict['components']['schemas'].pop(OpenApiBinary.__name__, None)
+        return replace_binary_schemas(openapi_dict)
+
+    def export_openapi_spec(self, path: str) -> List[str]:
+        '''Writes the OpenApi specification as JSON to `path` and a gzip variant to `path` + '.gz', and
+        the specification of each shard next to it, see `get_openapi_shard_path`.
+        Must be called within an app context.
+
+        Args:
+            path (str): Path of the JSON file, relative paths are relative to the app's root path like
+                FLASK_HINTFUL_OPENAPI_JSON_FILE
+
+        Returns:
+            List[str]: Paths of the written files
+        '''
+        path = os.path.join(current_app.root_path, path)
+        written = write_openapi_file(path, self.get_openapi_dict())
+        for name in self.openapi_shards:
+            shard_path = get_openapi_shard_path(path, name)
+            written.extend(write_openapi_file(shard_path, self.get_openapi_shard_dict(name)))
+        return written
+
+    def warmup(self):
+        '''Builds the OpenApi specification and the specification of every shard.
+        Must be called within an app context.
+        '''
+        self.get_openapi_dict()
+        for name in self.openapi_shards:
+            self.get_openapi_shard_dict(name)
+
+    @staticmethod
+    def send_openapi_file(path: str) -> Response:
+        '''Sends a pre-built OpenApi specification file, preferring its gzip variant when the client
+        accepts it.
+        '''
+        path = os.path.join(current_app.root_path, path)
+        if request.accept_encodings['gzip'] > 0 and os.path.isfile(f'{path}.gz'):
+            response = send_file(f'{path}.gz', mimetype='application/json', conditional=True)
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response = send_file(path, mimetype='application/json', conditional=True)
+        response.vary.add('Accept-Encoding')
+        return response
 
     @staticmethod
     def get_openapi_ui() -> str:
@@ -111,14 +254,16 @@ class OpenApiProvider():
                 <! doctype html>
                 <html>
                 <head>
-                <link type="text/css" rel="stylesheet" href="https://cdn.jsdelivr.net/npm/swagger-ui-dist@3/swagger-ui.css">
+                <link type="text/css" rel="stylesheet"
+                    href="https://cdn.jsdelivr.net/npm/swagger-ui-dist@3/swagger-ui.css">
                 <title>
                 </title>
                 </head>
                 <body>
                 <div id="swagger-ui">
                 </div>
-                <script src="https://cdn.jsdelivr.net/npm/swagger-ui-dist@3/swagger-ui-bundle.js"></script>
+                <script
+                    src="https://cdn.jsdelivr.net/npm/swagger-ui-dist@3/swagger-ui-bundle.js"></script>
                 <!-- `SwaggerUIBundle` is now available on the page -->
                 <script>
 
@@ -136,3 +281,82 @@ class OpenApiProvider():
                 </body>
                 </html>
             '''.format(openapi_json_path)
+
+
+@dataclass
+class OpenApiBinary():
+    '''Stands for bytes in the types passed to openapi_specgen, which has no schema for them. Its schema
+    is replaced by a binary string in generated specifications, see `replace_binary_schemas`.
+    '''
+
+
+OPENAPI_BINARY_REF = f'#/components/schemas/{OpenApiBinary.__name__}'
+OPENAPI_BINARY_SCHEMA = {'type': 'string', 'format': 'binary'}
+
+
+def replace_binary_schemas(data: Any) -> Any:
+    '''Returns data (a generated specification) with references to OpenApiBinary replaced by
+    `{"type": "string", "format": "binary"}` schemas.
+    '''
+    if isinstance(data, dict):
+        if data.get('$ref') == OPENAPI_BINARY_REF:
+            data = {key: value for key, value in data.items() if key != '$ref'}
+            return {**data, **OPENAPI_BINARY_SCHEMA}
+        return {key: replace_binary_schemas(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [replace_binary_schemas(item) for item in data]
+    return data
+
+
+def get_openapi_shard_path(path: str, name: str) -> str:
+    '''Path of the exported specification of shard name, next to the main specification file, e.g
+    'openapi.billing.json' for 'openapi.json'.
+    '''
+    root, ext = os.path.splitext(path)
+    return f'{root}.{name}{ext or ".json"}'
+
+
+def write_openapi_file(path: str, openapi_dict: dict) -> List[str]:
+    '''Writes openapi_dict as JSON to `path` and a gzip variant to `path` + '.gz'.
+
+    Returns:
+        List[str]: Paths of the written files
+    '''
+    openapi_json = json.dumps(openapi_dict).encode('utf-8')
+    with open(path, 'wb') as openapi_file:
+        openapi_file.write(openapi_json)
+    with open(f'{path}.gz', 'wb') as openapi_file:
+        with gzip.GzipFile(fileobj=openapi_file, mode='wb', mtime=0) as gzip_file:
+            gzip_file.write(openapi_json)
+    return [path, f'{path}.gz']
+
+
+def get_openapi_type(type_: Any) -> Any:
+    '''Returns type_ with the dataclasses nested in it replaced by copies whose field types are resolved,
+    see `get_dataclass_type_hints`. openapi_specgen reads the field types of dataclasses as declared,
+    which are str with PEP 563 annotations. Dataclasses that need no resolution are returned as is,
+    copies are made once per dataclass. bytes is replaced by OpenApiBinary.
+    '''
+    if type_ is bytes:
+        return OpenApiBinary
+    if is_dataclass(type_) and isinstance(type_, type):
+        if type_ not in _OPENAPI_TYPES:
+            _OPENAPI_TYPES[type_] = type_
+            hints = get_dataclass_type_hints(type_)
+            field_types = [
+                (field.name, field.type, get_openapi_type(hints[field.name])) for field in fields(type_)
+            ]
+            if any(declared != resolved for _, declared, resolved in field_types):
+                _OPENAPI_TYPES[type_] = make_dataclass(
+                    type_.__name__, [(name, resolved) for name, _, resolved in field_types]
+                )
+        return _OPENAPI_TYPES[type_]
+    args = getattr(type_, '__args__', None)
+    if args and hasattr(type_, 'copy_with'):
+        openapi_args = tuple(get_openapi_type(arg) for arg in args)
+        if openapi_args != args:
+            return type_.copy_with(openapi_args)
+    return type_
+
+
+_OPENAPI_TYPES: Dict[Type, Type] = {}
@@ -0,0 +1,210 @@
+import hmac
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections.abc import Mapping
+from dataclasses import make_dataclass
+from hashlib import sha256
+from itertools import islice
+from typing import Dict, Generic, Iterable, List, Optional, T, Tuple, Type, Union
+from urllib.parse import urlencode
+
+from flask import Response, current_app, has_app_context, request
+from werkzeug.exceptions import BadRequest
+
+PAGINATION_ARGS = ('limit', 'offset', 'cursor')
+
+DEFAULT_PAGE_LIMIT = 20
+DEFAULT_MAX_PAGE_LIMIT = 100
+
+
+class Paginated(Generic[T]):
+    '''Return type hint for view funcs that return a (lazy) iterable of T that must be paginated.
+
+    The view func may return any iterable, e.g a list, generator or a SQLAlchemy query. Only the
+    requested page is read from it: objects supporting slicing other than mappings (list, tuple, range,
+    SQLAlchemy queries, which apply it as LIMIT/OFFSET...) are sliced, anything else is consumed with
+    itertools.islice. The page is serialized as `{"items": [...], "next": url, "prev": url}` and the same
+    links are sent in a Link header.
+
+    Clients select the page with the `limit` and `offset` query args or with the opaque `cursor`
+    found in next/prev links. Cursors are signed with the app's SECRET_KEY, without one they are
+    plain offsets that clients can forge like the `offset` arg.
+
+    Args:
+        items (Iterable[T]): Items to be paginated
+        offset (int, optional): Index of the first item in the page. Defaults to None (from request).
+        limit (int, optional): Max number of items in the page. Defaults to None (from request).
+    '''
+
+    def __init__(self, items: Iterable[T], offset: Optional[int] = None, limit: Optional[int] = None):
+        self.items = items
+        self.offset = offset
+        self.limit = limit
+
+    def get_page(self) -> Tuple[List[T], bool]:
+        '''Reads one item more than the page size to know if there is a next page. Items with __getitem__
+        (other than mappings) are sliced, so e.g SQLAlchemy queries fetch only the page from the
+        database.
+
+        Returns:
+            Tuple[List[T], bool]: Items in the page and True if there is a next page
+        '''
+        offset, limit = self.window
+        stop = offset + limit + 1
+        if hasattr(type(self.items), '__getitem__') and not isinstance(self.items, Mapping):
+            page = list(self.items[offset:stop])
+        else:
+            page = list(islice(self.items, offset, stop))
+        return page[:limit], len(page) > limit
+
+    def get_links(self, has_next: bool) -> Dict[str, Optional[str]]:
+        '''Builds next/prev urls for the current request.
+
+        Args:
+            has_next (bool): If there is a page after this one
+
+        Returns:
+            Dict[str, Optional[str]]: next and prev urls, None when there isn't such page
+        '''
+        offset, limit = self.window
+        return {
+            'next': page_url(offset + limit, limit) if has_next else None,
+            'prev': page_url(max(offset - limit, 0), limit) if offset > 0 else None
+        }
+
+    @property
+    def window(self) -> Tuple[int, int]:
+        '''offset and limit of this page, using defaults for unset values
+        '''
+        return self.offset or 0, self.limit if self.limit is not None else DEFAULT_PAGE_LIMIT
+
+
+def paginate(response, offset: int, limit: int):
+    '''Wraps the body of a view func response in Paginated, unless it's already Paginated,
+    and sets its offset and limit where the view func didn't.
+
+    Args:
+        response: View func response, may be a tuple like Flask`s
+        offset (int): Requested offset
+        limit (int): Requested limit
+
+    Returns:
+        response with its body as Paginated
+    '''
+    if isinstance(response, tuple):
+        return (paginate(response[0], offset, limit), *response[1:])
+    if isinstance(response, Response):
+        return response
+    if not isinstance(response, Paginated):
+        response = Paginated(response)
+    if response.offset is None:
+        response.offset = offset
+    if response.limit is None:
+        response.limit = limit
+    return response
+
+
+def is_paginated(type_: Type) -> bool:
+    '''Determines if type_ is Paginated or Paginated[T]
+    '''
+    return type_ is Paginated or getattr(type_, '__origin__', None) is Paginated
+
+
+def get_pagination_args(args) -> Tuple[int, int]:
+    '''Pops limit, offset and cursor from args and resolves the requested page.
+    Page size defaults to FLASK_HINTFUL_PAGE_LIMIT (20) and is capped by FLASK_HINTFUL_MAX_PAGE_LIMIT
+    (100).
+
+    Args:
+        args ([werkzeug.datastructures.MultiDict]): Args from a Flask request
+
+    Raises:
+        BadRequest: If limit, offset or cursor are invalid
+
+    Returns:
+        Tuple[int, int]: offset and limit
+    '''
+    limit = args.pop('limit', None)
+    offset = args.pop('offset', None)
+    cursor = args.pop('cursor', None)
+    try:
+        limit = int(limit) if limit is not None else current_app.config.get(
+            'FLASK_HINTFUL_PAGE_LIMIT', DEFAULT_PAGE_LIMIT)
+        offset = decode_cursor(cursor) if cursor is not None else int(offset or 0)
+    except ValueError as err:
+        raise BadRequest(f'Invalid pagination args: {err}')
+    if limit < 1 or offset < 0:
+        raise BadRequest('Invalid pagination args: limit must be positive and offset non negative')
+    max_limit = current_app.config.get('FLASK_HINTFUL_MAX_PAGE_LIMIT', DEFAULT_MAX_PAGE_LIMIT)
+    return offset, min(limit, max_limit)
+
+
+CURSOR_SIGNATURE_SIZE = 16
+
+
+def encode_cursor(offset: int, secret_key: Optional[Union[str, bytes]] = None) -> str:
+    '''Encodes offset as an opaque cursor, signed with an HMAC of secret_key (the app's SECRET_KEY if
+    None) so clients can't forge cursors. Without a secret key the cursor isn't signed.
+    '''
+    payload = f'offset:{offset}'.encode()
+    return urlsafe_b64encode(payload + sign_cursor(payload, secret_key)).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, secret_key: Optional[Union[str, bytes]] = None) -> int:
+    '''Decodes a cursor created by `encode_cursor`, checking its signature
+
+    Raises:
+        ValueError: If cursor is invalid or its signature doesn't match
+    '''
+    try:
+        data = urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+    except ValueError:
+        raise ValueError(f'invalid cursor {cursor}')
+    signature = sign_cursor(b'', secret_key) and data[-CURSOR_SIGNATURE_SIZE:]
+    payload = data[:len(data) - len(signature)]
+    if not hmac.compare_digest(signature, sign_cursor(payload, secret_key)):
+        raise ValueError(f'invalid cursor {cursor}')
+    try:
+        prefix, offset = payload.decode().split(':')
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError(f'invalid cursor {cursor}')
+    if prefix != 'offset':
+        raise ValueError(f'invalid cursor {cursor}')
+    return int(offset)
+
+
+def sign_cursor(payload: bytes, secret_key: Optional[Union[str, bytes]] = None) -> bytes:
+    '''Truncated HMAC-SHA256 of payload, empty if there's no secret key
+    '''
+    if secret_key is None and has_app_context():
+        secret_key = current_app.secret_key
+    if not secret_key:
+        return b''
+    if isinstance(secret_key, str):
+        secret_key = secret_key.encode()
+    signature = hmac.new(secret_key, b'flask-hintful-cursor:' + payload, sha256).digest()
+    return signature[:CURSOR_SIGNATURE_SIZE]
+
+
+def page_url(offset: int, limit: int) -> str:
+    '''Url of the current request pointing to the page starting at offset
+    '''
+    args = [(key, value) for key, value in request.args.items(multi=True) if key not in PAGINATION_ARGS]
+    args.extend((('limit', limit), ('cursor', encode_cursor(offset))))
+    return f'{request.base_url}?{urlencode(args)}'
+
+
+def get_page_type(type_: Type) -> Type:
+    '''Returns a dataclass describing the serialized page of Paginated[T], used in OpenApi documentation.
+    '''
+    item_type = type_.__args__[0] if getattr(type_, '__args__', None) else dict
+    if hasattr(item_type, '__marshmallow__'):
+        item_type = item_type.__marshmallow__
+    if item_type not in _PAGE_TYPES:
+        _PAGE_TYPES[item_type] = make_dataclass(
+            f'{getattr(item_type, "__name__", "Item")}Page',
+            [('items', List[item_type]), ('next', str), ('prev', str)]
+        )
+    return _PAGE_TYPES[item_type]
+
+
+_PAGE_TYPES: Dict[Type, Type] = {}
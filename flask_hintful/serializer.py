@@ -1,35 +1,125 @@
-from dataclasses import asdict, is_dataclass
-from datetime import date, datetime
-from typing import Callable, Dict, T, Type, Union
-
-from flask import Response, json
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from base64 import b64encode
+from dataclasses import asdict, fields as dataclass_fields, is_dataclass
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache, partial
+from multiprocessing import get_context
+from pickle import HIGHEST_PROTOCOL, PicklingError, dumps as pickle_dumps, loads as pickle_loads
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, Dict, Optional, T, Tuple, Type, Union
+from uuid import UUID
+
+from flask import Response, current_app, json, stream_with_context
+from marshmallow import class_registry
+
+from .arrays import (ARRAY_CONTENT_TYPE, ArrayCodec, array_to_list, get_array_buffer, get_array_headers,
+                     is_array, numpy, numpy_scalar_to_primitive)
+from .binary import is_binary, send_binary
+from .codec import (COLUMNAR_JSON_MEDIA_TYPE, COLUMNAR_MSGPACK_MEDIA_TYPE, MSGPACK_MEDIA_TYPES,
+                    ColumnarCodec, JsonCodec, MsgPackCodec, msgpack)
+from .events import (DEFAULT_SSE_HEARTBEAT, EVENT_STREAM_CONTENT_TYPE, HEARTBEAT, HEARTBEAT_FRAME,
+                     EventStream, ServerSentEvent, format_event, iter_with_heartbeats)
+from .pagination import Paginated
+from .stats import TypeStats, get_size, get_stats_key
+from .utils import iter_nested_types
+
+Fields = Tuple[Tuple[str, Optional['Fields']], ...]
+
+MAX_CACHED_DUMPERS = 1024
 
 
 class Serializer():
     '''Provides serialization for Flask Hintful.
 
     Default serializers:
-        dict: flask.json.dumps,
+        dict: Serializer.serialize_dict,
         str: str,
         int: str,
         float: str,
         bool: str,
-        date: lambda d: d.isoformat(),
-        datetime: lambda d: d.isoformat(),
+        date: flask_hintful.serializer.isoformat,
+        datetime: flask_hintful.serializer.isoformat,
 
     Dataclasses and classes with a __marshmallow__ attribute are also supported.
+    Decimal, UUID, Enum, bytes, set, time, array.array and numpy values are converted using CONVERTERS.
+
+    Default codecs:
+        application/json: JsonCodec,
+        application/msgpack: MsgPackCodec,
+        application/x-msgpack: MsgPackCodec,
+        application/x-columnar+json: ColumnarCodec(JsonCodec),
+        application/x-columnar+msgpack: ColumnarCodec(MsgPackCodec),
+        application/x-array: ArrayCodec
+
+    The MessagePack codecs are only registered if the `msgpack` package is installed.
+
+    Codecs with a truthy `columnar` attribute receive lists of dataclasses as columns, see `to_columns`.
+    Responses with other data are encoded and labelled with the codec they wrap instead.
+
+    Lists with at least `offload_threshold` items can be serialized in a process pool, so that encoding
+    large payloads doesn't hold the GIL of the request thread. Workers are started with the `spawn`
+    method, so the pool is safe to create from any request thread (forking a threaded process could copy
+    held locks). The Serializer is copied to each worker process when the pool is first used, registered
+    serializers, codecs and the encoded data must be picklable, otherwise serialization falls back to the
+    request thread.
+
+    With `stats` every encoded response is counted by its type (lists by the type of their first item)
+    with the time spent and bytes produced, and every dataclass, marshmallow model or converted value
+    encoded within it is counted by its own type.
+
+    Args:
+        offload_threshold (int, optional): Min list length to serialize in a process pool.
+            Defaults to None (never).
+        max_workers (int, optional): Number of worker processes. Defaults to None (number of CPUs).
+        stats (TypeStats, optional): Collects per type serialization costs. Defaults to None (disabled).
     '''
 
-    def __init__(self):
+    def __init__(self, offload_threshold: Optional[int] = None, max_workers: Optional[int] = None,
+                 stats: Optional[TypeStats] = None):
         self.serializers: Dict[Type, Callable] = {
-            dict: lambda d: json.dumps(d, default=isodate_json_encoder),
+            dict: self.serialize_dict,
             str: str,
             int: str,
             float: str,
             bool: str,
-            date: lambda d: d.isoformat(),
-            datetime: lambda d: d.isoformat(),
+            date: isoformat,
+            datetime: isoformat,
+        }
+        self.codecs: Dict[str, Any] = {
+            'application/json': JsonCodec(),
+            COLUMNAR_JSON_MEDIA_TYPE: ColumnarCodec(JsonCodec(), COLUMNAR_JSON_MEDIA_TYPE),
+            ARRAY_CONTENT_TYPE: ArrayCodec(),
         }
+        if msgpack is not None:
+            self.codecs.update(dict.fromkeys(MSGPACK_MEDIA_TYPES, MsgPackCodec()))
+            self.codecs[COLUMNAR_MSGPACK_MEDIA_TYPE] = ColumnarCodec(
+                MsgPackCodec(), COLUMNAR_MSGPACK_MEDIA_TYPE
+            )
+        self.dumpers: Dict[Tuple[Type, Fields], Callable] = {}
+        self.schemas: Dict[Type, Any] = {}
+        self.offload_threshold = offload_threshold
+        self.max_workers = max_workers
+        self.process_pool: Optional[ProcessPoolExecutor] = None
+        self.process_pool_lock = Lock()
+        self.stats = stats
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['dumpers'] = {}
+        state['schemas'] = {}
+        state['process_pool'] = None
+        state['stats'] = None
+        del state['process_pool_lock']
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.process_pool_lock = Lock()
 
     def add_serializer(self, type_: Type, serializer_func: Callable):
         '''Adds a serializer for type `type_`
@@ -42,13 +132,36 @@ class Serializer():
         '''
         self.serializers[type_] = serializer_func
 
-    def serialize_response(self, data: T) -> Union[str, tuple, Response]:
+    def add_codec(self, media_type: str, codec: Any):
+        '''Adds a codec for media type `media_type`
+
+        `codec` must implement `dumps(data, default)` returning a str or bytes, where `default` is
+        a callable that converts objects the codec can't encode natively.
+
+        Args:
+            media_type (str): A media type, e.g 'application/msgpack'
+            codec (Any): Codec that will encode responses for this media type
+        '''
+        self.codecs[media_type] = codec
+
+    def serialize_response(self, data: T, media_type: str = JsonCodec.media_type,
+                           fields: Optional[Fields] = None) -> Union[str, tuple, Response]:
         '''Serializes `data` into a response Flask understands.
         If Content-Type was supplied pass the same ahead to Flask, otherwise
-        uses 'application/json' as the default Content-Type
+        uses `media_type` as the default Content-Type
+
+        Paginated data is serialized as a page envelope with a Link header, see `serialize_page`.
+        bytes, bytearray, memoryview, pathlib paths and binary file objects are streamed as they are,
+        see `flask_hintful.binary.send_binary`. EventStream data is streamed as Server-Sent Events,
+        see `serialize_event_stream`. Arrays are streamed as raw bytes when the client accepts
+        application/x-array, see `serialize_array_response`, other data is then encoded as JSON.
 
         Args:
             data (T): data to be serialized, a tuple return like Flask`s or a Flask Response object.
+            media_type (str, optional): Media type of the registered codec used to encode data.
+                Defaults to 'application/json'.
+            fields (Fields, optional): Projection from `parse_fields`, only these fields of
+                dataclasses and marshmallow models are serialized. Defaults to None (all fields).
 
         Returns:
             Union[str, tuple, Response]: Serialized response in a way Flask understands
@@ -64,25 +177,299 @@ class Serializer():
                     body, status = data
                 else:
                     body, headers = data
+            if is_binary(body):
+                return self.serialize_binary_response(body, status, headers)
+            if media_type == ARRAY_CONTENT_TYPE:
+                if is_array(body):
+                    return apply_status_and_headers(self.serialize_array_response(body), status, headers)
+                media_type = JsonCodec.media_type
+            if isinstance(body, EventStream):
+                response = self.serialize_event_stream(body, fields)
+                return apply_status_and_headers(response, status, headers)
+            media_type = self.get_response_media_type(body, media_type)
             if headers is None or headers.get('Content-Type') is None:
-                headers['Content-Type'] = 'application/json'
+                headers['Content-Type'] = media_type
+            if isinstance(body, Paginated):
+                body, link = self.serialize_page(body, fields)
+                fields = None
+                if link:
+                    headers.setdefault('Link', link)
 
             if status is not None:
-                return self.serialize(body), status, headers
-            return self.serialize(body), headers
+                return self.encode(body, media_type, fields), status, headers
+            return self.encode(body, media_type, fields), headers
 
         if isinstance(data, Response):
             return data
-        return self.serialize(data), {'Content-Type': 'application/json'}
+        if is_binary(data):
+            return send_binary(data)
+        if media_type == ARRAY_CONTENT_TYPE:
+            if is_array(data):
+                return self.serialize_array_response(data)
+            media_type = JsonCodec.media_type
+        if isinstance(data, EventStream):
+            return self.serialize_event_stream(data, fields)
+        media_type = self.get_response_media_type(data, media_type)
+        if isinstance(data, Paginated):
+            body, link = self.serialize_page(data, fields)
+            headers = {'Content-Type': media_type}
+            if link:
+                headers['Link'] = link
+            return self.encode(body, media_type), headers
+        return self.encode(data, media_type, fields), {'Content-Type': media_type}
+
+    @staticmethod
+    def serialize_binary_response(data, status: Optional[Union[int, str]] = None,
+                                  headers: Optional[Dict[str, str]] = None) -> Response:
+        '''Streams binary `data` with `send_binary` then applies status and headers, replacing default
+        ones such as Content-Type.
+        '''
+        return apply_status_and_headers(send_binary(data), status, headers)
+
+    @staticmethod
+    def serialize_array_response(data) -> Response:
+        '''Streams the buffer of an array.array or numpy.ndarray without copying it (non C-contiguous
+        NumPy arrays are copied once), with its dtype and shape in the X-Array-Dtype and X-Array-Shape
+        headers.
+        '''
+        headers = get_array_headers(data)
+        response = send_binary(get_array_buffer(data))
+        return apply_status_and_headers(response, headers=headers)
+
+    def serialize_event_stream(self, data: EventStream, fields: Optional[Fields] = None) -> Response:
+        '''Streams the items of `data` as `text/event-stream` frames, each item encoded as JSON in its
+        own frame which is flushed as soon as it's produced. Heartbeat comments are sent while no item is
+        produced for `data.heartbeat` seconds (FLASK_HINTFUL_SSE_HEARTBEAT config if None).
+
+        Args:
+            data (EventStream): Items to be streamed
+            fields (Fields, optional): Projection from `parse_fields`. Defaults to None (all fields).
+
+        Returns:
+            Response: A streamed Flask response
+        '''
+        heartbeat = data.heartbeat if data.heartbeat is not None else current_app.config.get(
+            'FLASK_HINTFUL_SSE_HEARTBEAT', DEFAULT_SSE_HEARTBEAT)
+
+        def generate():
+            items = iter_with_heartbeats(data.items, heartbeat) if heartbeat else data.items
+            for item in items:
+                if item is HEARTBEAT:
+                    yield HEARTBEAT_FRAME
+                elif isinstance(item, ServerSentEvent):
+                    encoded = self.encode(item.data, fields=fields)
+                    yield format_event(encoded, item.event, item.id, item.retry)
+                else:
+                    yield format_event(self.encode(item, fields=fields))
+
+        response = current_app.response_class(
+            stream_with_context(generate()), mimetype=EVENT_STREAM_CONTENT_TYPE, direct_passthrough=True
+        )
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
+
+    def serialize_page(self, data: Paginated, fields: Optional[Fields] = None) -> Tuple[dict, str]:
+        '''Reads only the requested page from `data` and converts it into a page envelope
+        `{"items": [...], "next": url, "prev": url}`.
+
+        Args:
+            data (Paginated): Paginated items with offset and limit already set
+            fields (Fields, optional): Projection from `parse_fields`. Defaults to None (all fields).
+
+        Returns:
+            Tuple[dict, str]: Page envelope and the value for a Link header
+        '''
+        items, has_next = data.get_page()
+        links = data.get_links(has_next)
+        link = ', '.join(f'<{url}>; rel="{rel}"' for rel, url in links.items() if url is not None)
+        return {'items': self.dump(items, fields), **links}, link
+
+    def encode(self, data: T, media_type: str = JsonCodec.media_type,
+               fields: Optional[Fields] = None) -> Union[str, bytes]:
+        '''Encodes `data` using the codec registered for `media_type`.
+        JSON is handled by `serialize` so that registered serializers are respected.
+        Lists with at least `offload_threshold` items are encoded in the process pool.
+
+        Args:
+            data (T): Data to be encoded
+            media_type (str, optional): Media type of a registered codec. Defaults to 'application/json'.
+            fields (Fields, optional): Projection from `parse_fields`. Defaults to None (all fields).
+
+        Raises:
+            TypeError: If there isn't a codec registered for media_type
+
+        Returns:
+            Union[str, bytes]: data encoded as media_type
+        '''
+        start = perf_counter() if self.stats is not None else None
+        if self.offload_threshold is not None and self.is_list(data) \
+                and len(data) >= self.offload_threshold:
+            encoded = self.encode_in_process_pool(data, media_type, fields)
+        else:
+            encoded = self.encode_in_thread(data, media_type, fields)
+        if start is not None:
+            self.stats.record(get_stats_key(data), perf_counter() - start, get_size(encoded))
+        return encoded
+
+    def encode_in_thread(self, data: T, media_type: str = JsonCodec.media_type,
+                         fields: Optional[Fields] = None) -> Union[str, bytes]:
+        '''Encodes `data` in the current thread regardless of `offload_threshold`, see `encode`.
+        '''
+        if media_type == JsonCodec.media_type:
+            return self.serialize(data, fields)
+        codec = self.codecs.get(media_type)
+        if codec is None:
+            raise TypeError(f'No codec registered for media type {media_type}')
+        if getattr(codec, 'columnar', False) and self.is_list(data):
+            data, fields = self.to_columns(data, fields), None
+        if self.is_list(data):
+            return codec.dumps(*self.dump_list(data, fields))
+        return codec.dumps(data, default=self.get_default(fields))
+
+    def to_columns(self, data: list, fields: Optional[Fields] = None) -> Union[dict, list]:
+        '''Converts a list of instances of a single dataclass into one list of values per field,
+        `{"field": [value, ...], ...}`, reading attributes directly without building a dict per item.
+        Field values that aren't primitives (e.g nested dataclasses or dates) are converted while
+        being encoded. Any other list (including an empty one) is returned as is, see `is_columnar`.
+
+        Args:
+            data (list): A python list
+            fields (Fields, optional): Projection from `parse_fields`. Defaults to None (all fields).
+
+        Returns:
+            Union[dict, list]: Columns of data, or data itself if it can't be converted
+        '''
+        if not self.is_columnar(data):
+            return data
+        type_ = data[0].__class__
+        if fields is None:
+            selected = [(field.name, None) for field in dataclass_fields(type_)]
+        else:
+            projection = dict(fields)
+            selected = [
+                (field.name, projection[field.name])
+                for field in dataclass_fields(type_) if field.name in projection
+            ]
+        start = perf_counter() if self.stats is not None else None
+        columns = {}
+        for name, sub_fields in selected:
+            values = [getattr(item, name) for item in data]
+            if sub_fields is not None:
+                values = [self.dump(value, sub_fields) for value in values]
+            columns[name] = values
+        if start is not None:
+            self.stats.record(type_, perf_counter() - start, calls=len(data))
+        return columns
+
+    def is_columnar(self, data: T) -> bool:
+        '''Determines if data is a non empty list of instances of a single dataclass, the only data
+        converted into columns by `to_columns`.
+        '''
+        if not self.is_list(data) or not data:
+            return False
+        type_ = data[0].__class__
+        return self.is_dataclass(type_) and all(item.__class__ is type_ for item in data)
+
+    def get_response_media_type(self, data: T, media_type: str) -> str:
+        '''Returns the media type a response with data is labelled with. Data that columnar codecs can't
+        convert into columns (see `is_columnar`) is labelled with the media type of the codec they wrap.
+        '''
+        codec = self.codecs.get(media_type)
+        if getattr(codec, 'columnar', False) and not self.is_columnar(data):
+            return getattr(getattr(codec, 'codec', None), 'media_type', JsonCodec.media_type)
+        return media_type
+
+    def encode_in_process_pool(self, data: T, media_type: str = JsonCodec.media_type,
+                               fields: Optional[Fields] = None) -> Union[str, bytes]:
+        '''Encodes `data` in a worker process and waits for the result. Falls back to encoding
+        in the current thread if data or this Serializer can't be pickled, or if a worker died (the
+        broken pool is replaced on next use). Exceptions raised while encoding in the worker are
+        re-raised.
+
+        Args:
+            data (T): Data to be encoded
+            media_type (str, optional): Media type of a registered codec. Defaults to 'application/json'.
+            fields (Fields, optional): Projection from `parse_fields`. Defaults to None (all fields).
+
+        Returns:
+            Union[str, bytes]: data encoded as media_type
+        '''
+        try:
+            process_pool = self.get_process_pool()
+            payload = pickle_dumps((data, media_type, fields), HIGHEST_PROTOCOL)
+        except (PicklingError, AttributeError, TypeError):
+            return self.encode_in_thread(data, media_type, fields)
+        try:
+            return process_pool.submit(_encode_in_worker, payload).result()
+        except BrokenProcessPool:
+            with self.process_pool_lock:
+                if self.process_pool is process_pool:
+                    self.process_pool = None
+            return self.encode_in_thread(data, media_type, fields)
+
+    def get_process_pool(self) -> ProcessPoolExecutor:
+        '''Returns the process pool used to offload serialization, creating it on first use.
+
+        Raises:
+            PicklingError: If this Serializer can't be copied to the worker processes
+        '''
+        with self.process_pool_lock:
+            if self.process_pool is None:
+                initargs = (pickle_dumps(self, HIGHEST_PROTOCOL),)
+                self.process_pool = ProcessPoolExecutor(
+                    self.max_workers, mp_context=get_context('spawn'), initializer=_init_worker,
+                    initargs=initargs
+                )
+            return self.process_pool
+
+    def get_default(self, fields: Optional[Fields] = None) -> Callable:
+        '''Returns the `default` hook passed to encoders, applying `fields` to dataclasses and
+        marshmallow models.
+        '''
+        if fields is None:
+            return self.to_primitive
+        return partial(self.to_primitive, fields=fields)
+
+    def to_primitive(self, data: T, fields: Optional[Fields] = None):
+        '''Converts dataclasses, marshmallow models and types in CONVERTERS (dates, Decimal, UUID, Enum,
+        bytes and sets) into objects any codec can encode.
+        Used as `default` hook by encoders, so items are converted one at a time while being encoded
+        and the original data is never modified. Dataclasses and marshmallow models are converted by the
+        dumper of their class, see `get_dumper`.
+
+        Args:
+            data (T): Any python object
+            fields (Fields, optional): Projection from `parse_fields`. Defaults to None (all fields).
 
-    def serialize(self, data: T) -> str:
+        Raises:
+            TypeError: If data can't be converted
+
+        Returns:
+            Union[dict, str, list]: Encodable representation of data
+        '''
+        start = perf_counter() if self.stats is not None else None
+        converter = get_converter(data.__class__)
+        if converter is not None:
+            primitive = converter(data)
+        elif self.is_dataclass(data) or self.is_marshmallow_model(data):
+            primitive = self.get_dumper(data.__class__, fields)(data)
+        else:
+            raise TypeError(f'Cannot serialize type {data.__class__}')
+        if start is not None:
+            self.stats.record(data.__class__, perf_counter() - start)
+        return primitive
+
+    def serialize(self, data: T, fields: Optional[Fields] = None) -> str:
         '''Serializes `data` into a string using the registered serializers that matches data type.
-        Uses `is_dataclass` to determine if `data` is a dataclass, if positive uses `serialize_dataclass`.
-        Uses `is_marshmallow_model` to determine if `data` is a model, if positive
+        Uses `is_dataclass` to determine if `data` is a dataclass, if positive uses
+        `serialize_dataclass`. Uses `is_marshmallow_model` to determine if `data` is a model, if positive
         uses `serialize_marshmallow_model`
 
         Args:
             data (Any): Data to be serialized as a string
+            fields (Fields, optional): Projection from `parse_fields` applied to dataclasses and
+                marshmallow models. Defaults to None (all fields).
 
         Raises:
             TypeError: If there arent any registered serializers for data
@@ -95,13 +482,98 @@ class Serializer():
         if serializer is not None:
             return serializer(data)
         if self.is_list(data):
-            return self.serialize_list(data)
+            return self.serialize_list(data, fields)
+        if fields is not None and (self.is_dataclass(data) or self.is_marshmallow_model(data)):
+            return json.dumps(data, default=self.get_default(fields))
         if self.is_dataclass(data):
             return self.serialize_dataclass(data)
         if self.is_marshmallow_model(data):
             return self.serialize_marshmallow_model(data)
+        converter = get_converter(data.__class__)
+        if converter is not None:
+            return self.serialize(converter(data), fields)
         raise TypeError(f'Cannot serialize type {data.__class__}')
 
+    def dump(self, data: T, fields: Optional[Fields] = None):
+        '''Converts dataclasses and marshmallow models in `data` into dicts, keeping only
+        the fields in `fields`. Lists and dicts are converted item by item into new lists and dicts,
+        any other data is returned as is.
+
+        Args:
+            data (T): Any python object
+            fields (Fields, optional): Projection from `parse_fields`. Defaults to None (all fields).
+
+        Returns:
+            Any: data with dataclasses and marshmallow models converted to dicts
+        '''
+        if self.is_list(data):
+            return [self.dump(item, fields) for item in data]
+        if isinstance(data, dict):
+            return {key: self.dump(value) for key, value in data.items()}
+        if self.is_dataclass(data):
+            if fields is None:
+                return self.serialize_dataclass_to_dict(data)
+            return self.get_dumper(data.__class__, fields)(data)
+        if self.is_marshmallow_model(data):
+            if fields is None:
+                return self.serialize_marshmallow_model_to_dict(data)
+            return self.get_dumper(data.__class__, fields)(data)
+        return data
+
+    def get_dumper(self, type_: Type, fields: Optional[Fields] = None) -> Callable:
+        '''Returns a callable that converts instances of `type_` into a dict containing only `fields`.
+        Dumpers are compiled once per type and distinct projection.
+
+        Args:
+            type_ (Type): A dataclass or marshmallow model
+            fields (Fields, optional): Projection from `parse_fields`. Defaults to None (all fields).
+
+        Returns:
+            Callable: Dumper for type_ and fields
+        '''
+        dumper = self.dumpers.get((type_, fields))
+        if dumper is None:
+            if self.is_dataclass(type_):
+                dumper = self.compile_dataclass_dumper(type_, fields)
+            elif fields is None:
+                dumper = self.get_schema(type_).dump
+            else:
+                dumper = self.compile_marshmallow_dumper(type_, fields)
+            if len(self.dumpers) < MAX_CACHED_DUMPERS:
+                self.dumpers[(type_, fields)] = dumper
+        return dumper
+
+    def compile_dataclass_dumper(self, type_: Type, fields: Optional[Fields] = None) -> Callable:
+        '''Compiles a dumper for dataclass `type_` that only reads the projected fields.
+        Fields that are not declared by the dataclass are ignored. Without a projection the dumper reads
+        every field and leaves their values (e.g nested dataclasses) to the encoder's `default` hook.
+        '''
+        if fields is None:
+            names = tuple(field.name for field in dataclass_fields(type_))
+
+            def dump_all(data):
+                return {name: getattr(data, name) for name in names}
+            return dump_all
+        projection = dict(fields)
+        selected = tuple(
+            (field.name, projection[field.name])
+            for field in dataclass_fields(type_) if field.name in projection
+        )
+        dump = self.dump
+
+        def dumper(data):
+            return {name: dump(getattr(data, name), sub_fields) for name, sub_fields in selected}
+        return dumper
+
+    @staticmethod
+    def compile_marshmallow_dumper(type_: Type, fields: Fields) -> Callable:
+        '''Compiles a dumper for marshmallow model `type_` using a schema instantiated with `only`.
+        Fields that are not declared by the schema are ignored.
+        '''
+        schema_cls = type_.__marshmallow__
+        only = get_marshmallow_only(schema_cls, fields)
+        return schema_cls(only=only).dump
+
     @staticmethod
     def is_dataclass(data: T) -> bool:
         '''Determines if data is a dataclass or not using dataclasses.is_dataclass
@@ -128,6 +600,18 @@ class Serializer():
         '''
         return self.serializers.get(dict, json.dumps)(asdict(data))
 
+    def serialize_dict(self, data: dict) -> str:
+        '''Serializes a dict to JSON, converting nested Dataclasses, Marshmallow models, dates etc.
+        with `to_primitive`
+
+        Args:
+            data (dict): Any dict
+
+        Returns:
+            str: JSON representation of data
+        '''
+        return json.dumps(data, default=self.to_primitive)
+
     @staticmethod
     def serialize_dataclass_to_dict(data: T) -> dict:
         return asdict(data)
@@ -147,8 +631,7 @@ class Serializer():
             return True
         return False
 
-    @staticmethod
-    def serialize_marshmallow_model(data: T) -> str:
+    def serialize_marshmallow_model(self, data: T) -> str:
         '''Uses marshmallow.Schema.dumps to serialize `data`. Assumes that
         data makes it's schema available in __marshmallow__ attrbute
 
@@ -158,10 +641,9 @@ class Serializer():
         Returns:
             str: string representation of data
         '''
-        return data.__marshmallow__().dumps(data)
+        return self.get_schema(data.__class__).dumps(data)
 
-    @staticmethod
-    def serialize_marshmallow_model_to_dict(data: T) -> dict:
+    def serialize_marshmallow_model_to_dict(self, data: T) -> dict:
         '''Uses marshmallow.Schema.dumps to serialize `data`. Assumes that
         data makes it's schema available in __marshmallow__ attrbute
 
@@ -171,7 +653,28 @@ class Serializer():
         Returns:
             str: string representation of data
         '''
-        return data.__marshmallow__().dump(data)
+        return self.get_schema(data.__class__).dump(data)
+
+    def get_schema(self, type_: Type):
+        '''Returns a marshmallow schema instance for model `type_`, instantiated once per type.
+        '''
+        schema = self.schemas.get(type_)
+        if schema is None:
+            schema = self.schemas[type_] = type_.__marshmallow__()
+        return schema
+
+    def warmup(self, type_: Type):
+        '''Builds everything that would otherwise be lazily built when serializing `type_`
+        (and types nested in it) for the first time.
+
+        Args:
+            type_ (Type): Any type, e.g a view func return type
+        '''
+        for nested_type in iter_nested_types(type_):
+            if isinstance(nested_type, type):
+                get_converter(nested_type)
+            if self.is_dataclass(nested_type) or self.is_marshmallow_model(nested_type):
+                self.get_dumper(nested_type)
 
     @staticmethod
     def is_list(data: T) -> bool:
@@ -187,23 +690,195 @@ class Serializer():
             return True
         return False
 
-    def serialize_list(self, data: T) -> str:
-        '''Serializes list and as items of this list
+    def serialize_list(self, data: T, fields: Optional[Fields] = None) -> str:
+        '''Serializes list and as items of this list, see `dump_list`. `data` is not modified.
 
         Args:
             data (T): A python list
+            fields (Fields, optional): Projection from `parse_fields`. Defaults to None (all fields).
 
         Returns:
             str: Serialized list with serialized items
         '''
-        for i, item in enumerate(data):
-            if self.is_dataclass(item):
-                data[i] = self.serialize_dataclass_to_dict(item)
-            elif self.is_marshmallow_model(item):
-                data[i] = self.serialize_marshmallow_model_to_dict(item)
-        return json.dumps(data, default=isodate_json_encoder)
+        data, default = self.dump_list(data, fields)
+        return json.dumps(data, default=default)
+
+    def dump_list(self, data: list, fields: Optional[Fields] = None) -> Tuple[list, Callable]:
+        '''Resolves the conversion of a list once for all its items. When every item is an instance of
+        the same dataclass or marshmallow model its dumper is looked up once: marshmallow models are
+        dumped at once with `many=True`, dataclasses are converted by a `default` hook calling that
+        dumper directly, skipping the per item dispatch of `to_primitive`. Mixed lists are converted item
+        by item.
+
+        Args:
+            data (list): A python list
+            fields (Fields, optional): Projection from `parse_fields`. Defaults to None (all fields).
+
+        Returns:
+            Tuple[list, Callable]: Data to encode and the `default` hook to encode it with
+        '''
+        default = self.get_default(fields)
+        if not data:
+            return data, default
+        type_ = data[0].__class__
+        is_model = self.is_marshmallow_model(type_)
+        if not (is_model or self.is_dataclass(type_)) \
+                or not all(item.__class__ is type_ for item in data):
+            return data, default
+        dumper = self.get_dumper(type_, fields)
+        stats = self.stats
+        if is_model:
+            start = perf_counter() if stats is not None else None
+            items = dumper(data, many=True)
+            if start is not None:
+                stats.record(type_, perf_counter() - start, calls=len(data))
+            return items, default
+
+        def dump_item(item):
+            if item.__class__ is not type_:
+                return default(item)
+            if stats is None:
+                return dumper(item)
+            start = perf_counter()
+            primitive = dumper(item)
+            stats.record(type_, perf_counter() - start)
+            return primitive
+        return data, dump_item
+
+
+@lru_cache(maxsize=256)
+def parse_fields(fields: str) -> Optional[Fields]:
+    '''Parses a sparse fieldset such as 'id,owner.name' into a hashable projection.
+    A bare name selects the whole field even if nested paths of it are also requested.
+
+    Args:
+        fields (str): Comma separated field names, nested fields are separated by dots
+
+    Returns:
+        Optional[Fields]: Sorted tuple of (name, nested projection or None), None if fields is empty
+    '''
+    tree: dict = {}
+    for path in fields.split(','):
+        names = [name.strip() for name in path.split('.') if name.strip()]
+        node = tree
+        for depth, name in enumerate(names):
+            if depth == len(names) - 1:
+                node[name] = None
+            elif name not in node:
+                node[name] = {}
+            if node[name] is None:
+                break
+            node = node[name]
+    if not tree:
+        return None
+    return _freeze_fields(tree)
+
+
+def _freeze_fields(tree: dict) -> Fields:
+    return tuple(sorted(
+        (name, None if sub is None else _freeze_fields(sub)) for name, sub in tree.items()
+    ))
+
+
+def get_marshmallow_only(schema_cls: Type, fields: Fields, prefix: str = '') -> Tuple[str, ...]:
+    '''Converts a projection into the dotted paths marshmallow expects in `only`,
+    dropping fields that are not declared by the schema.
+    '''
+    only = []
+    for name, sub_fields in fields:
+        field = schema_cls._declared_fields.get(name)
+        if field is None:
+            continue
+        nested = getattr(field, 'nested', None) or getattr(getattr(field, 'inner', None), 'nested', None)
+        if sub_fields is None or nested is None:
+            only.append(prefix + name)
+            continue
+        if isinstance(nested, str):
+            nested = class_registry.get_class(nested)
+        nested_only = get_marshmallow_only(nested, sub_fields, f'{prefix}{name}.')
+        only.extend(nested_only or [prefix + name])
+    return tuple(only)
+
+
+def isoformat(data: Union[date, datetime, time]) -> str:
+    return data.isoformat()
+
+
+def enum_value(data: Enum):
+    return data.value
+
+
+def bytes_to_base64(data: Union[bytes, bytearray]) -> str:
+    return b64encode(data).decode('ascii')
+
+
+CONVERTERS: Dict[Type, Callable] = {
+    date: isoformat,
+    datetime: isoformat,
+    time: isoformat,
+    Decimal: str,
+    UUID: str,
+    Enum: enum_value,
+    bytes: bytes_to_base64,
+    bytearray: bytes_to_base64,
+    set: list,
+    frozenset: list,
+    array: array_to_list,
+}
+if numpy is not None:
+    CONVERTERS[numpy.ndarray] = array_to_list
+    CONVERTERS[numpy.generic] = numpy_scalar_to_primitive
+
+
+@lru_cache(maxsize=None)
+def get_converter(type_: Type) -> Optional[Callable]:
+    '''Resolves the converter in CONVERTERS for type_ or its closest base class, e.g Enum for any Enum.
+    Resolved once per type.
+
+    Returns:
+        Optional[Callable]: Converter to a JSON encodable object, None if there isn't one
+    '''
+    for base in type_.__mro__:
+        converter = CONVERTERS.get(base)
+        if converter is not None:
+            return converter
+    return None
+
+
+_WORKER_SERIALIZER: Optional[Serializer] = None
+
+
+def _init_worker(serializer: bytes):
+    global _WORKER_SERIALIZER  # pylint: disable=global-statement
+    _WORKER_SERIALIZER = pickle_loads(serializer)
+
+
+def _encode_in_worker(payload: bytes) -> Union[str, bytes]:
+    return _WORKER_SERIALIZER.encode_in_thread(*pickle_loads(payload))
 
 
 def isodate_json_encoder(data):
-    if isinstance(data, (date, datetime)):
-        return data.isoformat()
+    '''`default` hook for json.dumps that converts dates, Decimal, UUID, Enum, bytes and sets using
+    CONVERTERS.
+
+    Raises:
+        TypeError: If there isn't a converter for data's type
+    '''
+    converter = get_converter(data.__class__)
+    if converter is None:
+        raise TypeError(f'Cannot serialize type {data.__class__}')
+    return converter(data)
+
+
+def apply_status_and_headers(response: Response, status: Optional[Union[int, str]] = None,
+                             headers: Optional[Dict[str, str]] = None) -> Response:
+    '''Applies the status and headers of a tuple return to response, replacing default headers
+    such as Content-Type.
+    '''
+    for name, value in (headers or {}).items():
+        response.headers[name] = value
+    if isinstance(status, int):
+        response.status_code = status
+    elif status is not None:
+        response.status = status
+    return response
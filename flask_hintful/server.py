@@ -0,0 +1,101 @@
+import os
+import signal
+from time import monotonic, sleep
+from typing import Dict, Tuple
+
+from flask import Flask
+from werkzeug.serving import make_server
+
+MIN_WORKER_UPTIME = 5.0
+RESPAWN_BACKOFF = 0.1
+MAX_RESPAWN_BACKOFF = 30.0
+DEFAULT_MAX_FAILURES = 10
+
+
+def serve_prefork(flask_app: Flask, host: str = '127.0.0.1', port: int = 5000, workers: int = 1,
+                  threaded: bool = True, max_failures: int = DEFAULT_MAX_FAILURES):
+    '''Serves flask_app from `workers` forked processes sharing one listening socket.
+
+    The app must be fully loaded (and ideally warmed up, see `FlaskHintful.warmup`) before calling this,
+    so that workers share its memory copy-on-write. Workers that exit are replaced until
+    SIGINT or SIGTERM is received, then all workers are terminated.
+
+    Workers that fail within MIN_WORKER_UPTIME seconds of being forked are replaced after an exponential
+    backoff (RESPAWN_BACKOFF doubled per consecutive failure, up to MAX_RESPAWN_BACKOFF seconds). After
+    `max_failures` consecutive failures all workers are terminated instead of being replaced.
+
+    Args:
+        flask_app (Flask): The Flask application to serve
+        host (str, optional): Host to listen on. Defaults to '127.0.0.1'.
+        port (int, optional): Port to listen on. Defaults to 5000.
+        workers (int, optional): Number of worker processes. Defaults to 1.
+        threaded (bool, optional): If each worker handles requests in threads. Defaults to True.
+        max_failures (int, optional): Consecutive worker failures before giving up. Defaults to 10.
+
+    Raises:
+        RuntimeError: If workers failed `max_failures` consecutive times
+    '''
+    server = make_server(host, port, flask_app, threaded=threaded)
+    children: Dict[int, Tuple[int, float]] = {}
+    stopping = []
+    failures = 0
+
+    def stop(*_):
+        stopping.append(True)
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    previous_handlers = {
+        signum: signal.signal(signum, stop) for signum in (signal.SIGINT, signal.SIGTERM)
+    }
+    try:
+        for worker in range(workers):
+            children[_fork_worker(flask_app, server, previous_handlers)] = (worker, monotonic())
+        while children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            worker, started = children.pop(pid, (None, 0.0))
+            if worker is None or stopping:
+                continue
+            if status != 0 and monotonic() - started < MIN_WORKER_UPTIME:
+                failures += 1
+                if failures >= max_failures:
+                    flask_app.logger.error(
+                        'Worker %s failed %s times in a row, stopping', worker, failures
+                    )
+                    stop()
+                    continue
+                sleep(min(RESPAWN_BACKOFF * 2 ** (failures - 1), MAX_RESPAWN_BACKOFF))
+            else:
+                failures = 0
+            if not stopping:
+                children[_fork_worker(flask_app, server, previous_handlers)] = (worker, monotonic())
+    finally:
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+        server.server_close()
+    if failures >= max_failures:
+        raise RuntimeError(f'Workers failed {failures} times in a row')
+
+
+def _fork_worker(flask_app: Flask, server, signal_handlers: dict) -> int:
+    pid = os.fork()
+    if pid:
+        return pid
+    exit_code = 0
+    try:
+        for signum in signal_handlers:
+            signal.signal(signum, signal.SIG_DFL)
+        server.serve_forever()
+    except BaseException:  # pylint: disable=broad-except
+        flask_app.logger.exception('Worker %s exited with an error', os.getpid())
+        exit_code = 1
+    finally:
+        os._exit(exit_code)
@@ -0,0 +1,68 @@
+from threading import Event, Lock
+from typing import Callable, Dict, Optional
+
+from flask import Response
+from werkzeug.exceptions import GatewayTimeout
+
+from .cache import CachedResponse
+
+
+class SingleFlightCall():
+    '''A response being produced for a key, `done` is set once it finished.
+    '''
+
+    def __init__(self):
+        self.done = Event()
+        self.response: Optional[CachedResponse] = None
+
+
+class SingleFlight():
+    '''Coalesces concurrent calls with the same key: the first call runs and the calls arriving while
+    it's running wait for it and get a copy of its response. Nothing is kept once the call finished.
+
+    If the first call raises or its response is streamed, the waiting calls run on their own. Waiting
+    calls give up with 504 if the first call doesn't finish within their timeout, e.g the remaining
+    request deadline.
+    '''
+
+    def __init__(self):
+        self.calls: Dict[str, SingleFlightCall] = {}
+        self.lock = Lock()
+
+    def run(self, key: str, func: Callable[[], Response], timeout: Optional[float] = None) -> Response:
+        '''Calls func unless a call with the same key is in flight, in which case waits for its response.
+
+        Args:
+            key (str): Identifies equivalent calls, e.g a response cache key
+            func (Callable[[], Response]): Produces the response
+            timeout (float, optional): Max seconds to wait for the in flight call.
+                Defaults to None (no limit).
+
+        Raises:
+            GatewayTimeout: If the in flight call didn't finish within timeout
+
+        Returns:
+            Response: The response of func or a copy of the in flight call's response
+        '''
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = SingleFlightCall()
+        if not leader:
+            if not call.done.wait(timeout):
+                raise GatewayTimeout(
+                    f'Gave up waiting for an identical request after {timeout:g} seconds'
+                )
+            if call.response is None:
+                return func()
+            return call.response.to_response()
+        try:
+            response = func()
+            if not response.is_streamed:
+                call.response = CachedResponse.from_response(response)
+            return response
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
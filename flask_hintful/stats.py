@@ -0,0 +1,101 @@
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Dict, List
+
+
+class TypeStats():
+    '''Thread safe counters of calls, cumulative time and bytes produced per type, used by
+    `Serializer` and `Deserializer` when given one (or when FLASK_HINTFUL_COLLECT_STATS is set).
+
+    Time is inclusive: the time of a dataclass includes the time spent on types nested in it,
+    which are also counted on their own.
+    '''
+
+    def __init__(self):
+        self.counters: Dict[str, List] = {}
+        self.lock = Lock()
+
+    def record(self, key: Any, seconds: float, size: int = 0, calls: int = 1):
+        '''Adds `calls` calls taking `seconds` and producing `size` bytes to the counters of `key`.
+
+        Args:
+            key (Any): A type or a str describing it
+            seconds (float): Time spent
+            size (int, optional): Bytes produced or consumed. Defaults to 0.
+            calls (int, optional): Number of calls, e.g items of a list converted at once. Defaults to 1.
+        '''
+        name = type_name(key)
+        with self.lock:
+            counter = self.counters.get(name)
+            if counter is None:
+                counter = self.counters[name] = [0, 0.0, 0]
+            counter[0] += calls
+            counter[1] += seconds
+            counter[2] += size
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        '''Returns a copy of the counters.
+
+        Returns:
+            Dict[str, Dict[str, float]]: {type name: {'calls': int, 'seconds': float, 'bytes': int}}
+        '''
+        with self.lock:
+            return {
+                name: {'calls': calls, 'seconds': seconds, 'bytes': size}
+                for name, (calls, seconds, size) in self.counters.items()
+            }
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+
+    def export_prometheus(self, prefix: str) -> str:
+        '''Formats the counters in the Prometheus text exposition format, to be appended
+        to the app's metrics endpoint.
+
+        Args:
+            prefix (str): Metric name prefix, e.g 'flask_hintful_serializer'
+
+        Returns:
+            str: One `<prefix>_calls_total`, `<prefix>_seconds_total` and `<prefix>_bytes_total`
+                sample per type
+        '''
+        snapshot = self.snapshot()
+        lines = []
+        for metric in ('calls', 'seconds', 'bytes'):
+            lines.append(f'# TYPE {prefix}_{metric}_total counter')
+            for name, counters in sorted(snapshot.items()):
+                label = name.replace('\\', '\\\\').replace('"', '\\"')
+                lines.append(f'{prefix}_{metric}_total{{type="{label}"}} {counters[metric]}')
+        return '\n'.join(lines) + '\n'
+
+
+@lru_cache(maxsize=1024)
+def type_name(type_: Any) -> str:
+    '''Readable name of type_, e.g 'int', 'myapp.models.User' or 'List[int]'
+    '''
+    if isinstance(type_, str):
+        return type_
+    if isinstance(type_, type):
+        if type_.__module__ == 'builtins':
+            return type_.__qualname__
+        return f'{type_.__module__}.{type_.__qualname__}'
+    return str(type_).replace('typing.', '')
+
+
+def get_stats_key(data: Any) -> str:
+    '''Stats key of a serialized object, lists are keyed by the type of their first item.
+    '''
+    if isinstance(data, list) and data:
+        return f'list[{type_name(data[0].__class__)}]'
+    return type_name(data.__class__)
+
+
+def get_size(data: Any) -> int:
+    '''Size in bytes of encoded or raw data, str is measured as UTF-8. Other objects count as 0.
+    '''
+    if isinstance(data, str):
+        return len(data.encode('utf-8'))
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return data.nbytes if isinstance(data, memoryview) else len(data)
+    return 0
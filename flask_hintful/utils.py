@@ -1,12 +1,114 @@
-from inspect import getdoc, signature
-from typing import Callable
+from dataclasses import fields, is_dataclass
+from inspect import getdoc, signature, unwrap
+from typing import Any, Callable, Dict, Iterator, Type, get_type_hints
 
 
 def get_func_sig(func: Callable) -> dict:
+    '''Returns the params, return type and docstring of func. String annotations (PEP 563, e.g
+    `from __future__ import annotations`) are resolved using typing.get_type_hints, as are the field
+    types of dataclasses found in them, see `get_dataclass_type_hints`.
+
+    Signatures are resolved once per function, when its route is registered.
+
+    Raises:
+        TypeError: If an annotation can't be resolved, e.g a forward reference to a class not defined yet
+    '''
+    func_sig = _FUNC_SIGS.get(func)
+    if func_sig is not None:
+        return func_sig
     sig = signature(func, follow_wrapped=True)
-    return {
+    if any(isinstance(param.annotation, str) for param in sig.parameters.values()) or \
+            isinstance(sig.return_annotation, str):
+        hints = get_resolved_type_hints(unwrap(func))
+        sig = sig.replace(
+            parameters=[
+                param.replace(annotation=resolve_annotation(param.annotation, hints.get(name)))
+                for name, param in sig.parameters.items()
+            ],
+            return_annotation=resolve_annotation(sig.return_annotation, hints.get('return'))
+        )
+        unresolved = [
+            name for name, param in sig.parameters.items() if isinstance(param.annotation, str)
+        ]
+        if isinstance(sig.return_annotation, str):
+            unresolved.append('return')
+        if unresolved:
+            raise TypeError(
+                f'Cannot resolve annotations of {", ".join(unresolved)} in {func.__qualname__}'
+            )
+    func_sig = {
         "return": sig.return_annotation,
         "params": sig.parameters,
         "doc": getdoc(func),
         "empty": sig.empty
     }
+    for type_ in [param.annotation for param in sig.parameters.values()] + [sig.return_annotation]:
+        resolve_nested_types(type_)
+    _FUNC_SIGS[func] = func_sig
+    return func_sig
+
+
+def get_resolved_type_hints(obj: Any) -> Dict[str, Any]:
+    '''typing.get_type_hints, empty if any annotation of obj can't be resolved.
+    '''
+    localns = {obj.__name__: obj} if isinstance(obj, type) else None
+    try:
+        return get_type_hints(obj, localns=localns)
+    except (NameError, TypeError, AttributeError):
+        return {}
+
+
+def resolve_annotation(annotation: Any, hint: Any) -> Any:
+    '''Replaces str annotations with their resolved hint, other annotations are kept as declared.
+    '''
+    if isinstance(annotation, str) and hint is not None:
+        return hint
+    return annotation
+
+
+def get_dataclass_type_hints(type_: Type) -> Dict[str, Any]:
+    '''Returns the types of the fields of dataclass type_ by name, with str types (PEP 563) and forward
+    references resolved. The dataclass itself isn't modified, resolved types are cached per class once
+    they all resolve, unresolvable types are kept as declared and retried on the next call.
+    '''
+    hints = _DATACLASS_TYPE_HINTS.get(type_)
+    if hints is not None:
+        return hints
+    dataclass_fields = fields(type_)
+    resolved = get_resolved_type_hints(type_)
+    hints = {field.name: resolved.get(field.name, field.type) for field in dataclass_fields}
+    if all(field.name in resolved for field in dataclass_fields):
+        _DATACLASS_TYPE_HINTS[type_] = hints
+    return hints
+
+
+def resolve_nested_types(type_: Type):
+    '''Resolves the field types of type_ and every dataclass nested in it ahead of their first use.
+    '''
+    for nested_type in iter_nested_types(type_):
+        if is_dataclass(nested_type) and isinstance(nested_type, type):
+            get_dataclass_type_hints(nested_type)
+
+
+def iter_nested_types(type_: Type) -> Iterator[Type]:
+    '''Yields type_, the args of generic types such as List[T] and the types of dataclass fields,
+    recursively. Each type is yielded once.
+    '''
+    seen = set()
+    pending = [type_]
+    while pending:
+        current = pending.pop()
+        try:
+            if current in seen:
+                continue
+            seen.add(current)
+        except TypeError:
+            continue
+        yield current
+        pending.extend(getattr(current, '__args__', None) or ())
+        if is_dataclass(current) and isinstance(current, type):
+            pending.extend(get_dataclass_type_hints(current).values())
+
+
+_FUNC_SIGS: Dict[Callable, dict] = {}
+_DATACLASS_TYPE_HINTS: Dict[Type, Dict[str, Any]] = {}
@@ -0,0 +1,227 @@
+from dataclasses import MISSING, fields, is_dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, List, Mapping, Optional, Type, TypeVar, Union
+
+from flask import json
+from werkzeug.exceptions import BadRequest
+
+from .utils import get_dataclass_type_hints
+
+Validator = Callable[[Any, str, List[Dict[str, str]]], None]
+
+MAX_VALIDATION_ERRORS = 100
+
+PRIMITIVE_TYPES = {
+    str: (str,),
+    int: (int,),
+    float: (int, float),
+    bool: (bool,)
+}
+
+
+class ValidationError(BadRequest, ValueError):
+    '''Raised when a request body doesn't match the dataclass it's deserialized into.
+    Responds with 400 and a JSON body listing every error found in `errors`, e.g
+    `{"code": 400, "name": "Bad Request", "errors": [{"path": "id", "message": "expected int"}]}`
+
+    Args:
+        errors (List[Dict[str, str]]): path and message of each error
+    '''
+
+    def __init__(self, errors: List[Dict[str, str]]):
+        super().__init__(f'Invalid request body: {len(errors)} errors')
+        self.errors = errors
+
+    def get_body(self, environ=None) -> str:
+        return json.dumps({'code': self.code, 'name': self.name, 'errors': self.errors})
+
+    def get_headers(self, environ=None) -> list:
+        return [('Content-Type', 'application/json')]
+
+
+def compile_validator(type_: Type, get_validator: Callable[[Type], Optional[Validator]],
+                      deserializers: Optional[Mapping[Type, Callable]] = None) -> Optional[Validator]:
+    '''Compiles a function checking that decoded JSON data has the shape of type_: dataclass objects with
+    all required fields and no unknown ones, primitive types, lists and dicts, Optional and Enum values.
+    Union values must match one of its types. Other types (e.g marshmallow models) aren't checked, their
+    deserializers validate them.
+
+    Validators of nested types are looked up with get_validator when called, so recursive dataclasses are
+    supported and each type is compiled once.
+
+    Args:
+        type_ (Type): Type data will be deserialized into
+        get_validator (Callable[[Type], Optional[Validator]]): Returns the (cached) validator of a type
+        deserializers (Mapping[Type, Callable], optional): Registered deserializers, types with one
+            only accept scalar values the deserializer can parse. Defaults to None.
+
+    Returns:
+        Optional[Validator]: validate(data, path, errors) appending errors, None if type_ isn't checked
+    '''
+    if type_ is Any or isinstance(type_, TypeVar):
+        return None
+    if type_ in PRIMITIVE_TYPES:
+        return compile_primitive_validator(type_)
+    origin = getattr(type_, '__origin__', None) or type_
+    args = [arg for arg in getattr(type_, '__args__', None) or () if not isinstance(arg, TypeVar)]
+    if origin is Union:
+        item_types = [arg for arg in args if arg is not type(None)]
+        if len(item_types) == 1:
+            return compile_optional_validator(item_types[0], get_validator)
+        return compile_union_validator(item_types, type(None) in args, get_validator)
+    if isinstance(origin, type) and issubclass(origin, (list, set, frozenset, tuple)):
+        return compile_list_validator(args[0] if args and origin is not tuple else None, get_validator)
+    if isinstance(origin, type) and issubclass(origin, dict):
+        return compile_dict_validator(args[1] if len(args) == 2 else None, get_validator)
+    if isinstance(type_, type) and issubclass(type_, Enum):
+        return compile_enum_validator(type_)
+    deserializer = deserializers.get(type_) if deserializers else None
+    if is_dataclass(type_) and deserializer is None:
+        return compile_dataclass_validator(type_, get_validator)
+    if deserializer is not None:
+        return compile_scalar_validator(type_, deserializer)
+    return None
+
+
+def compile_primitive_validator(type_: Type) -> Validator:
+    accepted = PRIMITIVE_TYPES[type_]
+    message = f'expected {type_.__name__}'
+
+    def validate(data, path: str, errors: List[Dict[str, str]]):
+        if not isinstance(data, accepted) or (isinstance(data, bool) and type_ is not bool):
+            errors.append({'path': path, 'message': message})
+    return validate
+
+
+def compile_scalar_validator(type_: Type, deserializer: Callable) -> Validator:
+    message = f'expected {getattr(type_, "__name__", type_)}'
+
+    def validate(data, path: str, errors: List[Dict[str, str]]):
+        if isinstance(data, (dict, list)):
+            errors.append({'path': path, 'message': message})
+            return
+        try:
+            deserializer(data)
+        except ValidationError as error:
+            errors.extend({'path': join_path(path, item['path']), 'message': item['message']}
+                          for item in error.errors)
+        except Exception:  # pylint: disable=broad-except
+            errors.append({'path': path, 'message': message})
+    return validate
+
+
+def compile_optional_validator(type_: Type,
+                               get_validator: Callable[[Type], Optional[Validator]]) -> Validator:
+    def validate(data, path: str, errors: List[Dict[str, str]]):
+        if data is not None:
+            validator = get_validator(type_)
+            if validator is not None:
+                validator(data, path, errors)
+    return validate
+
+
+def compile_union_validator(item_types: List[Type], nullable: bool,
+                            get_validator: Callable[[Type], Optional[Validator]]) -> Validator:
+    names = [getattr(item_type, '__name__', str(item_type)) for item_type in item_types]
+    message = f'expected {" or ".join(names)}'
+
+    def validate(data, path: str, errors: List[Dict[str, str]]):
+        if data is None and nullable:
+            return
+        for item_type in item_types:
+            validator = get_validator(item_type)
+            if validator is None:
+                return
+            item_errors: List[Dict[str, str]] = []
+            validator(data, path, item_errors)
+            if not item_errors:
+                return
+        errors.append({'path': path, 'message': message})
+    return validate
+
+
+def compile_list_validator(item_type: Optional[Type],
+                           get_validator: Callable[[Type], Optional[Validator]]) -> Validator:
+    def validate(data, path: str, errors: List[Dict[str, str]]):
+        if not isinstance(data, list):
+            errors.append({'path': path, 'message': 'expected list'})
+            return
+        validator = get_validator(item_type) if item_type is not None else None
+        if validator is None:
+            return
+        for index, item in enumerate(data):
+            if len(errors) >= MAX_VALIDATION_ERRORS:
+                return
+            validator(item, f'{path}[{index}]', errors)
+    return validate
+
+
+def compile_dict_validator(value_type: Optional[Type],
+                           get_validator: Callable[[Type], Optional[Validator]]) -> Validator:
+    def validate(data, path: str, errors: List[Dict[str, str]]):
+        if isinstance(data, str) and value_type is None:
+            return
+        if not isinstance(data, dict):
+            errors.append({'path': path, 'message': 'expected object'})
+            return
+        validator = get_validator(value_type) if value_type is not None else None
+        if validator is None:
+            return
+        for key, value in data.items():
+            validator(value, join_path(path, key), errors)
+    return validate
+
+
+def compile_enum_validator(type_: Type[Enum]) -> Validator:
+    accepted = {member.value for member in type_} | set(type_.__members__)
+    accepted |= {str(member.value) for member in type_}
+    message = f'expected one of {", ".join(str(member.value) for member in type_)}'
+
+    def validate(data, path: str, errors: List[Dict[str, str]]):
+        try:
+            valid = data in accepted
+        except TypeError:
+            valid = False
+        if not valid:
+            errors.append({'path': path, 'message': message})
+    return validate
+
+
+def compile_dataclass_validator(type_: Type,
+                                get_validator: Callable[[Type], Optional[Validator]]) -> Validator:
+    hints = get_dataclass_type_hints(type_)
+    init_fields = [field for field in fields(type_) if field.init]
+    field_names = {field.name for field in init_fields}
+    specs = [
+        (
+            field.name,
+            field.default is MISSING and field.default_factory is MISSING,
+            field.default is None,
+            hints[field.name]
+        )
+        for field in init_fields
+    ]
+
+    def validate(data, path: str, errors: List[Dict[str, str]]):
+        if not isinstance(data, dict):
+            errors.append({'path': path, 'message': 'expected object'})
+            return
+        for key in data:
+            if key not in field_names:
+                errors.append({'path': join_path(path, key), 'message': 'unknown field'})
+        for name, required, nullable, field_type in specs:
+            if name not in data:
+                if required:
+                    errors.append({'path': join_path(path, name), 'message': 'missing required field'})
+                continue
+            value = data[name]
+            if value is None and nullable:
+                continue
+            validator = get_validator(field_type)
+            if validator is not None:
+                validator(value, join_path(path, name), errors)
+    return validate
+
+
+def join_path(path: str, key: Any) -> str:
+    return f'{path}.{key}' if path else str(key)
@@ -1,56 +1,311 @@
 from functools import wraps
-from typing import Callable
+from inspect import iscoroutinefunction
+from hashlib import sha256
+from typing import Callable, Optional
 
-from flask import request
+from flask import Response, current_app, json, request
+from werkzeug.exceptions import BadRequest, RequestEntityTooLarge, ServiceUnavailable
 
+from .background import BackgroundTasks
+from .cache import CachedResponse, SqliteResponseCache
+from .deadline import check_deadline, get_deadline, run_coroutine, start_deadline
 from .deserializer import Deserializer
-from .serializer import Serializer
+from .events import is_event_stream, to_event_stream
+from .idempotency import DEFAULT_IDEMPOTENCY_TTL, IDEMPOTENCY_KEY_HEADER, IdempotencyStore
+from .limits import ConcurrencyLimiter
+from .pagination import get_pagination_args, is_paginated, paginate
+from .serializer import Serializer, parse_fields
+from .single_flight import SingleFlight
 from .utils import get_func_sig
 
+HINTFUL_ROUTE_OPTIONS = ('max_content_length', 'cache', 'cache_ttl', 'idempotent', 'idempotency_ttl',
+                         'single_flight', 'max_concurrency', 'max_queue', 'queue_timeout', 'retry_after',
+                         'background', 'timeout')
 
-def view_func_wrapper(view_func: Callable, serializer: Serializer, deserializer: Deserializer):
+DEFAULT_RETRY_AFTER = 1
+
+CACHEABLE_METHODS = ('GET', 'HEAD')
+
+
+def view_func_wrapper(view_func: Callable, serializer: Serializer, deserializer: Deserializer,
+                      max_content_length: Optional[int] = None,
+                      cache: Optional[SqliteResponseCache] = None, cache_ttl: Optional[float] = None,
+                      idempotent: bool = False, idempotency_ttl: Optional[float] = None,
+                      single_flight: bool = False, max_concurrency: Optional[int] = None,
+                      max_queue: int = 0, queue_timeout: Optional[float] = None,
+                      retry_after: Optional[int] = None,
+                      background_tasks: Optional[BackgroundTasks] = None,
+                      timeout: Optional[float] = None):
     '''Wraps around the view_func to deserialize Flask request view args, args and
     body as parameters for the view_func and serialize the view_func return.
 
+    Unless view_func declares a `fields` param, a `fields` query arg (e.g `fields=id,owner.name`)
+    restricts which fields of dataclasses and marshmallow models are serialized.
+
+    If view_func's return type is Paginated[T] the `limit`, `offset` and `cursor` query args select which
+    page of the returned iterable is serialized.
+
+    If view_func's return type is EventStream[T] the returned iterable (e.g a generator) is streamed as
+    Server-Sent Events, see `EventStream`.
+
+    With a `cache`, successful GET and HEAD responses are cached keyed on the view func, its deserialized
+    args and the negotiated media type, and served from the cache without calling view_func.
+
+    If `idempotent`, responses to requests sent with an Idempotency-Key header are stored and replayed
+    for retries with the same key, see `IdempotencyStore`.
+
+    With `single_flight`, concurrent GET and HEAD requests with the same cache key wait for one execution
+    of view_func and share its serialized response, see `SingleFlight`. Waiting requests return 504 once
+    their deadline passes.
+
+    With `max_concurrency`, requests over the limit wait in a bounded queue and are rejected with 503 and
+    a Retry-After header before being deserialized when it's full, see `ConcurrencyLimiter`. The limiter
+    is available as the `concurrency_limiter` attribute of the wrapped function.
+
+    With `background_tasks`, view_func is called in its thread pool after the request is deserialized and
+    202 is returned at once with the url of the task status route, which serves the serialized response
+    once view_func finished.
+
+    Each request gets a deadline from the shorter of `timeout` and the X-Request-Timeout header sent by
+    the client, see `flask_hintful.deadline.get_deadline`. Requests wait in the concurrency queue for at
+    most the deadline, and once it passed 504 is returned instead of calling view_func or serializing its
+    response. Async view funcs are run in an event loop and cancelled when the deadline passes.
+
     Args:
         view_func (Callable): Function that will be wrapped
         serializer (Serializer): Serializer to serialize response
         deserializer (Deserializer): Deserializer to deserialize args
+        max_content_length (int, optional): Max request body size in bytes, larger bodies are rejected
+            with 413 before being parsed. Defaults to None (FLASK_HINTFUL_MAX_CONTENT_LENGTH config).
+        cache (SqliteResponseCache, optional): Response cache shared by all workers. Defaults to None.
+        cache_ttl (float, optional): Seconds responses are cached for.
+            Defaults to None (cache.default_ttl).
+        idempotent (bool, optional): If Idempotency-Key headers are honored. Defaults to False.
+        idempotency_ttl (float, optional): Seconds responses are replayed for.
+            Defaults to None (FLASK_HINTFUL_IDEMPOTENCY_TTL config or 24 hours).
+        single_flight (bool, optional): If identical concurrent GET requests are coalesced.
+            Defaults to False.
+        max_concurrency (int, optional): Max requests handled at once per process.
+            Defaults to None (unlimited).
+        max_queue (int, optional): Max requests waiting when max_concurrency is reached. Defaults to 0.
+        queue_timeout (float, optional): Max seconds a request waits in the queue.
+            Defaults to None (unlimited).
+        retry_after (int, optional): Retry-After seconds of shed requests.
+            Defaults to None (FLASK_HINTFUL_RETRY_AFTER config or 1).
+        background_tasks (BackgroundTasks, optional): Runs view_func in the background. Defaults to None.
+        timeout (float, optional): Seconds requests may take.
+            Defaults to None (FLASK_HINTFUL_REQUEST_TIMEOUT config or no timeout).
     '''
     func_sig = get_func_sig(view_func)
+    accepts_fields = 'fields' in func_sig['params']
+    paginated = is_paginated(func_sig['return'])
+    event_stream = is_event_stream(func_sig['return'])
+    idempotency_store = IdempotencyStore() if idempotent else None
+    single_flight_calls = SingleFlight() if single_flight else None
+    concurrency_limiter = ConcurrencyLimiter(max_concurrency, max_queue, queue_timeout) \
+        if max_concurrency is not None else None
+
+    is_async = iscoroutinefunction(view_func)
 
     @wraps(view_func)
     def decorator(**_):
+        deadline = start_deadline(timeout)
+        if concurrency_limiter is None:
+            return handle_request()
+        if not concurrency_limiter.acquire(deadline.remaining() if deadline is not None else None):
+            raise ServiceUnavailable(
+                f'Too many concurrent requests to {request.path}',
+                retry_after=retry_after if retry_after is not None else current_app.config.get(
+                    'FLASK_HINTFUL_RETRY_AFTER', DEFAULT_RETRY_AFTER)
+            )
+        try:
+            return handle_request()
+        finally:
+            concurrency_limiter.release()
+
+    def handle_request():
         args = request.args.copy()
         args.update(request.view_args)
+        fields = None
+        if not accepts_fields and 'fields' in args:
+            fields = parse_fields(args.pop('fields'))
+        if paginated:
+            offset, limit = get_pagination_args(args)
         deserialized_args = deserializer.deserialize_args(
-            args, func_sig['params'], request.get_json()
+            args, func_sig['params'], get_request_body(deserializer, max_content_length)
         )
-        response = view_func(**deserialized_args)
-        return serializer.serialize_response(response)
+        media_type = get_response_media_type(serializer)
+        check_deadline()
+        cache_key = None
+        needs_cache_key = cache is not None or single_flight_calls is not None
+        if needs_cache_key and request.method in CACHEABLE_METHODS:
+            cache_key = get_cache_key(
+                view_func, serializer, deserialized_args, media_type, fields,
+                (offset, limit) if paginated else None
+            )
+            cached = cache.get(cache_key) if cache is not None else None
+            if cached is not None:
+                return cached.to_response()
+
+        def run_view():
+            response = view_func(**deserialized_args)
+            if is_async:
+                response = run_coroutine(response, get_deadline())
+            check_deadline()
+            if paginated:
+                response = paginate(response, offset, limit)
+            elif event_stream:
+                response = to_event_stream(response)
+            return serializer.serialize_response(response, media_type, fields)
+
+        def respond():
+            if background_tasks is None:
+                return run_view()
+            task = background_tasks.submit(lambda: current_app.make_response(run_view()))
+            return serializer.serialize_response(
+                (task.as_dict(), 202, {'Location': task.url}), media_type
+            )
+
+        idempotency_key = None
+        if idempotency_store is not None:
+            idempotency_key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+        if idempotency_key:
+            return idempotency_store.run(
+                idempotency_key,
+                get_cache_key(view_func, serializer, deserialized_args, media_type, fields),
+                lambda: current_app.make_response(respond()),
+                idempotency_ttl if idempotency_ttl is not None else current_app.config.get(
+                    'FLASK_HINTFUL_IDEMPOTENCY_TTL', DEFAULT_IDEMPOTENCY_TTL)
+            )
+        if cache_key is None:
+            return respond()
+
+        def respond_and_cache():
+            if cache is None:
+                return current_app.make_response(respond())
+            return cache_response(cache, cache_key, respond(), cache_ttl)
+        if single_flight_calls is not None:
+            deadline = get_deadline()
+            return single_flight_calls.run(
+                cache_key, respond_and_cache, deadline.remaining() if deadline is not None else None
+            )
+        return respond_and_cache()
+    decorator.concurrency_limiter = concurrency_limiter
     return decorator
 
 
+def pop_hintful_options(options: dict) -> dict:
+    '''Removes Flask Hintful route options from `options` so the remaining ones can be passed to Flask.
+
+    Returns:
+        dict: Flask Hintful route options, see FlaskHintful.pop_hintful_options
+    '''
+    return {name: options.pop(name) for name in HINTFUL_ROUTE_OPTIONS if name in options}
+
+
+def get_cache_key(view_func: Callable, serializer: Serializer, deserialized_args: dict,
+                  *request_options) -> str:
+    '''Hashes view_func's name, the current request method and host, the normalized deserialized args
+    and any other `request_options` that change the response into a cache key.
+    '''
+    normalized = json.dumps(
+        [f'{view_func.__module__}.{view_func.__qualname__}', request.method, request.host_url,
+         serializer.dump(deserialized_args), request_options],
+        sort_keys=True, default=serializer.to_primitive
+    )
+    return sha256(normalized.encode()).hexdigest()
+
+
+def cache_response(cache: SqliteResponseCache, cache_key: str, response,
+                   cache_ttl: Optional[float] = None) -> Response:
+    '''Converts a serialized response into a Flask Response and caches it if its status is 2xx.
+    '''
+    if not isinstance(response, Response):
+        response = current_app.make_response(response)
+    if 200 <= response.status_code < 300 and response.status_code not in (202, 206) \
+            and not response.is_streamed:
+        cache.set(cache_key, CachedResponse.from_response(response), cache_ttl)
+    return response
+
+
+def get_request_body(deserializer: Deserializer, max_content_length: Optional[int] = None):
+    '''Decodes the current request body using the codec registered in `deserializer` for its
+    Content-Type. Any JSON Content-Type (as in Flask`s request.is_json) is decoded as application/json.
+
+    Args:
+        deserializer (Deserializer): Deserializer with registered codecs
+        max_content_length (int, optional): Max body size in bytes.
+            Defaults to None (FLASK_HINTFUL_MAX_CONTENT_LENGTH config or unlimited).
+
+    Raises:
+        RequestEntityTooLarge: If the body is larger than max_content_length
+        BadRequest: If the body can't be decoded
+    '''
+    if max_content_length is None:
+        max_content_length = current_app.config.get('FLASK_HINTFUL_MAX_CONTENT_LENGTH')
+    if max_content_length is not None and (request.content_length or 0) > max_content_length:
+        raise RequestEntityTooLarge(f'Request body is larger than {max_content_length} bytes')
+    media_type = 'application/json' if request.is_json else request.mimetype
+    if media_type not in deserializer.codecs:
+        return None
+    try:
+        return deserializer.deserialize_body(
+            read_request_body(max_content_length), media_type, request.headers
+        )
+    except ValueError as err:
+        raise BadRequest(f'Failed to decode {media_type} body: {err}')
+
+
+def read_request_body(max_content_length: Optional[int] = None) -> bytes:
+    '''Reads the current request body. When there isn't a Content-Length (e.g chunked requests)
+    reads at most max_content_length + 1 bytes from the stream.
+
+    Raises:
+        RequestEntityTooLarge: If the body is larger than max_content_length
+    '''
+    if max_content_length is None or request.content_length is not None:
+        return request.get_data()
+    data = request.stream.read(max_content_length + 1)
+    if len(data) > max_content_length:
+        raise RequestEntityTooLarge(f'Request body is larger than {max_content_length} bytes')
+    return data
+
+
+def get_response_media_type(serializer: Serializer) -> str:
+    '''Negotiates the response media type from the Accept header against codecs
+    registered in `serializer`, defaults to 'application/json'.
+    '''
+    return request.accept_mimetypes.best_match(serializer.codecs, default='application/json')
+
+
 class BlueprintWrapper():
     '''This class is used to help wrap view funcs registered using a Flask Blueprint.
 
     Args:
         app (FlaskHintful): FlaskHintful api to register the Blueprints routes on
         url_prefix (str, optional): [description]. Defaults to ''.
+        name (str, optional): Name of the Blueprint, routes are tagged with it in the OpenApi
+            specification. Defaults to None.
     '''
 
-    def __init__(self, app, url_prefix: str = ''):
+    def __init__(self, app, url_prefix: str = '', name: Optional[str] = None):
         self.app = app
         self.url_prefix = url_prefix
+        self.name = name
 
     def add_url_rule(self, rule, endpoint, view_func, **options):
         '''Wraps view_func with view_func_wrapper, then return a lambda expression as is
         expected by Flask Blueprint`s deferred_functions.
         '''
-        wrapped_view_func = view_func_wrapper(view_func, self.app.serializer, self.app.deserializer)
+        openapi_tag = options.pop('openapi_tag', self.name)
+        wrapped_view_func = view_func_wrapper(
+            view_func, self.app.serializer, self.app.deserializer,
+            **self.app.pop_hintful_options(options)
+        )
         prefixed_rule = ''
         if self.url_prefix:
             prefixed_rule = '/'.join((self.url_prefix.rstrip('/'), rule.lstrip('/')))
         self.app.openapi_provider.add_openapi_path(
-            prefixed_rule or rule, options.get('methods', ['GET']), view_func)
+            prefixed_rule or rule, options.get('methods', ['GET']), view_func, openapi_tag)
+        self.app.view_funcs.append(view_func)
         return lambda s: s.add_url_rule(rule, endpoint, wrapped_view_func, **options)
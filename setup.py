@@ -12,7 +12,8 @@ README = (HERE / "README.md").read_text()
 setup(
     name="flask-hintful",
     version="0.0.7",
-    description="Flask extension for generating restful apis using type hints to automatically (de)serialize parameters and generate openapi docs.",
+    description="Flask extension for generating restful apis using type hints to automatically "
+                "(de)serialize parameters and generate openapi docs.",
     long_description=README,
     long_description_content_type="text/markdown",
     url="https://github.com/GabrielCappelli/flask-hintful",
@@ -31,5 +32,8 @@ setup(
         'openapi-specgen>=0.0.6',
         'marshmallow>=3.0.0'
     ],
+    extras_require={
+        'msgpack': ['msgpack>=1.0.0']
+    },
     entry_points={}
 )
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import List
+
+
+@dataclass
+class Pep563Model():
+    date_field: date
+    nested_field: Pep563Nested
+    int_field: int = 0
+
+
+@dataclass
+class Pep563Nested():
+    dates: List[date]
+
+
+def pep563_view(model: Pep563Model, count: int) -> List[Pep563Model]:
+    '''view func with string annotations'''
+    return [model] * count
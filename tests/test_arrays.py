@@ -0,0 +1,114 @@
+import json
+import sys
+from array import array
+
+import pytest
+from flask_hintful import Serializer
+from flask_hintful.arrays import (ArrayBuffer, ArrayCodec, InvalidArray, get_array_buffer,
+                                  get_array_dtype, parse_shape, to_array)
+
+ORDER = '<' if sys.byteorder == 'little' else '>'
+
+
+def test_serialize_array_json():
+    '''Should serialize array.array as a JSON array
+    '''
+    serializer = Serializer()
+    assert json.loads(serializer.serialize(array('d', [1.5, 2.5]))) == [1.5, 2.5]
+    assert json.loads(serializer.serialize({'scores': array('i', [1, 2])})) == {'scores': [1, 2]}
+
+
+def test_array_dtype():
+    '''Should describe array.array typecodes as NumPy dtypes and parse shapes
+    '''
+    assert get_array_dtype(array('d')) == f'{ORDER}f8'
+    assert get_array_dtype(array('B')) == '|u1'
+    assert parse_shape('3,4') == (3, 4)
+    assert parse_shape(None) is None
+    with pytest.raises(ValueError):
+        parse_shape('3,x')
+
+
+def test_to_array():
+    '''Should deserialize raw buffers, JSON arrays and query args into array.array
+    '''
+    buffer = ArrayBuffer(memoryview(array('d', [1.0, 2.0]).tobytes()), f'{ORDER}f8')
+    assert to_array(buffer, array) == array('d', [1.0, 2.0])
+    assert to_array([1, 2], array) == array('q', [1, 2])
+    assert to_array(['1.5', '2'], array) == array('d', [1.5, 2.0])
+    with pytest.raises(ValueError):
+        to_array(ArrayBuffer(memoryview(b'123'), f'{ORDER}f8'), array)
+    with pytest.raises(ValueError):
+        to_array(ArrayBuffer(memoryview(b''), 'float64'), array)
+    with pytest.raises(InvalidArray):
+        to_array({'a': 1}, array)
+    with pytest.raises(InvalidArray):
+        to_array([[1, 2], [3]], array)
+    with pytest.raises(InvalidArray):
+        to_array(['x'], array)
+    buffer = ArrayCodec.loads(b'\x00' * 8, '|u1', (2, 4))
+    assert (buffer.dtype, buffer.shape, buffer.buffer.nbytes) == ('|u1', (2, 4), 8)
+
+
+def test_array_route(api):
+    '''Should receive and send raw array bytes with dtype and shape headers
+    '''
+    @api.route('/scores', methods=['POST'])
+    def _(vector: array) -> array:
+        return array('d', [value * 2 for value in vector])
+
+    payload = array('d', [1.0, 2.5, 4.0])
+    with api.flask_app.test_client() as client:
+        raw = client.post('/scores', data=payload.tobytes(), headers={
+            'Content-Type': 'application/x-array', 'X-Array-Dtype': f'{ORDER}f8',
+            'Accept': 'application/x-array'
+        })
+        as_json = client.post('/scores', json=[1, 2])
+        invalid = client.post('/scores', data=b'123', headers={'Content-Type': 'application/x-array'})
+        invalid_shape = client.post('/scores', data=payload.tobytes(), headers={
+            'Content-Type': 'application/x-array', 'X-Array-Shape': '3,x'
+        })
+        as_object = client.post('/scores', json={'a': 1})
+        nested = client.post('/scores', json=[[1, 2], [3]])
+    assert raw.headers['Content-Type'] == 'application/x-array'
+    assert raw.headers['X-Array-Dtype'] == f'{ORDER}f8'
+    assert raw.headers['X-Array-Shape'] == '3'
+    assert array('d', raw.get_data()) == array('d', [2.0, 5.0, 8.0])
+    assert as_json.get_json() == [2, 4]
+    assert invalid.status_code == 400
+    assert invalid_shape.status_code == 400
+    assert as_object.status_code == 400
+    assert nested.status_code == 400
+
+
+def test_numpy_route(api):
+    '''Should send numpy arrays as JSON or raw bytes and wrap raw bodies without copying
+    '''
+    numpy = pytest.importorskip('numpy')
+
+    @api.route('/matrix', methods=['POST'])
+    def _(matrix: numpy.ndarray) -> numpy.ndarray:
+        assert not matrix.flags.writeable
+        return matrix.T
+
+    matrix = numpy.arange(6, dtype='<f4').reshape(2, 3)
+    headers = {'Content-Type': 'application/x-array', 'X-Array-Dtype': '<f4', 'X-Array-Shape': '2,3'}
+    with api.flask_app.test_client() as client:
+        raw = client.post(
+            '/matrix', data=matrix.tobytes(), headers={**headers, 'Accept': 'application/x-array'}
+        )
+        as_json = client.post('/matrix', data=matrix.tobytes(), headers=headers)
+    assert raw.headers['X-Array-Shape'] == '3,2'
+    assert (numpy.frombuffer(raw.get_data(), '<f4').reshape(3, 2) == matrix.T).all()
+    assert as_json.get_json() == matrix.T.tolist()
+    assert json.loads(Serializer().serialize({'max': matrix.max()})) == {'max': 5.0}
+
+
+def test_numpy_buffer_unsupported_dtype():
+    '''Should raise a clear TypeError for NumPy arrays that have no raw bytes to send
+    '''
+    numpy = pytest.importorskip('numpy')
+    with pytest.raises(TypeError, match='no buffer format'):
+        get_array_buffer(numpy.array(['2020-01-01'], dtype='datetime64[D]'))
+    with pytest.raises(TypeError, match='Python objects'):
+        get_array_buffer(numpy.array([object()]))
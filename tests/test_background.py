@@ -0,0 +1,66 @@
+import threading
+import time
+
+from werkzeug.exceptions import NotFound
+
+
+def wait_for_task(client, url):
+    for _ in range(100):
+        response = client.get(url)
+        if response.status_code != 202:
+            return response
+        time.sleep(0.01)
+    return response
+
+
+def test_background_route(api, dataclass_type, model_dict):
+    '''Should run the view in the background, return 202 with a status url then serve its response
+    '''
+    release = threading.Event()
+
+    @api.route('/reports', methods=['POST'], background=True)
+    def _(model: dataclass_type, count: int) -> dataclass_type:
+        release.wait(5)
+        return [model] * count, 201
+    with api.flask_app.test_client() as client:
+        accepted = client.post('/reports?count=2', json=model_dict)
+        task = accepted.get_json()
+        pending = client.get(task['url'])
+        release.set()
+        done = wait_for_task(client, task['url'])
+        missing = client.get('/tasks/missing')
+    assert accepted.status_code == 202
+    assert accepted.headers['Location'].endswith(task['url'])
+    assert task['status'] in ('pending', 'running')
+    assert pending.status_code == 202
+    assert pending.get_json()['id'] == task['id']
+    assert done.status_code == 201
+    assert done.get_json() == [model_dict, model_dict]
+    assert missing.status_code == 404
+
+
+def test_background_route_failure(api):
+    '''Should serve the error response of views that raised
+    '''
+    @api.route('/failing', background=True)
+    def _() -> str:
+        raise NotFound()
+    with api.flask_app.test_client() as client:
+        task = client.get('/failing').get_json()
+        done = wait_for_task(client, task['url'])
+    assert done.status_code == 404
+    assert api.background_tasks.get(task['id']).status == 'failed'
+
+
+def test_background_result_expiry(api):
+    '''Should forget finished tasks once their result ttl expires
+    '''
+    api.flask_app.config['FLASK_HINTFUL_BACKGROUND_RESULT_TTL'] = 0
+
+    @api.route('/quick', background=True)
+    def _() -> str:
+        return 'done'
+    with api.flask_app.test_client() as client:
+        task = client.get('/quick').get_json()
+        response = wait_for_task(client, task['url'])
+    assert response.status_code == 404
@@ -0,0 +1,82 @@
+from io import BytesIO
+from pathlib import Path
+from typing import BinaryIO
+
+from flask_hintful.binary import is_binary, is_binary_type
+
+
+def test_is_binary(tmp_path):
+    '''Should recognize bytes-like objects, paths and binary files
+    '''
+    binary_data = (b'1', bytearray(b'1'), memoryview(b'1'), tmp_path, BytesIO())
+    assert all(is_binary(data) for data in binary_data)
+    assert not is_binary('str')
+    assert all(is_binary_type(type_) for type_ in (bytes, memoryview, Path, BinaryIO))
+    assert not is_binary_type(str)
+
+
+def test_bytes_response(api):
+    '''Should stream bytes and memoryviews as application/octet-stream with Range support
+    '''
+    @api.route('/bytes')
+    def _() -> bytes:
+        return b'0123456789'
+
+    @api.route('/memoryview')
+    def _memoryview() -> memoryview:
+        return memoryview(bytearray(b'0123456789'))[2:]
+
+    @api.route('/png')
+    def _png() -> bytes:
+        return b'\x89PNG', 201, {'Content-Type': 'image/png'}
+    with api.flask_app.test_client() as client:
+        response = client.get('/bytes')
+        range_response = client.get('/bytes', headers={'Range': 'bytes=2-4'})
+        memoryview_response = client.get('/memoryview', headers={'Range': 'bytes=-3'})
+        png_response = client.get('/png')
+    assert response.data == b'0123456789'
+    assert response.content_type == 'application/octet-stream'
+    assert response.headers['Accept-Ranges'] == 'bytes'
+    assert range_response.status_code == 206
+    assert range_response.data == b'234'
+    assert range_response.headers['Content-Range'] == 'bytes 2-4/10'
+    assert memoryview_response.data == b'789'
+    assert png_response.status_code == 201
+    assert png_response.content_type == 'image/png'
+    assert png_response.data == b'\x89PNG'
+
+
+def test_file_response(api, tmp_path):
+    '''Should send paths and file objects without reading them into memory, supporting Range requests
+    '''
+    report = tmp_path / 'report.csv'
+    report.write_bytes(b'a,b\n1,2\n')
+
+    @api.route('/path')
+    def _() -> Path:
+        return report
+
+    @api.route('/file')
+    def _file() -> BinaryIO:
+        return open(report, 'rb')
+
+    @api.route('/missing')
+    def _missing() -> Path:
+        return tmp_path / 'missing.csv'
+    with api.flask_app.test_client() as client:
+        path_response = client.get('/path')
+        range_response = client.get('/path', headers={'Range': 'bytes=4-'})
+        file_response = client.get('/file', headers={'Range': 'bytes=0-2'})
+        missing_response = client.get('/missing')
+        openapi = client.get('/openapi.json').get_json()
+    assert path_response.data == b'a,b\n1,2\n'
+    assert path_response.content_type.startswith('text/csv')
+    assert range_response.status_code == 206
+    assert range_response.data == b'1,2\n'
+    assert file_response.status_code == 206
+    assert file_response.data == b'a,b'
+    file_response.close()
+    assert missing_response.status_code == 404
+    assert openapi['paths']['/file']['get']['responses']['200']['content'] == {
+        'application/octet-stream': {'schema': {'type': 'string', 'format': 'binary'}}
+    }
@@ -0,0 +1,85 @@
+import time
+
+from flask_hintful import SqliteResponseCache
+from flask_hintful.cache import CachedResponse
+
+
+def test_cached_route(api, tmp_path):
+    '''Should serve GET responses from the cache keyed on deserialized args
+    '''
+    cache = SqliteResponseCache(str(tmp_path / 'cache.db'))
+    calls = []
+
+    @api.route('/cached/<id>', cache=cache)
+    def _(id: int, flag: bool = False) -> dict:
+        calls.append(id)
+        return {'id': id, 'flag': flag}
+    with api.flask_app.test_client() as client:
+        responses = [
+            client.get('/cached/1?flag=true'),
+            client.get('/cached/1?flag=1'),
+            client.get('/cached/2'),
+        ]
+        msgpack_response = client.get('/cached/1?flag=true', headers={'Accept': 'application/msgpack'})
+    assert calls == [1, 2, 1]
+    assert responses[0].get_json() == responses[1].get_json() == {'id': 1, 'flag': True}
+    assert responses[1].content_type == 'application/json'
+    assert msgpack_response.content_type == 'application/msgpack'
+
+
+def test_cache_shared_between_instances(tmp_path):
+    '''Should share entries between caches opened on the same file, e.g by different workers
+    '''
+    path = str(tmp_path / 'cache.db')
+    response = CachedResponse(b'body', 200, [('Content-Type', 'application/json')])
+    SqliteResponseCache(path).set('key', response)
+    assert SqliteResponseCache(path).get('key') == response
+
+
+def test_cache_ttl_and_eviction(tmp_path):
+    '''Should expire entries after their ttl and evict entries closest to expiring when full
+    '''
+    cache = SqliteResponseCache(str(tmp_path / 'cache.db'), max_size=10)
+    cache.set('expired', CachedResponse(b'1', 200, []), ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get('expired') is None
+    cache.set('first', CachedResponse(b'12345', 200, []), ttl=10)
+    cache.set('second', CachedResponse(b'12345', 200, []), ttl=20)
+    cache.set('third', CachedResponse(b'12345', 200, []), ttl=30)
+    cache.set('too_large', CachedResponse(b'12345678901', 200, []))
+    assert cache.get('first') is None
+    assert cache.get('second') is not None
+    assert cache.get('third') is not None
+    assert cache.get('too_large') is None
+
+
+def test_cache_size_total(tmp_path):
+    '''Should keep the total size of cached bodies up to date on insert, replace, eviction and clear
+    '''
+    cache = SqliteResponseCache(str(tmp_path / 'cache.db'), max_size=10)
+
+    def total():
+        return cache.get_connection().execute('SELECT total FROM responses_size').fetchone()[0]
+    cache.set('key', CachedResponse(b'12345', 200, []), ttl=10)
+    cache.set('key', CachedResponse(b'123', 200, []), ttl=10)
+    assert total() == 3
+    cache.set('other', CachedResponse(b'12345678', 200, []), ttl=20)
+    assert cache.get('key') is None
+    assert total() == 8
+    cache.clear()
+    assert total() == 0
+
+
+def test_cached_response_roundtrip(api):
+    '''Should copy a response without its Content-Length and rebuild it with the app's response_class
+    '''
+    with api.flask_app.test_request_context():
+        response = api.flask_app.response_class(b'body', 201, {'X-Test': '1'})
+        cached = CachedResponse.from_response(response)
+        rebuilt = cached.to_response()
+    assert cached == CachedResponse(
+        b'body', 201, [('X-Test', '1'), ('Content-Type', 'text/html; charset=utf-8')]
+    )
+    assert isinstance(rebuilt, api.flask_app.response_class)
+    assert (rebuilt.data, rebuilt.status_code, rebuilt.headers['X-Test']) == (b'body', 201, '1')
+    assert rebuilt.content_length == 4
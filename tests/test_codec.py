@@ -0,0 +1,59 @@
+import pytest
+from flask_hintful.codec import JsonCodec, MsgPackCodec
+
+
+def test_json_codec():
+    '''Should be able to encode and decode JSON
+    '''
+    codec = JsonCodec()
+    assert codec.loads(codec.dumps({'foo': ['bar', 1, 1.5, None]})) == {'foo': ['bar', 1, 1.5, None]}
+
+
+def test_msgpack_codec():
+    '''Should be able to encode and decode all MessagePack formats
+    '''
+    codec = MsgPackCodec()
+    values = [
+        None, True, False, 0, 127, 128, -1, -32, -33, -200, 70000, -70000, 2 ** 40, -2 ** 40,
+        2 ** 64 - 1, 1.5, '', 'short', 'x' * 40, 'é' * 70000, b'bytes', [1, [2, 'three']],
+        list(range(20)),
+        {'foo': {'bar': [1, 2.5]}}, {str(i): i for i in range(20)}
+    ]
+    for value in values:
+        assert codec.loads(codec.dumps(value)) == value
+
+
+def test_msgpack_codec_format():
+    '''Should produce standard MessagePack bytes
+    '''
+    assert MsgPackCodec().dumps({'a': 1}) == b'\x81\xa1a\x01'
+    assert MsgPackCodec().dumps([1.0]) == b'\x91\xcb?\xf0\x00\x00\x00\x00\x00\x00'
+
+
+def test_msgpack_codec_default():
+    '''Should use default to encode unknown types
+    '''
+    encoded = MsgPackCodec().dumps({'foo': object()}, default=lambda o: 'obj')
+    assert MsgPackCodec().loads(encoded) == {'foo': 'obj'}
+    with pytest.raises(TypeError):
+        MsgPackCodec().dumps(object())
+
+
+def test_msgpack_codec_invalid_data():
+    '''Should raise ValueError on truncated or unknown data
+    '''
+    with pytest.raises(ValueError):
+        MsgPackCodec().loads(b'\x92\x01')
+    with pytest.raises(ValueError):
+        MsgPackCodec().loads(b'\xc1')
+    with pytest.raises(ValueError):
+        MsgPackCodec().loads(b'\x01\x02')
+
+
+def test_msgpack_codec_unsafe_data():
+    '''Should raise ValueError on deeply nested data and unhashable map keys
+    '''
+    with pytest.raises(ValueError):
+        MsgPackCodec().loads(b'\x91' * 5000 + b'\xc0')
+    with pytest.raises(ValueError):
+        MsgPackCodec().loads(b'\x81\x91\x01\x01')
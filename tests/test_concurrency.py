@@ -0,0 +1,45 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from flask_hintful import Paginated
+
+
+def test_shared_list_concurrent_requests(api, dataclass_type, marshmallow_type, model_dict):
+    '''Should serialize shared return values from many threads without modifying them
+    '''
+    dataclasses = [dataclass_type(**{**model_dict, 'int_field': i}) for i in range(50)]
+    marshmallows = [marshmallow_type.__marshmallow__().load(model_dict) for _ in range(50)]
+    shared = dataclasses + marshmallows
+
+    @api.route('/shared')
+    def _() -> List[dataclass_type]:
+        return shared
+
+    @api.route('/shared_fields')
+    def __() -> List[dataclass_type]:
+        return shared
+
+    @api.route('/shared_paginated')
+    def ___() -> Paginated[dataclass_type]:
+        return shared
+
+    def hammer(_):
+        bodies = set()
+        with api.flask_app.test_client() as client:
+            for _ in range(10):
+                bodies.add(client.get('/shared').get_data())
+                bodies.add(client.get('/shared_fields?fields=int_field').get_data())
+                bodies.add(client.get('/shared_paginated?limit=5&offset=45').get_data())
+        return bodies
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(hammer, range(8)))
+
+    assert all(bodies == results[0] for bodies in results)
+    assert len(results[0]) == 3
+    assert shared == dataclasses + marshmallows
+    assert all(isinstance(item, dataclass_type) for item in shared[:50])
+    assert all(isinstance(item, marshmallow_type) for item in shared[50:])
+    full = next(json.loads(body) for body in results[0] if body.startswith(b'['))
+    assert [item['int_field'] for item in full[:50]] == list(range(50))
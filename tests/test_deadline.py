@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+from flask_hintful import Deadline, get_deadline
+
+
+def test_deadline():
+    '''Should track the remaining budget and format it as a header
+    '''
+    deadline = Deadline(10)
+    assert 9 < deadline.remaining() <= 10
+    assert not deadline.expired
+    assert float(deadline.headers()['X-Request-Timeout']) <= 10
+    assert Deadline(0).expired
+    assert Deadline(-1).remaining() == 0
+
+
+def test_route_timeout(api):
+    '''Should return 504 instead of serializing responses once the route timeout passed
+    '''
+    serialized = []
+
+    class Model():
+        pass
+
+    api.serializer.add_serializer(Model, lambda _: serialized.append(True) or 'model')
+
+    @api.route('/slow', timeout=0.05)
+    def _() -> Model:
+        time.sleep(0.1)
+        return Model()
+
+    @api.route('/fast', timeout=5)
+    def _fast() -> float:
+        return get_deadline().remaining()
+
+    with api.flask_app.test_client() as client:
+        slow = client.get('/slow')
+        fast = client.get('/fast')
+    assert slow.status_code == 504
+    assert serialized == []
+    assert fast.status_code == 200
+    assert 4 < float(fast.data) <= 5
+
+
+def test_request_timeout_header(api):
+    '''Should use the shorter of the route timeout and the X-Request-Timeout header
+    '''
+    @api.route('/budget')
+    def _() -> str:
+        deadline = get_deadline()
+        return str(deadline.timeout) if deadline is not None else 'none'
+
+    api.flask_app.config['FLASK_HINTFUL_REQUEST_TIMEOUT'] = 2
+    with api.flask_app.test_client() as client:
+        assert client.get('/budget').data == b'2'
+        assert client.get('/budget', headers={'X-Request-Timeout': '0.5'}).data == b'0.5'
+        assert client.get('/budget', headers={'X-Request-Timeout': '30'}).data == b'2'
+        assert client.get('/budget', headers={'X-Request-Timeout': 'soon'}).status_code == 400
+
+
+def test_invalid_request_timeout_header(api):
+    '''Should reject X-Request-Timeout values that aren't finite and greater than 0 with 400
+    '''
+    @api.route('/budget')
+    def _() -> str:
+        return str(get_deadline().timeout)
+
+    with api.flask_app.test_client() as client:
+        for value in ('0', '-1', 'nan', 'inf', '-inf'):
+            assert client.get('/budget', headers={'X-Request-Timeout': value}).status_code == 400, value
+        assert client.get('/budget', headers={'X-Request-Timeout': '1e-3'}).data == b'0.001'
+
+
+def test_async_view_cancelled(api):
+    '''Should run async view funcs and cancel them when the deadline passes
+    '''
+    cancelled = []
+
+    @api.route('/async')
+    async def _(delay: float) -> str:
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return 'done'
+
+    with api.flask_app.test_client() as client:
+        done = client.get('/async?delay=0', headers={'X-Request-Timeout': '1'})
+        timed_out = client.get('/async?delay=1', headers={'X-Request-Timeout': '0.05'})
+    assert done.data == b'done'
+    assert timed_out.status_code == 504
+    assert cancelled == [True]
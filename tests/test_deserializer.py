@@ -1,12 +1,19 @@
 import json
+from dataclasses import dataclass
 from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum, IntEnum
+from typing import List, Optional, Set, Union
 from unittest.mock import Mock
+from uuid import UUID
 
 import pytest
 from dateutil.tz import tzoffset
+from flask_hintful.codec import MsgPackCodec
 from flask_hintful.deserializer import (FALSE_STRS, TRUE_STRS, Deserializer,
                                         str_to_bool)
 from flask_hintful.utils import get_func_sig
+from flask_hintful.validation import ValidationError
 from werkzeug.datastructures import MultiDict
 
 from .conftest import NestedModel
@@ -95,3 +102,256 @@ def test_str_to_bool():
         assert str_to_bool(true_str)
     with pytest.raises(ValueError):
         str_to_bool('invalid_str')
+
+
+def test_deserialize_body_msgpack(api, dataclass_type, model_dict):
+    '''Should decode request bodies with the codec matching the Content-Type
+    '''
+    @api.route('/msgpack', methods=['POST'])
+    def _(model: dataclass_type) -> dataclass_type:
+        assert model.nested_field == NestedModel(**model_dict['nested_field'])
+        return model
+    with api.flask_app.test_client() as client:
+        response = client.post('/msgpack', data=MsgPackCodec().dumps(model_dict),
+                               headers={'Content-Type': 'application/msgpack'})
+        invalid_response = client.post('/msgpack', data=b'\xc1',
+                                       headers={'Content-Type': 'application/msgpack'})
+    assert response.get_json() == model_dict
+    assert invalid_response.status_code == 400
+
+
+def test_deserialize_body_msgpack_bin(api):
+    '''Should pass MessagePack bin values to bytes fields and reject nested or unhashable data with 400
+    '''
+    @dataclass
+    class Blob():
+        content: bytes
+
+    @api.route('/blob', methods=['POST'])
+    def _(blob: Blob) -> int:
+        return len(blob.content)
+
+    headers = {'Content-Type': 'application/msgpack'}
+    with api.flask_app.test_client() as client:
+        response = client.post(
+            '/blob', data=MsgPackCodec().dumps({'content': b'\x00\xff'}), headers=headers
+        )
+        nested_response = client.post('/blob', data=b'\x91' * 5000 + b'\xc0', headers=headers)
+        key_response = client.post('/blob', data=b'\x81\x91\x01\x01', headers=headers)
+    assert response.data == b'2'
+    assert nested_response.status_code == 400
+    assert key_response.status_code == 400
+
+
+class Color(Enum):
+    RED = 'red'
+
+
+class Level(IntEnum):
+    LOW = 1
+
+
+def test_deserialize_extra_types():
+    '''Should be able to deserialize Decimal, UUID, Enum, bytes and sets
+    '''
+    @dataclass
+    class Extra():
+        price: Decimal
+        id: UUID
+        color: Color
+        data: bytes
+        tags: Set[str]
+        levels: List[Level]
+
+    deserializer = Deserializer()
+    uuid = UUID('12345678-1234-5678-1234-567812345678')
+    assert deserializer.deserialize(1.1, Decimal) == Decimal('1.1')
+    assert deserializer.deserialize(str(uuid), UUID) == uuid
+    assert deserializer.deserialize('RED', Color) == Color.RED
+    assert deserializer.deserialize(['1'], Level) == Level.LOW
+    assert deserializer.deserialize('_wA', bytes) == b'\xff\x00'
+    assert deserializer.deserialize(['1', '2'], List[int]) == [1, 2]
+    assert deserializer.deserialize(['1'], Optional[int]) == 1
+    assert deserializer.deserialize(None, Optional[int]) is None
+    with pytest.raises(ValueError):
+        deserializer.deserialize('BLUE', Color)
+    extra = deserializer.deserialize({
+        'price': '1.10', 'id': str(uuid), 'color': 'red', 'data': '/wA=', 'tags': ['a', 'a'],
+        'levels': [1]
+    }, Extra)
+    assert extra == Extra(Decimal('1.10'), uuid, Color.RED, b'\xff\x00', {'a'}, [Level.LOW])
+
+
+def test_deserialize_extra_types_args(api):
+    '''Should be able to deserialize Enum, Decimal and typed lists from query args
+    '''
+    @api.route('/extra')
+    def _(color: Color, price: Decimal, levels: List[Level]) -> dict:
+        return {'color': color, 'price': price, 'levels': levels}
+    with api.flask_app.test_client() as client:
+        response = client.get('/extra?color=red&price=1.50&levels=1&levels=LOW')
+    assert response.get_json() == {'color': 'red', 'price': '1.50', 'levels': [1, 1]}
+
+
+def test_deserialize_invalid_extra_types_args(api):
+    '''Should respond with 400 to query args that aren't a valid UUID, Decimal or Enum
+    '''
+    @api.route('/invalid')
+    def _(id: UUID = None, price: Decimal = None, color: Color = None) -> dict:
+        return {'id': id, 'price': price, 'color': color}
+    with api.flask_app.test_client() as client:
+        for query in ('id=bad', 'price=bad', 'color=BLUE'):
+            response = client.get(f'/invalid?{query}')
+            assert response.status_code == 400, query
+        response = client.get('/invalid?id=12345678-1234-5678-1234-567812345678&price=1.5&color=red')
+    assert response.get_json() == {
+        'id': '12345678-1234-5678-1234-567812345678', 'price': '1.5', 'color': 'red'
+    }
+
+
+@dataclass
+class ValidatedItem():
+    id: int
+    color: Color
+    tags: List[str]
+    note: Optional[str] = None
+
+
+@dataclass
+class ValidatedOrder():
+    name: str
+    items: List[ValidatedItem]
+    parent: Optional['ValidatedOrder'] = None
+
+
+def test_validate_dataclass():
+    '''Should list every structural error of a dataclass body in a single pass
+    '''
+    deserializer = Deserializer()
+    with pytest.raises(ValidationError) as err:
+        deserializer.deserialize({
+            'name': 1,
+            'items': [
+                {'id': 1, 'color': 'red', 'tags': []},
+                {'id': '2', 'color': 'blue', 'tags': 'a', 'extra': 1}
+            ],
+            'parent': {'items': True}
+        }, ValidatedOrder)
+    assert err.value.errors == [
+        {'path': 'name', 'message': 'expected str'},
+        {'path': 'items[1].extra', 'message': 'unknown field'},
+        {'path': 'items[1].id', 'message': 'expected int'},
+        {'path': 'items[1].color', 'message': 'expected one of red'},
+        {'path': 'items[1].tags', 'message': 'expected list'},
+        {'path': 'parent.name', 'message': 'missing required field'},
+        {'path': 'parent.items', 'message': 'expected list'},
+    ]
+    order = deserializer.deserialize(
+        {'name': 'order', 'items': [{'id': 1, 'color': 'RED', 'tags': ['a'], 'note': None}]},
+        ValidatedOrder
+    )
+    assert order.items == [ValidatedItem(1, Color.RED, ['a'])]
+
+
+def test_validate_dataclass_route(api):
+    '''Should reject invalid dataclass bodies with a structured 400 before constructing them
+    '''
+    @api.route('/orders', methods=['POST'])
+    def _(order: ValidatedOrder) -> str:
+        return order.name
+
+    with api.flask_app.test_client() as client:
+        response = client.post('/orders', json={'name': 'order', 'items': [{'id': 1}]})
+        valid_response = client.post('/orders', json={'name': 'order', 'items': []})
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == [
+        {'path': 'items[0].color', 'message': 'missing required field'},
+        {'path': 'items[0].tags', 'message': 'missing required field'},
+    ]
+    assert valid_response.data == b'order'
+
+
+@dataclass
+class ValidatedScalars():
+    id: UUID
+    price: Decimal
+    day: date
+    at: datetime
+
+
+def test_validate_scalar_deserializers(api):
+    '''Should list values its registered deserializer can't parse as errors instead of failing with 500
+    '''
+    with pytest.raises(ValidationError) as err:
+        api.deserializer.validate(
+            {'id': 'bad', 'price': 'bad', 'day': '2019-13-45', 'at': 1}, ValidatedScalars
+        )
+    assert err.value.errors == [
+        {'path': 'id', 'message': 'expected UUID'},
+        {'path': 'price', 'message': 'expected Decimal'},
+        {'path': 'day', 'message': 'expected date'},
+        {'path': 'at', 'message': 'expected datetime'},
+    ]
+
+    @api.route('/scalars', methods=['POST'])
+    def _(scalars: ValidatedScalars) -> str:
+        return scalars.day.isoformat()
+
+    with api.flask_app.test_client() as client:
+        response = client.post(
+            '/scalars', json={'id': 1, 'price': 1, 'day': 1, 'at': '2019-07-06T05:04:03'}
+        )
+        valid_response = client.post('/scalars', json={
+            'id': '12345678-1234-5678-1234-567812345678', 'price': 1, 'day': '2019-09-08',
+            'at': '2019-07-06'
+        })
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == [
+        {'path': 'id', 'message': 'expected UUID'},
+        {'path': 'day', 'message': 'expected date'},
+    ]
+    assert valid_response.data == b'2019-09-08'
+
+
+@dataclass
+class ValidatedChoice():
+    value: Union[int, ValidatedItem]
+    label: Optional[Union[int, str]] = None
+
+
+def test_validate_union_and_nested_deserializers(api):
+    '''Should validate Union members and dataclasses deserialized by registered deserializers
+    '''
+    class Wrapper():
+        def __init__(self, item):
+            self.item = item
+
+    @dataclass
+    class Wrapped():
+        wrapper: Wrapper
+
+    api.deserializer.add_deserializer(
+        Wrapper, lambda data: Wrapper(api.deserializer.deserialize(data, ValidatedItem))
+    )
+    with pytest.raises(ValidationError) as err:
+        api.deserializer.validate({'value': [1], 'label': 1.5}, ValidatedChoice)
+    assert err.value.errors == [
+        {'path': 'value', 'message': 'expected int or ValidatedItem'},
+        {'path': 'label', 'message': 'expected int or str'},
+    ]
+    api.deserializer.validate(
+        {'value': {'id': 1, 'color': 'red', 'tags': []}, 'label': None}, ValidatedChoice
+    )
+
+    @api.route('/wrapped', methods=['POST'])
+    def _(wrapped: Wrapped) -> int:
+        return wrapped.wrapper.item.id
+
+    with api.flask_app.test_client() as client:
+        response = client.post('/wrapped', json={'wrapper': '{"id": 1, "color": "red", "tags": []}'})
+        invalid_response = client.post(
+            '/wrapped', json={'wrapper': '{"id": 1, "color": "red", "tags": [], "x": 1}'}
+        )
+    assert response.data == b'1'
+    assert invalid_response.status_code == 400
+    assert invalid_response.get_json()['errors'] == [{'path': 'wrapper.x', 'message': 'unknown field'}]
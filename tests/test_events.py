@@ -0,0 +1,89 @@
+import time
+
+from flask_hintful import EventStream, ServerSentEvent
+from flask_hintful.events import HEARTBEAT, format_event, iter_with_heartbeats
+
+
+def test_format_event():
+    '''Should format fields and send multiline data in one data field per line
+    '''
+    assert format_event('{"a": 1}') == b'data: {"a": 1}\n\n'
+    assert format_event('a\nb', event='update', id='7', retry=1000) == \
+        b'event: update\nid: 7\nretry: 1000\ndata: a\ndata: b\n\n'
+
+
+def test_event_stream_route(api, dataclass_type, model_dict):
+    '''Should stream each yielded item as a JSON text/event-stream frame
+    '''
+    @api.route('/events')
+    def _(str_field: str) -> EventStream[dataclass_type]:
+        for i in range(3):
+            yield dataclass_type(**{**model_dict, 'int_field': i, 'str_field': str_field})
+        yield ServerSentEvent({'done': True}, event='end', id='3')
+
+    with api.flask_app.test_client() as client:
+        response = client.get('/events?str_field=foo&fields=int_field,str_field')
+        frames = response.get_data(as_text=True).split('\n\n')
+
+    assert response.mimetype == 'text/event-stream'
+    assert response.headers['Cache-Control'] == 'no-cache'
+    assert frames[:3] == [f'data: {{"int_field": {i}, "str_field": "foo"}}' for i in range(3)]
+    assert frames[3] == 'event: end\nid: 3\ndata: {"done": true}'
+
+
+def test_event_stream_heartbeats(api):
+    '''Should send heartbeat comments while the view func doesn't produce items
+    '''
+    @api.route('/slow')
+    def _() -> EventStream[int]:
+        time.sleep(0.25)
+        yield 1
+        return
+
+    @api.route('/tuple')
+    def _tuple() -> EventStream[int]:
+        return EventStream([1, 2], heartbeat=0), 200, {'X-Stream': 'true'}
+
+    api.flask_app.config['FLASK_HINTFUL_SSE_HEARTBEAT'] = 0.05
+    with api.flask_app.test_client() as client:
+        slow = client.get('/slow').get_data(as_text=True)
+        tuple_response = client.get('/tuple')
+
+    assert slow.startswith(': heartbeat\n\n')
+    assert slow.endswith('data: 1\n\n')
+    assert tuple_response.get_data() == b'data: 1\n\ndata: 2\n\n'
+    assert tuple_response.headers['X-Stream'] == 'true'
+    assert tuple_response.mimetype == 'text/event-stream'
+
+
+def test_iter_with_heartbeats_close():
+    '''Should stop iterating and close items once closed
+    '''
+    closed = []
+
+    def items():
+        try:
+            while True:
+                yield 1
+        finally:
+            closed.append(True)
+
+    iterator = iter_with_heartbeats(items(), 0.05)
+    assert next(iterator) == 1
+    iterator.close()
+    time.sleep(0.2)
+    assert closed == [True]
+    assert HEARTBEAT not in list(iter_with_heartbeats(iter([1, 2]), 1))
+
+
+def test_event_stream_openapi(api, dataclass_type):
+    '''Should document EventStream routes as text/event-stream of the item schema
+    '''
+    @api.route('/events')
+    def _() -> EventStream[dataclass_type]:
+        pass
+
+    with api.flask_app.test_client() as client:
+        response = client.get('/openapi.json').get_json()['paths']['/events']['get']['responses']['200']
+    assert list(response['content']) == ['text/event-stream']
+    assert response['content']['text/event-stream']['schema']['$ref'].endswith('DataclassModel')
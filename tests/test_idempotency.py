@@ -0,0 +1,74 @@
+import threading
+import time
+
+from werkzeug.exceptions import InternalServerError
+
+
+def test_idempotent_replay(api, dataclass_type, model_dict):
+    '''Should replay the stored response for retries with the same Idempotency-Key
+    '''
+    calls = []
+
+    @api.route('/orders', methods=['POST'], idempotent=True)
+    def _(order: dataclass_type) -> dict:
+        calls.append(order)
+        return {'id': len(calls)}, 201
+    with api.flask_app.test_client() as client:
+        first = client.post('/orders', json=model_dict, headers={'Idempotency-Key': 'a'})
+        retry = client.post('/orders', json=model_dict, headers={'Idempotency-Key': 'a'})
+        other_key = client.post('/orders', json=model_dict, headers={'Idempotency-Key': 'b'})
+        no_key = client.post('/orders', json=model_dict)
+        reused_key = client.post(
+            '/orders', json={**model_dict, 'int_field': 2}, headers={'Idempotency-Key': 'a'}
+        )
+    assert len(calls) == 3
+    assert first.status_code == retry.status_code == 201
+    assert first.get_json() == retry.get_json() == {'id': 1}
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert 'Idempotent-Replayed' not in first.headers
+    assert other_key.get_json() == {'id': 2}
+    assert no_key.get_json() == {'id': 3}
+    assert reused_key.status_code == 422
+
+
+def test_idempotent_coalesce(api):
+    '''Should wait for an in flight request with the same Idempotency-Key instead of running it again
+    '''
+    calls = []
+
+    @api.route('/slow', methods=['POST'], idempotent=True)
+    def _() -> dict:
+        calls.append(1)
+        time.sleep(0.2)
+        return {'calls': len(calls)}
+
+    responses = []
+
+    def post():
+        with api.flask_app.test_client() as client:
+            responses.append(client.post('/slow', headers={'Idempotency-Key': 'key'}).get_json())
+    threads = [threading.Thread(target=post) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert calls == [1]
+    assert responses == [{'calls': 1}] * 4
+
+
+def test_idempotent_failure_not_stored(api):
+    '''Should run the view again for retries of requests that failed
+    '''
+    calls = []
+
+    @api.route('/flaky', methods=['POST'], idempotent=True)
+    def _() -> dict:
+        calls.append(1)
+        if len(calls) == 1:
+            raise InternalServerError()
+        return {'calls': len(calls)}
+    with api.flask_app.test_client() as client:
+        failed = client.post('/flaky', headers={'Idempotency-Key': 'key'})
+        retry = client.post('/flaky', headers={'Idempotency-Key': 'key'})
+    assert failed.status_code == 500
+    assert retry.get_json() == {'calls': 2}
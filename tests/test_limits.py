@@ -0,0 +1,62 @@
+import threading
+import time
+
+from flask_hintful.limits import ConcurrencyLimiter
+
+
+def test_concurrency_limiter():
+    '''Should admit up to max_concurrency, queue up to max_queue and shed the rest
+    '''
+    limiter = ConcurrencyLimiter(1, max_queue=1, queue_timeout=0.01)
+    assert limiter.acquire()
+    assert not limiter.acquire()
+    limiter.release()
+    assert limiter.acquire()
+    limiter.release()
+    assert limiter.snapshot() == {'in_flight': 0, 'waiting': 0, 'admitted': 2, 'shed': 1}
+
+
+def test_concurrency_limiter_timeout():
+    '''Should wait in the queue for at most the shorter of timeout and queue_timeout
+    '''
+    limiter = ConcurrencyLimiter(1, max_queue=1, queue_timeout=5)
+    assert limiter.acquire()
+    start = time.monotonic()
+    assert not limiter.acquire(0.01)
+    assert time.monotonic() - start < 1
+
+
+def test_route_max_concurrency(api):
+    '''Should reject requests over max_concurrency and a full queue with 503 and Retry-After
+    '''
+    started = threading.Event()
+    release = threading.Event()
+
+    @api.route('/report', max_concurrency=1, retry_after=5)
+    def _() -> str:
+        started.set()
+        release.wait(5)
+        return 'report'
+
+    @api.route('/health')
+    def _health() -> str:
+        return 'ok'
+    responses = []
+
+    def get_report():
+        with api.flask_app.test_client() as client:
+            responses.append(client.get('/report'))
+    thread = threading.Thread(target=get_report)
+    thread.start()
+    started.wait(5)
+    with api.flask_app.test_client() as client:
+        shed_response = client.get('/report')
+        health_response = client.get('/health')
+    release.set()
+    thread.join()
+    assert shed_response.status_code == 503
+    assert shed_response.headers['Retry-After'] == '5'
+    assert health_response.status_code == 200
+    assert responses[0].get_data(as_text=True) == 'report'
+    assert api.get_concurrency_stats() == {'_': {'in_flight': 0, 'waiting': 0, 'admitted': 1, 'shed': 1}}
+    assert 'flask_hintful_requests_shed_total{endpoint="_"} 1' in api.export_stats()
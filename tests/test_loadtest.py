@@ -0,0 +1,30 @@
+from flask_hintful.loadtest import (create_flask_app, create_hintful_app,
+                                    format_results, get_sample_requests,
+                                    percentile, run_load_test)
+
+
+def test_percentile():
+    '''Should compute nearest-rank percentiles
+    '''
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([], 50) == 0.0
+
+
+def test_run_load_test():
+    '''Should serve sample routes with and without FlaskHintful and measure them under concurrent clients
+    '''
+    results = [
+        run_load_test(
+            create_app(), get_sample_requests(), clients=4, requests_per_client=6, warmup=3, name=name
+        )
+        for name, create_app in (('flask', create_flask_app), ('hintful', create_hintful_app))
+    ]
+    for result in results:
+        assert result.requests == 24
+        assert result.errors == 0
+        assert 0 < result.p50 <= result.p95 <= result.p99
+        assert result.throughput > 0
+    assert 'hintful' in format_results(results)
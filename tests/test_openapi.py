@@ -1,3 +1,6 @@
+import gzip
+import json
+
 from flask import Blueprint, Flask
 from flask_hintful import FlaskHintful
 from flask_hintful.openapi import OpenApiProvider
@@ -108,3 +111,148 @@ def test_openapi_security():
     assert openapi.openapi_security.basic_auth is not None
     assert openapi.openapi_security.bearer_auth is not None
     assert openapi.openapi_security.api_key_auth is not None
+
+
+def test_openapi_export(api, tmp_path):
+    '''Should export the OpenApi spec and its gzip variant using the cli
+    '''
+    @api.route('/route/<id>')
+    def api_route(id: str) -> str:
+        pass
+    output = str(tmp_path / 'openapi.json')
+    result = api.flask_app.test_cli_runner().invoke(
+        args=['hintful', 'export-openapi', '--output', output]
+    )
+    assert result.exit_code == 0
+    with open(output) as openapi_file:
+        openapi_json = json.load(openapi_file)
+    with gzip.open(f'{output}.gz') as openapi_file:
+        assert json.load(openapi_file) == openapi_json
+    assert '/route/{id}' in openapi_json['paths']
+
+
+def test_openapi_json_file(api, tmp_path):
+    '''Should serve a pre-built OpenApi spec file when configured
+    '''
+    output = str(tmp_path / 'openapi.json')
+    with api.flask_app.app_context():
+        api.openapi_provider.export_openapi_spec(output)
+    api.flask_app.config['FLASK_HINTFUL_OPENAPI_JSON_FILE'] = output
+
+    @api.route('/not_exported')
+    def _() -> str:
+        pass
+    with api.flask_app.test_client() as client:
+        response = client.get('/openapi.json')
+        gzip_response = client.get('/openapi.json', headers={'Accept-Encoding': 'gzip'})
+        refused_response = client.get('/openapi.json', headers={'Accept-Encoding': 'gzip;q=0, identity'})
+    assert '/not_exported' not in response.get_json()['paths']
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert gzip_response.headers['Content-Encoding'] == 'gzip'
+    assert gzip_response.headers['Vary'] == 'Accept-Encoding'
+    assert 'Content-Encoding' not in refused_response.headers
+    assert json.loads(gzip.decompress(gzip_response.get_data())) == response.get_json()
+
+
+def test_openapi_shards(dataclass_type):
+    '''Should serve a cached OpenApi specification per Blueprint and openapi_tag with only their paths
+    '''
+    app = Flask(__name__)
+    api = FlaskHintful(app)
+    bp = Blueprint('billing', __name__, url_prefix='/billing')
+
+    @bp.route('/invoices/<id>')
+    def get_invoice(id: str) -> dataclass_type:
+        pass
+
+    @bp.route('/health', openapi_tag='ops')
+    def billing_health() -> str:
+        pass
+
+    @api.route('/users', openapi_tag='users')
+    def get_users() -> str:
+        pass
+
+    api.register_blueprint(bp)
+
+    with app.test_client() as client:
+        billing = client.get('/openapi/billing.json')
+        revalidated = client.get(
+            '/openapi/billing.json', headers={'If-None-Match': billing.headers['ETag']}
+        )
+        ops = client.get('/openapi/ops.json').get_json()
+        full = client.get('/openapi.json').get_json()
+        missing = client.get('/openapi/missing.json')
+
+    assert list(billing.get_json()['paths']) == ['/billing/invoices/{id}']
+    assert 'DataclassModel' in str(billing.get_json()['components'])
+    assert revalidated.status_code == 304
+    assert list(ops['paths']) == ['/billing/health']
+    assert 'components' not in ops or 'DataclassModel' not in str(ops['components'])
+    assert full['paths']['/billing/invoices/{id}']['get']['tags'] == ['billing']
+    assert full['paths']['/users']['get']['tags'] == ['users']
+    assert missing.status_code == 404
+    assert set(api.openapi_provider.openapi_shard_dicts) == {'billing', 'ops'}
+
+
+def test_openapi_shards_json_file(api, tmp_path):
+    '''Should export the OpenApi spec of each shard and serve it when a pre-built file is configured
+    '''
+    @api.route('/users', openapi_tag='users')
+    def get_users() -> str:
+        pass
+    api.warmup(freeze=False)
+    assert set(api.openapi_provider.openapi_shard_dicts) == {'users'}
+
+    output = str(tmp_path / 'openapi.json')
+    result = api.flask_app.test_cli_runner().invoke(
+        args=['hintful', 'export-openapi', '--output', output]
+    )
+    assert result.exit_code == 0
+    shard_output = str(tmp_path / 'openapi.users.json')
+    assert shard_output in result.output
+    api.flask_app.config['FLASK_HINTFUL_OPENAPI_JSON_FILE'] = output
+    with open(shard_output) as openapi_file:
+        shard_json = json.load(openapi_file)
+    with api.flask_app.test_client() as client:
+        response = client.get('/openapi/users.json')
+        gzip_response = client.get('/openapi/users.json', headers={'Accept-Encoding': 'gzip'})
+        missing = client.get('/openapi/missing.json')
+    assert response.get_json() == shard_json
+    assert gzip_response.headers['Content-Encoding'] == 'gzip'
+    assert missing.status_code == 404
+
+
+def test_openapi_binary_keeps_specgen_types():
+    '''Should document bytes as a binary string without registering bytes in openapi_specgen's type maps
+    '''
+    from openapi_specgen.schema import OPENAPI_FORMAT_MAP, OPENAPI_TYPE_MAP
+
+    app = Flask(__name__)
+    api = FlaskHintful(app)
+
+    @api.route('/upload', methods=['POST'])
+    def upload(data: bytes) -> str:
+        pass
+    with app.test_client() as client:
+        openapi_json = client.get('/openapi.json').get_json()
+    assert bytes not in OPENAPI_TYPE_MAP
+    assert bytes not in OPENAPI_FORMAT_MAP
+    assert 'OpenApiBinary' not in json.dumps(openapi_json)
+    assert '"format": "binary"' in json.dumps(openapi_json)
+
+
+def test_openapi_export_relative_path(api, tmp_path):
+    '''Should resolve a relative export path against the app root path, like the served file
+    '''
+    api.flask_app.root_path = str(tmp_path)
+    result = api.flask_app.test_cli_runner().invoke(
+        args=['hintful', 'export-openapi', '--output', 'openapi.json']
+    )
+    assert result.exit_code == 0
+    assert (tmp_path / 'openapi.json').is_file()
+    api.flask_app.config['FLASK_HINTFUL_OPENAPI_JSON_FILE'] = 'openapi.json'
+    with api.flask_app.test_client() as client:
+        response = client.get('/openapi.json')
+    assert response.status_code == 200
+    assert response.get_json()['paths'] == {}
@@ -0,0 +1,122 @@
+from typing import T
+
+import pytest
+from flask_hintful import Paginated
+from flask_hintful.pagination import (decode_cursor, encode_cursor,
+                                      get_page_type)
+
+
+def test_paginated_route(api, dataclass_type, model_dict):
+    '''Should serialize only the requested page and link to next/prev pages
+    '''
+    @api.route('/paginated')
+    def _(str_field: str) -> Paginated[dataclass_type]:
+        return (
+            dataclass_type(**{**model_dict, 'int_field': i, 'str_field': str_field}) for i in range(5)
+        )
+
+    with api.flask_app.test_client() as client:
+        first = client.get('/paginated?str_field=foo&limit=2').get_json()
+        second = client.get(first['next']).get_json()
+        last = client.get('/paginated?str_field=foo&limit=2&offset=4')
+
+    assert [item['int_field'] for item in first['items']] == [0, 1]
+    assert first['prev'] is None
+    assert 'str_field=foo' in first['next']
+    assert [item['int_field'] for item in second['items']] == [2, 3]
+    assert second['items'][0]['str_field'] == 'foo'
+    assert client.get(second['prev']).get_json()['items'] == first['items']
+    assert [item['int_field'] for item in last.get_json()['items']] == [4]
+    assert last.get_json()['next'] is None
+    assert 'rel="prev"' in last.headers['Link']
+
+
+def test_paginated_lazy():
+    '''Should read only one item more than the page size from iterables
+    '''
+    consumed = []
+
+    def items():
+        for i in range(100):
+            consumed.append(i)
+            yield i
+    assert Paginated(items(), offset=2, limit=3).get_page() == ([2, 3, 4], True)
+    assert consumed == [0, 1, 2, 3, 4, 5]
+    assert Paginated(list(range(4)), offset=2, limit=3).get_page() == ([2, 3], False)
+    assert Paginated({'a': 1, 'b': 2, 'c': 3}, offset=1, limit=1).get_page() == (['b'], True)
+
+
+def test_paginated_sliceable():
+    '''Should slice objects with __getitem__ that aren't sequences, e.g SQLAlchemy queries
+    '''
+    class Query():
+        def __init__(self):
+            self.slices = []
+
+        def __getitem__(self, index):
+            self.slices.append(index)
+            return list(range(100))[index]
+
+        def __iter__(self):
+            raise AssertionError('query should not be iterated')
+
+    query = Query()
+    assert Paginated(query, offset=2, limit=3).get_page() == ([2, 3, 4], True)
+    assert query.slices == [slice(2, 6)]
+
+
+def test_paginated_invalid_args(api):
+    '''Should return 400 on invalid pagination args and cap limit
+    '''
+    api.flask_app.config['FLASK_HINTFUL_MAX_PAGE_LIMIT'] = 3
+
+    @api.route('/paginated')
+    def _() -> Paginated[int]:
+        return list(range(10))
+
+    with api.flask_app.test_client() as client:
+        assert client.get('/paginated?limit=0').status_code == 400
+        assert client.get('/paginated?cursor=invalid').status_code == 400
+        assert client.get('/paginated?limit=50').get_json()['items'] == [0, 1, 2]
+
+
+def test_cursor():
+    '''Should encode and decode opaque cursors
+    '''
+    assert decode_cursor(encode_cursor(42)) == 42
+    with pytest.raises(ValueError):
+        decode_cursor('b2Zmc2V0')
+
+
+def test_signed_cursor(api):
+    '''Should sign cursors with the app secret key and reject forged ones
+    '''
+    assert decode_cursor(encode_cursor(42, 'secret'), 'secret') == 42
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor(42), 'secret')
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor(42, 'other'), 'secret')
+
+    api.flask_app.secret_key = 'secret'
+
+    @api.route('/paginated')
+    def _() -> Paginated[int]:
+        return list(range(10))
+
+    with api.flask_app.test_client() as client:
+        next_url = client.get('/paginated?limit=3').get_json()['next']
+        assert client.get(next_url).get_json()['items'] == [3, 4, 5]
+        assert client.get('/paginated?cursor=b2Zmc2V0OjY').status_code == 400
+
+
+def test_openapi_paginated(api, dataclass_type):
+    '''Should document Paginated responses as a page
+    '''
+    @api.route('/paginated')
+    def _() -> Paginated[dataclass_type]:
+        pass
+
+    openapi_path = api.openapi_provider.openapi_paths[0]
+    assert openapi_path.responses[0].data_type is get_page_type(Paginated[dataclass_type])
+    assert [param.name for param in openapi_path.params] == ['limit', 'offset', 'cursor']
+    assert get_page_type(Paginated[T]).__name__ == 'TPage'
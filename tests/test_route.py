@@ -1,6 +1,13 @@
+import json
+from dataclasses import fields
+from io import BytesIO
 from unittest.mock import Mock
 
+import pytest
 from flask import Blueprint
+from flask_hintful.utils import get_func_sig
+
+from .pep563_models import Pep563Model, pep563_view
 
 
 def test_register_route(api):
@@ -73,3 +80,61 @@ def test_register_blueprint_before_after_requests(api):
     mock.before_first_request.assert_called_once()
     assert mock.before_request.call_count == 2
     assert mock.after_request.call_count == 2
+
+
+def test_max_content_length(api, dataclass_type, model_dict):
+    '''Should reject bodies larger than the route or global limit with 413 before parsing them
+    '''
+    api.flask_app.config['FLASK_HINTFUL_MAX_CONTENT_LENGTH'] = 10
+    mock = Mock()
+
+    @api.route('/limited', methods=['POST'], max_content_length=1000)
+    def _(model: dataclass_type) -> dataclass_type:
+        return model
+
+    @api.route('/global_limit', methods=['POST'])
+    def __(model: dataclass_type) -> dataclass_type:
+        mock()
+        return model
+
+    with api.flask_app.test_client() as client:
+        ok_response = client.post('/limited', json=model_dict)
+        large_response = client.post('/limited', json={**model_dict, 'str_field': 'x' * 1000})
+        global_response = client.post('/global_limit', json=model_dict)
+        chunked_response = client.post(
+            '/global_limit', input_stream=BytesIO(json.dumps(model_dict).encode()),
+            content_type='application/json',
+            environ_overrides={'wsgi.input_terminated': True, 'CONTENT_LENGTH': ''}
+        )
+    assert ok_response.get_json() == model_dict
+    assert large_response.status_code == 413
+    assert global_response.status_code == 413
+    assert chunked_response.status_code == 413
+    mock.assert_not_called()
+
+
+def test_string_annotations(api):
+    '''Should resolve PEP 563 string annotations of view funcs and dataclasses once
+    '''
+    api.route('/pep563', methods=['POST'])(pep563_view)
+    model = {'date_field': '2019-09-08', 'nested_field': {'dates': ['2019-09-09']}, 'int_field': 1}
+    with api.flask_app.test_client() as client:
+        response = client.post('/pep563?count=2', json=model)
+        openapi = client.get('/openapi.json').get_json()
+    assert response.get_json() == [model, model]
+    assert get_func_sig(pep563_view) is get_func_sig(pep563_view)
+    assert get_func_sig(pep563_view)['params']['count'].annotation is int
+    schemas = openapi['components']['schemas']
+    assert schemas['Pep563Model']['properties']['date_field'] == {'type': 'string', 'format': 'date'}
+    dates = schemas['Pep563Nested']['properties']['dates']
+    assert dates['items'] == {'type': 'string', 'format': 'date'}
+    assert fields(Pep563Model)[0].type == 'date'
+
+
+def test_unresolvable_annotations(api):
+    '''Should fail to register view funcs whose string annotations can't be resolved
+    '''
+    def view(model: 'UndefinedModel') -> str:  # noqa: F821
+        pass
+    with pytest.raises(TypeError):
+        api.route('/unresolvable')(view)
@@ -1,11 +1,18 @@
 import json
+from dataclasses import dataclass
 from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import List
 from unittest.mock import Mock
+from uuid import UUID
 
 import pytest
 from dateutil.tz import tzoffset
 from flask import jsonify
 from flask_hintful import Serializer
+from flask_hintful.codec import MsgPackCodec
+from flask_hintful.serializer import parse_fields
 
 
 def test_serialize():
@@ -23,17 +30,41 @@ def test_serialize():
     ) == '2019-07-06T05:04:03-01:00'
 
 
+def test_serialize_dict_models(api, dataclass_type, marshmallow_type, model_dict):
+    '''Should serialize Dataclasses and Marshmallow models nested in a dict, in serialize and responses
+    '''
+    serializer = Serializer()
+    data = {'dataclass': dataclass_type(**model_dict),
+            'marshmallow': marshmallow_type.__marshmallow__().load(model_dict)}
+    assert json.loads(serializer.serialize(data)) == {'dataclass': model_dict, 'marshmallow': model_dict}
+
+    @api.route('/nested')
+    def _() -> dict:
+        return data
+    with api.flask_app.test_client() as client:
+        response = client.get('/nested')
+    assert response.status_code == 200
+    assert response.get_json() == {'dataclass': model_dict, 'marshmallow': model_dict}
+
+
 def test_serialize_list(dataclass_type, marshmallow_type, model_dict):
     '''Should be able to serialize a dataclass
     '''
     serializer = Serializer()
-    expected_list = '[1, 1.0, true, {"foo": "bar"}, {"bool_field": true, "date_field": "2019-09-08", "datetime_field": "2019-07-06T05:04:03-01:00", "float_field": 1.5, "int_field": 1, "list_field": ["1", "2", "str"], "nested_field": {"str_field": "nested_str"}, "str_field": "test_string"}, {"bool_field": true, "date_field": "2019-09-08", "datetime_field": "2019-07-06T05:04:03-01:00", "float_field": 1.5, "int_field": 1, "list_field": ["1", "2", "str"], "nested_field": {"str_field": "nested_str"}, "str_field": "test_string"}]'
-    deserialized_list = serializer.serialize(
-        [1, 1.0, True, {'foo': 'bar'},
-         dataclass_type(**model_dict),
-         marshmallow_type.__marshmallow__().load(model_dict)]
+    expected_model = (
+        '{"bool_field": true, "date_field": "2019-09-08", '
+        '"datetime_field": "2019-07-06T05:04:03-01:00", "float_field": 1.5, "int_field": 1, '
+        '"list_field": ["1", "2", "str"], '
+        '"nested_field": {"str_field": "nested_str"}, "str_field": "test_string"}'
     )
+    expected_list = f'[1, 1.0, true, {{"foo": "bar"}}, {expected_model}, {expected_model}]'
+    data = [1, 1.0, True, {'foo': 'bar'},
+            dataclass_type(**model_dict),
+            marshmallow_type.__marshmallow__().load(model_dict)]
+    deserialized_list = serializer.serialize(data)
     assert expected_list == deserialized_list
+    assert isinstance(data[4], dataclass_type)
+    assert isinstance(data[5], marshmallow_type)
 
 
 def test_serialize_dataclass(dataclass_type, model_dict):
@@ -119,3 +150,235 @@ def test_serialize_tuple_data_status_header(api):
     assert response.status_code == 202
     assert response.get_json().get('arg') == 'test'
     assert response.headers['Content-Type'] == 'application/json'
+
+
+def test_serialize_response_msgpack(api, dataclass_type, model_dict):
+    '''Should encode responses with the codec matching the Accept header
+    '''
+    @api.route('/msgpack')
+    def _() -> dataclass_type:
+        return dataclass_type(**model_dict)
+    with api.flask_app.test_client() as client:
+        response = client.get('/msgpack', headers={'Accept': 'application/msgpack'})
+        json_response = client.get('/msgpack', headers={'Accept': 'text/html, */*;q=0.8'})
+    assert response.headers['Content-Type'] == 'application/msgpack'
+    assert MsgPackCodec().loads(response.get_data()) == model_dict
+    assert json_response.headers['Content-Type'] == 'application/json'
+    assert json_response.get_json() == model_dict
+
+
+def test_add_codec():
+    '''Should be able to add a codec
+    '''
+    serializer = Serializer()
+    mock = Mock()
+    serializer.add_codec('application/test', mock)
+    serializer.encode({'foo': 'bar'}, 'application/test')
+    mock.dumps.assert_called_with({'foo': 'bar'}, default=serializer.to_primitive)
+    with pytest.raises(TypeError):
+        serializer.encode({'foo': 'bar'}, 'application/unknown')
+
+
+def test_parse_fields():
+    '''Should parse sparse fieldsets into hashable projections
+    '''
+    assert parse_fields('id,owner.name') == (('id', None), ('owner', (('name', None),)))
+    assert parse_fields('owner.name,owner') == (('owner', None),)
+    assert parse_fields(' , ') is None
+
+
+def test_serialize_fields(dataclass_type, marshmallow_type, model_dict):
+    '''Should only serialize requested fields of dataclasses and marshmallow models
+    '''
+    serializer = Serializer()
+    fields = parse_fields('int_field,nested_field.str_field,unknown_field')
+    expected = {'int_field': 1, 'nested_field': {'str_field': 'nested_str'}}
+    marshmallow_obj = marshmallow_type.__marshmallow__().load(model_dict)
+    assert json.loads(serializer.serialize(dataclass_type(**model_dict), fields)) == expected
+    assert json.loads(serializer.serialize(marshmallow_obj, fields)) == expected
+    assert json.loads(serializer.serialize([dataclass_type(**model_dict)], fields)) == [expected]
+    assert serializer.get_dumper(dataclass_type, fields) is serializer.get_dumper(dataclass_type, fields)
+
+
+def test_serialize_response_fields(api, dataclass_type, model_dict):
+    '''Should apply the fields query arg to responses
+    '''
+    @api.route('/fields')
+    def _() -> dataclass_type:
+        return dataclass_type(**model_dict)
+
+    @api.route('/fields_param')
+    def __(fields: str) -> dict:
+        return {'fields': fields}
+    with api.flask_app.test_client() as client:
+        response = client.get('/fields?fields=str_field,date_field')
+        param_response = client.get('/fields_param?fields=str_field')
+    assert response.get_json() == {'str_field': 'test_string', 'date_field': '2019-09-08'}
+    assert param_response.get_json() == {'fields': 'str_field'}
+
+
+def test_serialize_offload_process_pool(dataclass_type, model_dict):
+    '''Should serialize large lists in a process pool with the same result
+    '''
+    serializer = Serializer(offload_threshold=10, max_workers=1)
+    data = [dataclass_type(**{**model_dict, 'int_field': i}) for i in range(20)]
+    try:
+        assert serializer.serialize_response(data) == (
+            Serializer().serialize(data), {'Content-Type': 'application/json'}
+        )
+        assert serializer.encode(data[:5]) == Serializer().serialize(data[:5])
+        encoded = serializer.encode(data, 'application/msgpack')
+        assert MsgPackCodec().loads(encoded)[19]['int_field'] == 19
+        assert serializer.process_pool is not None
+
+        @dataclass
+        class LocalModel():
+            str_field: str
+        assert serializer.encode([LocalModel('not picklable')] * 10) == '[' + ', '.join(
+            ['{"str_field": "not picklable"}'] * 10) + ']'
+    finally:
+        serializer.process_pool.shutdown()
+
+
+@dataclass
+class Unencodable():
+    value: object
+
+
+def test_serialize_offload_process_pool_errors(dataclass_type, model_dict):
+    '''Should raise errors of worker processes and replace a broken process pool
+    '''
+    serializer = Serializer(offload_threshold=10, max_workers=1)
+    data = [dataclass_type(**{**model_dict, 'int_field': i}) for i in range(10)]
+    with pytest.raises(TypeError):
+        serializer.encode([Unencodable(object())] * 10)
+    process_pool = serializer.process_pool
+    for process in list(process_pool._processes.values()):
+        process.kill()
+        process.join()
+    assert serializer.encode(data) == Serializer().serialize(data)
+    assert serializer.process_pool is None
+    process_pool.shutdown()
+
+
+class Color(Enum):
+    RED = 'red'
+
+
+def test_serialize_extra_types():
+    '''Should be able to serialize Decimal, UUID, Enum, bytes and sets
+    '''
+    @dataclass
+    class Extra():
+        price: Decimal
+        id: UUID
+        color: Color
+        data: bytes
+        tags: frozenset
+
+    serializer = Serializer()
+    uuid = UUID('12345678-1234-5678-1234-567812345678')
+    extra = Extra(Decimal('1.10'), uuid, Color.RED, b'\xff\x00', frozenset(['a']))
+    expected = {'price': '1.10', 'id': str(uuid), 'color': 'red', 'data': '/wA=', 'tags': ['a']}
+    assert json.loads(serializer.serialize(extra)) == expected
+    serialized = serializer.serialize({'price': Decimal('1.10'), 'tags': {'a'}})
+    assert json.loads(serialized) == {'price': '1.10', 'tags': ['a']}
+    assert serializer.serialize(Decimal('1.10')) == '1.10'
+    assert serializer.serialize(Color.RED) == 'red'
+    with pytest.raises(TypeError):
+        serializer.serialize({'foo': object()})
+
+
+def test_get_dumper(dataclass_type, marshmallow_type, model_dict):
+    '''Should convert items with a dumper resolved once per class while encoding lists
+    '''
+    serializer = Serializer()
+    dataclass = dataclass_type(**model_dict)
+    marshmallow_model = marshmallow_type.__marshmallow__().load(model_dict)
+    dumper = serializer.get_dumper(dataclass_type)
+    assert serializer.get_dumper(dataclass_type) is dumper
+    assert dumper(dataclass)['nested_field'] is dataclass.nested_field
+    dumper = serializer.get_dumper(marshmallow_type)
+    assert dumper(marshmallow_model) == serializer.dump(marshmallow_model)
+    mixed = [dataclass, marshmallow_model]
+    assert json.loads(serializer.serialize([dataclass] * 3)) == [model_dict] * 3
+    assert json.loads(serializer.serialize(mixed)) == [model_dict, model_dict]
+    encoded = serializer.encode(mixed, 'application/msgpack')
+    assert MsgPackCodec().loads(encoded) == [model_dict, model_dict]
+
+
+@dataclass
+class Point():
+    x: int
+    y: int
+
+
+def test_dump_list_homogeneous(marshmallow_type, model_dict, monkeypatch):
+    '''Should resolve the dumper of homogeneous lists once and skip the per item dispatch of to_primitive
+    '''
+    serializer = Serializer()
+    points = [Point(i, -i) for i in range(3)]
+    models = [marshmallow_type.__marshmallow__().load(model_dict)] * 2
+    schema_dump = Mock(wraps=serializer.get_schema(marshmallow_type).dump)
+    serializer.dumpers[(marshmallow_type, None)] = schema_dump
+    per_item = Mock(side_effect=AssertionError('per item dispatch'))
+    monkeypatch.setattr('flask_hintful.serializer.get_converter', per_item)
+    monkeypatch.setattr(serializer, 'get_dumper', Mock(wraps=serializer.get_dumper))
+    assert json.loads(serializer.serialize(points)) == [{'x': i, 'y': -i} for i in range(3)]
+    assert MsgPackCodec().loads(serializer.encode(points, 'application/msgpack'))[2] == {'x': 2, 'y': -2}
+    assert json.loads(serializer.serialize(models)) == [model_dict] * 2
+    assert serializer.get_dumper.call_count == 3
+    schema_dump.assert_called_once_with(models, many=True)
+    per_item.assert_not_called()
+
+
+def test_to_columns(dataclass_type, marshmallow_type, model_dict):
+    '''Should convert homogeneous dataclass lists into one list of values per field
+    '''
+    serializer = Serializer()
+    models = [dataclass_type(**{**model_dict, 'int_field': i}) for i in range(3)]
+    columns = serializer.to_columns(models, parse_fields('int_field,nested_field.str_field'))
+    assert columns == {'int_field': [0, 1, 2], 'nested_field': [{'str_field': 'nested_str'}] * 3}
+    assert list(serializer.to_columns(models)) == list(model_dict)
+    assert serializer.to_columns([]) == []
+    mixed = [models[0], marshmallow_type.__marshmallow__().load(model_dict)]
+    assert serializer.to_columns(mixed) is mixed
+
+
+def test_serialize_response_columnar(api, dataclass_type, model_dict):
+    '''Should encode lists of dataclasses as columns when the client accepts a columnar media type
+    '''
+    @api.route('/columnar')
+    def _() -> List[dataclass_type]:
+        return [dataclass_type(**{**model_dict, 'int_field': i}) for i in range(2)]
+    with api.flask_app.test_client() as client:
+        response = client.get('/columnar', headers={'Accept': 'application/x-columnar+json'})
+        msgpack_response = client.get('/columnar?fields=int_field',
+                                      headers={'Accept': 'application/x-columnar+msgpack'})
+        rows_response = client.get('/columnar', headers={'Accept': '*/*'})
+    assert response.headers['Content-Type'] == 'application/x-columnar+json'
+    columns = json.loads(response.get_data())
+    assert columns['int_field'] == [0, 1]
+    assert columns['nested_field'] == [model_dict['nested_field']] * 2
+    assert MsgPackCodec().loads(msgpack_response.get_data()) == {'int_field': [0, 1]}
+    assert rows_response.get_json()[1]['int_field'] == 1
+
+
+def test_serialize_response_columnar_fallback(dataclass_type, marshmallow_type, model_dict):
+    '''Should label responses that aren't converted into columns with the media type of the wrapped codec
+    '''
+    serializer = Serializer()
+    model = dataclass_type(**model_dict)
+    mixed = [model, marshmallow_type.__marshmallow__().load(model_dict)]
+    single, single_headers = serializer.serialize_response(model, 'application/x-columnar+json')
+    mixed_body, mixed_headers = serializer.serialize_response(mixed, 'application/x-columnar+msgpack')
+    empty, empty_headers = serializer.serialize_response(([], 200), 'application/x-columnar+json')[::2]
+    assert single_headers == {'Content-Type': 'application/json'}
+    assert json.loads(single) == model_dict
+    assert mixed_headers == {'Content-Type': 'application/msgpack'}
+    assert MsgPackCodec().loads(mixed_body) == [model_dict, model_dict]
+    assert json.loads(empty) == []
+    assert empty_headers == {'Content-Type': 'application/json'}
+    assert serializer.serialize_response({'a': 1}, 'application/x-columnar+json')[1] == {
+        'Content-Type': 'application/json'
+    }
@@ -0,0 +1,87 @@
+import gc
+import os
+import socket
+import time
+from datetime import date, datetime
+from multiprocessing import get_context
+from urllib.request import urlopen
+
+from flask_hintful.server import serve_prefork
+from werkzeug.serving import BaseWSGIServer
+
+
+def test_warmup(api, marshmallow_type, dataclass_type):
+    '''Should build schemas and OpenApi specification and freeze the heap
+    '''
+    @api.route('/warmup', methods=['POST'])
+    def _(model: marshmallow_type) -> dataclass_type:
+        pass
+    try:
+        api.warmup()
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+    assert marshmallow_type in api.deserializer.schemas
+    assert marshmallow_type in api.serializer.schemas
+    assert marshmallow_type in api.deserializer.resolved_deserializers
+    assert (dataclass_type, None) in api.serializer.dumpers
+    assert api.openapi_provider.openapi_dict is not None
+
+
+def test_warmup_validated_deserializers(api, dataclass_type):
+    '''Should build the deserializers of validated dataclass fields
+    '''
+    @api.route('/warmup', methods=['POST'])
+    def _(model: dataclass_type) -> str:
+        pass
+    api.warmup(freeze=False)
+    assert dataclass_type in api.deserializer.resolved_deserializers
+    assert date in api.deserializer.validated_deserializers
+    assert datetime in api.deserializer.validated_deserializers
+
+
+def test_serve_prefork(api):
+    '''Should serve the app from forked workers until terminated
+    '''
+    @api.route('/pid')
+    def _() -> str:
+        return str(os.getpid())
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    server = get_context('fork').Process(
+        target=serve_prefork, args=(api.flask_app, '127.0.0.1', port, 2)
+    )
+    server.start()
+    try:
+        pid = None
+        for _ in range(50):
+            try:
+                pid = int(urlopen(f'http://127.0.0.1:{port}/pid').read())
+                break
+            except OSError:
+                time.sleep(0.1)
+        assert pid not in (None, os.getpid(), server.pid)
+    finally:
+        server.terminate()
+        server.join(5)
+    assert server.exitcode == 0
+
+
+def test_serve_prefork_failing_workers(api, monkeypatch):
+    '''Should log worker errors and stop after max_failures consecutive failures
+    '''
+    def fail(*_):
+        raise OSError('cannot serve')
+    monkeypatch.setattr(BaseWSGIServer, 'serve_forever', fail)
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    server = get_context('fork').Process(
+        target=serve_prefork, args=(api.flask_app, '127.0.0.1', port, 1), kwargs={'max_failures': 3}
+    )
+    server.start()
+    server.join(10)
+    assert server.exitcode == 1
@@ -0,0 +1,60 @@
+import threading
+import time
+
+
+def test_single_flight(api):
+    '''Should run the view once for concurrent GETs with identical args and share its response
+    '''
+    calls = []
+
+    @api.route('/hot/<id>', single_flight=True)
+    def _(id: int) -> dict:
+        calls.append(id)
+        time.sleep(0.2)
+        return {'id': id, 'calls': len(calls)}
+
+    responses = []
+
+    def get(path):
+        with api.flask_app.test_client() as client:
+            responses.append((path, client.get(path).get_json()))
+    threads = [threading.Thread(target=get, args=(path,)) for path in ['/hot/1'] * 4 + ['/hot/2']]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(calls) == [1, 2]
+    hot_responses = [response for path, response in responses if path == '/hot/1']
+    assert len(hot_responses) == 4
+    assert all(response == hot_responses[0] for response in hot_responses)
+    with api.flask_app.test_client() as client:
+        client.get('/hot/1')
+    assert len(calls) == 3
+
+
+def test_single_flight_deadline(api):
+    '''Should return 504 to requests waiting for an identical request once their deadline passed
+    '''
+    started = threading.Event()
+
+    @api.route('/slow', single_flight=True)
+    def _() -> str:
+        started.set()
+        time.sleep(0.5)
+        return 'done'
+
+    responses = []
+
+    def get():
+        with api.flask_app.test_client() as client:
+            responses.append(client.get('/slow').data)
+    leader = threading.Thread(target=get)
+    leader.start()
+    started.wait()
+    start = time.monotonic()
+    with api.flask_app.test_client() as client:
+        response = client.get('/slow', headers={'X-Request-Timeout': '0.1'})
+    assert response.status_code == 504
+    assert time.monotonic() - start < 0.4
+    leader.join()
+    assert responses == [b'done']
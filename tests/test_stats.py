@@ -0,0 +1,67 @@
+from flask import Flask, json
+from flask_hintful import FlaskHintful, TypeStats
+
+from .conftest import NestedModel
+
+
+def test_type_stats():
+    '''Should count calls, time and bytes per type and export them
+    '''
+    stats = TypeStats()
+    stats.record(int, 0.5, 3)
+    stats.record(int, 0.25, 1)
+    stats.record(NestedModel, 0.1)
+    snapshot = stats.snapshot()
+    assert snapshot['int'] == {'calls': 2, 'seconds': 0.75, 'bytes': 4}
+    assert snapshot['tests.conftest.NestedModel']['calls'] == 1
+    exported = stats.export_prometheus('test')
+    assert 'test_calls_total{type="int"} 2' in exported
+    assert 'test_bytes_total{type="int"} 4' in exported
+    stats.reset()
+    assert stats.snapshot() == {}
+
+
+def test_collect_stats(dataclass_type, model_dict):
+    '''Should collect per type (de)serialization stats when FLASK_HINTFUL_COLLECT_STATS is set
+    '''
+    app = Flask(__name__)
+    app.config['FLASK_HINTFUL_COLLECT_STATS'] = True
+    api = FlaskHintful(app)
+
+    @api.route('/models', methods=['POST'])
+    def _(model: dataclass_type, count: int) -> dataclass_type:
+        return [model] * count
+    body = json.dumps(model_dict)
+    with app.test_client() as client:
+        response = client.post('/models?count=2', data=body, content_type='application/json')
+    stats = api.get_stats()
+    model_name = 'tests.conftest.DataclassModel'
+    assert stats['serializer'][f'list[{model_name}]']['calls'] == 1
+    assert stats['serializer'][f'list[{model_name}]']['bytes'] == len(response.data)
+    assert stats['serializer'][model_name]['calls'] == 2
+    assert stats['deserializer']['application/json']['bytes'] == len(body)
+    assert stats['deserializer'][model_name]['calls'] == 1
+    assert stats['deserializer']['tests.conftest.NestedModel']['calls'] == 1
+    assert stats['deserializer']['int']['calls'] == 1
+    assert 'flask_hintful_serializer_calls_total' in api.export_stats()
+
+
+def test_stats_disabled(api):
+    '''Should not collect stats by default
+    '''
+    assert api.get_stats() == {'serializer': {}, 'deserializer': {}}
+    assert api.export_stats() == ''
+
+
+def test_stats_bytes_non_ascii(api):
+    '''Should count the UTF-8 bytes, not the characters, of str data
+    '''
+    api.flask_app.config['JSON_AS_ASCII'] = False
+    api.serializer.stats = TypeStats()
+    api.deserializer.stats = TypeStats()
+    with api.flask_app.app_context():
+        encoded = api.serializer.encode({'name': 'zoë'}, 'application/json')
+    api.deserializer.deserialize('zoë', str)
+    assert encoded == '{"name": "zoë"}'
+    assert api.serializer.stats.snapshot()['dict']['bytes'] == 16
+    assert api.deserializer.stats.snapshot()['str']['bytes'] == 4